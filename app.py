@@ -5,7 +5,13 @@ from datetime import datetime, timedelta
 import json
 from data_fetcher import DataFetcher
 from scoring import ScoringEngine
-from config import SEMICONDUCTOR_STOCKS, SEPA_THRESHOLDS
+from pattern_registry import PATTERN_REGISTRY
+from incremental_scoring import score_universe_incremental
+from rs_rating import get_rs_ratings
+from fundamental_scoring import fundamental_metrics, get_normalized_fundamentals
+from compact_ohlcv import as_price_frame
+from price_panel import PricePanel
+from config import SEMICONDUCTOR_STOCKS, SEPA_THRESHOLDS, RS_RATING, FUNDAMENTAL_NORMALIZATION, PRICE_PANEL
 import logging
 from utils import logger
 
@@ -51,45 +57,24 @@ sepa_criteria_threshold_texts = {
     "debt_ratio": f"{SEPA_THRESHOLDS['debt_ratio']}% 이하"
 }
 
+def open_price_panel():
+    """수집 때 저장한 가격 패널을 메모리 맵으로 엽니다. 없거나 읽을 수 없으면 None"""
+    if not PRICE_PANEL["enabled"]:
+        return None
+    try:
+        return PricePanel.open()
+    except Exception as e:
+        logger.warning(f"가격 패널을 열 수 없어 종목별 가격으로 채점합니다: {str(e)}")
+        return None
+
 # 모든 종목 점수 계산
 @st.cache_data(ttl=3600)  # 1시간 캐시
 def calculate_all_scores():
-    results = []
-    for code in SEMICONDUCTOR_STOCKS:
-        if code not in stock_data:
-            continue
-        
-        # 기업 정보 가져오기
-        company_name = stock_data[code]["info"].get("name", f"기업 {code}")
-        
-        # 스코어링 엔진 초기화
-        scoring_engine = ScoringEngine(stock_data[code])
-        
-        # 점수 계산
-        scores = scoring_engine.calculate_total_score()
-        recommendation = scoring_engine.get_recommendation()
-        
-        # 필터 충족 여부
-        trend_filter_passed = scoring_engine.check_trend_filter()
-        fundamental_filter_passed = scoring_engine.check_fundamental_filter()
-        rs_filter_passed = scoring_engine.check_rs_filter()
-        all_filters_passed = trend_filter_passed and fundamental_filter_passed and rs_filter_passed
-        
-        # 결과 추가
-        results.append({
-            "code": code,
-            "name": company_name,
-            "total_score": scores["total"],
-            "trend_score": scores["trend"],
-            "fundamental_score": scores["fundamental"],
-            "rs_score": scores["rs"],
-            "pattern_score": scores["pattern"],
-            "recommendation": recommendation,
-            "all_filters_passed": all_filters_passed
-        })
+    # 전 종목을 한 번에 열 단위로 채점 (입력이 바뀐 종목만 다시 계산, 나머지는 점수 캐시 사용)
+    universe = {code: stock_data[code] for code in SEMICONDUCTOR_STOCKS if code in stock_data}
+    results_df = score_universe_incremental(universe, price_panel=open_price_panel())
     
     # 종합 점수 기준으로 정렬
-    results_df = pd.DataFrame(results)
     if not results_df.empty:
         results_df = results_df.sort_values("total_score", ascending=False).reset_index(drop=True)
     return results_df
@@ -117,6 +102,11 @@ if not all_scores.empty:
     # 데이터프레임을 표시하고 선택 가능하게 함
     st.dataframe(display_data, use_container_width=True, hide_index=True)
     
+    # 합성(샘플) 주가로 계산된 종목 안내
+    synthetic_codes = all_scores.loc[all_scores["price_source"] == "synthetic", "code"].tolist()
+    if synthetic_codes:
+        st.caption(f"⚠️ 실제 시세를 가져오지 못해 샘플 주가로 계산된 종목: {', '.join(synthetic_codes)}")
+    
     # 선택 가능한 종목 리스트 생성
     selected_stock = st.selectbox(
         "상세 분석할 종목 선택",
@@ -137,21 +127,41 @@ if selected_stock:
     if code not in stock_data:
         st.warning(f"종목 {code}의 데이터를 찾을 수 없습니다. API 연결 상태를 확인하거나 나중에 다시 시도해주세요.")
     else:
+        # 유니버스 RS 등급 (RS_RATING["mode"]가 "rating"이면 RS 점수로 사용, 거래일별 캐시)
+        rs_rating = None
+        if RS_RATING["mode"] == "rating":
+            universe_prices = {
+                c: as_price_frame(stock_data[c]["price"]) for c in SEMICONDUCTOR_STOCKS if c in stock_data
+            }
+            rs_rating = get_rs_ratings(universe_prices).rating(code)
+        
+        # 유니버스 펀더멘털 정규화 (단독 정규화가 아니면 전 종목 지표 행렬 기준, 내용별 캐시)
+        fundamental_norm = None
+        if FUNDAMENTAL_NORMALIZATION["method"] != "single":
+            universe_codes = [c for c in SEMICONDUCTOR_STOCKS if c in stock_data]
+            universe_metrics = fundamental_metrics(
+                {c: stock_data[c]["financial"]["annual"] for c in universe_codes}, universe_codes
+            )
+            fundamental_norm = get_normalized_fundamentals(universe_metrics).loc[code]
+        
         # 스코어링 엔진 초기화
-        scoring_engine = ScoringEngine(stock_data[code])
+        scoring_engine = ScoringEngine(stock_data[code], rs_rating=rs_rating, fundamental_norm=fundamental_norm)
+        if scoring_engine.is_synthetic:
+            st.warning("실제 시세를 가져오지 못해 샘플 주가 데이터로 계산한 결과입니다.")
         
-        # 점수 계산
-        scores = scoring_engine.calculate_total_score()
-        sepa_status = scoring_engine.get_sepa_status()
-        recommendation = scoring_engine.get_recommendation()
+        # 점수·필터·재무 지표·패턴을 한 번에 계산
+        result = scoring_engine.evaluate()
+        scores = result.scores
+        sepa_status = result.sepa_status
+        recommendation = result.recommendation
         
         # 필터 확인
-        trend_filter_passed = scoring_engine.check_trend_filter()
-        fundamental_filter_passed = scoring_engine.check_fundamental_filter()
-        rs_filter_passed = scoring_engine.check_rs_filter()
+        trend_filter_passed = result.trend_filter
+        fundamental_filter_passed = result.fundamental_filter
+        rs_filter_passed = result.rs_filter
         
         # 펀더멘털 점수 상세 내역
-        metrics = scoring_engine.sepa_metrics.get_all_metrics()
+        metrics = result.metrics
         
         # 표시할 컬럼 구성
         col1, col2 = st.columns(2)
@@ -197,7 +207,7 @@ if selected_stock:
             )
             
             # 모든 필터 통과 여부
-            all_filters_passed = trend_filter_passed and fundamental_filter_passed and rs_filter_passed
+            all_filters_passed = result.all_filters_passed
             st.metric(
                 "모든 필터 충족", 
                 "충족" if all_filters_passed else "미충족",
@@ -233,32 +243,18 @@ if selected_stock:
         
         # 기술적 추세 점수 상세
         with st.expander("기술적 추세 점수 상세 (가중치: 25%)"):
-            price_data = stock_data[code]["price"]
+            price_data = scoring_engine.stock_data["price"]
             
             if not price_data.empty:
-                # 최근 종가
-                latest_close = price_data["Close"].iloc[-1]
-                
-                # 이동평균선 계산
-                ma50 = price_data["Close"].rolling(window=50).mean().iloc[-1]
-                ma150 = price_data["Close"].rolling(window=150).mean().iloc[-1]
-                ma200 = price_data["Close"].rolling(window=200).mean().iloc[-1]
-                
-                # 이동평균선 기울기 확인
-                ma50_prev = price_data["Close"].rolling(window=50).mean().iloc[-6]  # 5일 전
-                ma150_prev = price_data["Close"].rolling(window=150).mean().iloc[-11]  # 10일 전
-                ma200_prev = price_data["Close"].rolling(window=200).mean().iloc[-21]  # 20일 전
-                
-                # 52주(약 250 거래일) 고가/저가
-                high_52w = price_data["High"].tail(250).max()
-                low_52w = price_data["Low"].tail(250).min()
-                
-                # 조건 체크 결과
+                # 조건 체크 결과 (evaluate()에서 계산한 값)
+                condition_names = {
+                    "price_above_ma": "주가 > 이동평균선(50,150,200일)",
+                    "ma_alignment": "이동평균선 정렬(50 > 150 > 200)",
+                    "ma_slope": "이동평균선 상승 추세",
+                    "price_vs_52w": "52주 고저점 위치 기준 충족"
+                }
                 conditions = {
-                    "주가 > 이동평균선(50,150,200일)": latest_close > ma50 and latest_close > ma150 and latest_close > ma200,
-                    "이동평균선 정렬(50 > 150 > 200)": ma50 > ma150 > ma200,
-                    "이동평균선 상승 추세": ma50 > ma50_prev and ma150 > ma150_prev and ma200 > ma200_prev,
-                    "52주 고저점 위치 기준 충족": (latest_close >= low_52w * 1.3) and (latest_close >= high_52w * 0.75)
+                    name: result.trend_conditions.get(key, False) for key, name in condition_names.items()
                 }
                 
                 # 각 조건의 결과를 표로 표시
@@ -283,7 +279,7 @@ if selected_stock:
         
         # 상대적 강도 점수 상세
         with st.expander("상대적 강도 점수 상세 (가중치: 20%)"):
-            price_data = stock_data[code]["price"]
+            price_data = scoring_engine.stock_data["price"]
             
             if not price_data.empty:
                 # 13주(약 65 거래일)와 26주(약 130 거래일) 수익률 계산
@@ -302,6 +298,9 @@ if selected_stock:
                 
                 st.table(pd.DataFrame(rs_data))
                 
+                if rs_rating is not None:
+                    st.markdown(f"**유니버스 RS 등급**: {rs_rating:.0f} / 99 (RS 점수 = 등급 / 100)")
+                
                 st.markdown(f"""
                 **RS 점수**: {scores['rs']:.2%}
                 
@@ -316,62 +315,34 @@ if selected_stock:
                 
         # 패턴 점수 상세
         with st.expander("패턴 점수 상세 (가중치: 25%)"):
-            patterns = scoring_engine.pattern_detector.get_all_patterns()
+            events = result.pattern_events
             
-            # 최신 2개로 제한된 패턴 데이터 준비
-            filtered_patterns = {}
-            for pattern_type, pattern_list in patterns.items():
-                # 날짜 기준 정렬
-                sorted_patterns = sorted(
-                    [p for p in pattern_list if (pd.Timestamp.now() - p["date"]).days <= 30],
-                    key=lambda x: x["date"],
-                    reverse=True  # 최신 패턴이 먼저 오도록
-                )
-                # 각 패턴 타입별로 최대 2개만 사용
-                filtered_patterns[pattern_type] = sorted_patterns[:2]
-            
-            # 패턴 데이터를 테이블로 표시
-            if all(len(p) == 0 for p in filtered_patterns.values()):
+            # 패턴 데이터를 테이블로 표시 (패턴별 최신 2개)
+            if events.empty:
                 st.write("감지된 패턴이 없습니다.")
             else:
-                for pattern_type, pattern_list in filtered_patterns.items():
-                    if pattern_list:
-                        if pattern_type == "vcp":
-                            pattern_kr = "볼륨 수축 패턴 (VCP)"
-                            weight = "40%"
-                        elif pattern_type == "pocket_pivot":
-                            pattern_kr = "포켓 피봇 (Pocket Pivot)"
-                            weight = "30%"
-                        elif pattern_type == "breakout":
-                            pattern_kr = "돌파 (Breakout)"
-                            weight = "30%"
-                        else:
-                            pattern_kr = pattern_type
-                            weight = "N/A"
-                        
-                        st.write(f"**{pattern_kr}** (가중치: {weight})")
-                        
-                        # 패턴 정보 표시
-                        pattern_data = []
-                        for p in pattern_list:
-                            pattern_data.append({
-                                "날짜": p["date"].strftime("%Y-%m-%d"),
-                                "강도": f"{p.get('strength', 0):.2f}" if "strength" in p else "N/A"
-                            })
-                        
-                        if pattern_data:
-                            st.table(pd.DataFrame(pattern_data))
+                for pattern_id, spec in PATTERN_REGISTRY.items():
+                    latest = events[events["pattern"] == pattern_id].sort_values("date", ascending=False).head(2)
+                    if latest.empty:
+                        continue
+                    
+                    st.write(f"**{spec.label}** (가중치: {spec.weight:.0%})")
+                    st.table(pd.DataFrame({
+                        "날짜": latest["date"].dt.strftime("%Y-%m-%d").tolist(),
+                        "강도": [f"{v:.2f}" for v in latest["strength"]]
+                    }))
             
-            st.markdown("""
+            weight_text = ", ".join(f"{spec.label}({spec.weight:.0%})" for spec in PATTERN_REGISTRY.values())
+            st.markdown(f"""
             **산출 방식**:
             1. 최근 30일 이내 패턴 발생 횟수에 가중치 적용 (각 패턴 타입별 최대 2개)
-            2. 볼륨 수축 패턴(40%), 포켓 피봇(30%), 돌파(30%)
+            2. {weight_text}
             3. 첫 번째 패턴은 가중치의 100%, 두 번째는 50% 적용
             4. 최종 점수는 0~100% 범위로 표시
             """)
             
         # 차트
-        price_data = stock_data[code]["price"]
+        price_data = scoring_engine.stock_data["price"]
         
         if not price_data.empty:
             # 인덱스가 DatetimeIndex인지 확인하고 변환
@@ -398,21 +369,21 @@ if selected_stock:
                 # 이동평균선
                 fig.add_trace(go.Scatter(
                     x=price_data.index,
-                    y=price_data["Close"].rolling(window=20).mean(),
+                    y=scoring_engine.indicators.sma(20),
                     name="20일 이동평균",
                     line=dict(color="blue", width=1)
                 ))
                 
                 fig.add_trace(go.Scatter(
                     x=price_data.index,
-                    y=price_data["Close"].rolling(window=50).mean(),
+                    y=scoring_engine.indicators.sma(50),
                     name="50일 이동평균",
                     line=dict(color="orange", width=1)
                 ))
                 
                 fig.add_trace(go.Scatter(
                     x=price_data.index,
-                    y=price_data["Close"].rolling(window=200).mean(),
+                    y=scoring_engine.indicators.sma(200),
                     name="200일 이동평균",
                     line=dict(color="red", width=1)
                 ))
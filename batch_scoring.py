@@ -0,0 +1,178 @@
+"""유니버스 전체 일괄 채점
+
+ScoringEngine을 종목마다 만들지 않고, 전 종목의 가격과 재무제표를 한 번에 받아
+추세·펀더멘털·RS·패턴 점수와 세 가지 필터를 열 단위 벡터 연산으로 계산합니다.
+
+    scores = score_universe(stock_data)
+
+결과 열은 app.calculate_all_scores와 같으며(종목별 필터 통과 여부 열 추가),
+점수는 종목별 ScoringEngine 결과와 같습니다. 가격 지표는 (날짜 × 종목) 패널로
+계산하되, 거래일 달력이 다른 종목이 섞이면 종목 자신의 봉 기준으로 창을 잡습니다
+(PanelIndicators.by_bar). 수집 때 만든 패널 파일(PricePanel)을 주면 종목별 프레임을
+다시 정렬하지 않고 메모리 맵에서 바로 지표를 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from config import SCORE_WEIGHTS, FUNDAMENTAL_WEIGHTS, RS_FILTER_THRESHOLD, SEPA_THRESHOLDS, RS_RATING
+from compact_ohlcv import as_price_frame
+from panel_indicators import PanelIndicators
+from price_panel import PricePanel
+from pattern_registry import evaluate_patterns, pattern_scores
+from rs_rating import get_rs_ratings
+from fundamental_scoring import fundamental_metrics, get_normalized_fundamentals, fundamental_scores
+from utils import logger
+
+# 채점에 필요한 최근 거래일 수 (52주 고저 250일, 200일선 20일 전 값 220일, 26주 수익률 130일,
+# RS 등급 최장 기간 + 1일)
+SCORE_LOOKBACK = max(250, max(RS_RATING["horizons"]) + 1)
+
+SCORE_COLUMNS = [
+    "code", "name", "total_score", "trend_score", "fundamental_score", "rs_score", "pattern_score",
+    "recommendation", "all_filters_passed", "trend_filter_passed", "fundamental_filter_passed",
+    "rs_filter_passed", "price_source"
+]
+
+def _trend_columns(panel: PanelIndicators, codes: pd.Index) -> pd.DataFrame:
+    """추세 조건 4개를 종목 열 전체에 대해 계산합니다 (계산할 수 없는 종목은 모두 False)."""
+    t = panel.trend_table().reindex(codes)
+    latest, ma50, ma150, ma200 = t["latest"], t["ma50"], t["ma150"], t["ma200"]
+    enough = t["bars"].fillna(0) >= 21
+    return pd.DataFrame({
+        "price_above_ma": (latest > ma50) & (latest > ma150) & (latest > ma200),
+        "ma_alignment": (ma50 > ma150) & (ma150 > ma200),
+        "ma_slope": (ma50 > t["ma50_prev"]) & (ma150 > t["ma150_prev"]) & (ma200 > t["ma200_prev"]),
+        "price_vs_52w": (latest >= t["low52"] * 1.3) & (latest >= t["high52"] * 0.75),
+    }).mul(enough, axis=0).astype(bool)
+
+def _rs_column(panel: PanelIndicators, codes: pd.Index, frames: Dict[str, pd.DataFrame]) -> pd.Series:
+    """RS 점수 (ScoringEngine.calculate_rs_score와 같은 식)
+
+    RS_RATING["mode"]가 "rating"이면 유니버스 RS 등급 / 100, 등급이 없는 종목과
+    "absolute" 모드는 13주·26주 수익률 기준입니다.
+    """
+    r = panel.rs_table().reindex(codes)
+    score = (r["returns_13w"] / 20).clip(0, 1) * 0.6 + (r["returns_26w"] / 30).clip(0, 1) * 0.4
+    score = score.clip(0, 1).fillna(0.0)
+    if RS_RATING["mode"] == "rating":
+        ratings = get_rs_ratings(frames, panel).table()["rating"].reindex(codes)
+        score = (ratings / 100).clip(0, 1).fillna(score)
+    return score
+
+def _stored_panel(price_panel: PricePanel, frames: Dict[str, pd.DataFrame]) -> Optional[PanelIndicators]:
+    """저장된 패널이 채점할 가격과 같으면 그 종목들만 고른 패널 지표, 아니면 None
+
+    종목마다 마지막 거래일과 종가를 비교해, 패널을 만든 뒤 가격이 갱신된 경우는 쓰지 않습니다.
+    """
+    codes = list(frames)
+    if any(code not in price_panel for code in codes):
+        return None
+    subset = price_panel.subset(codes, SCORE_LOOKBACK)
+    close = subset.arrays["Close"]
+    for j, code in enumerate(codes):
+        valid = np.flatnonzero(~np.isnan(close[:, j]))
+        df = frames[code]
+        if (len(valid) < len(df) or subset.dates[valid[-1]] != df.index[-1] or
+                close[valid[-1], j] != df["Close"].iloc[-1]):
+            return None
+    return PanelIndicators(subset)
+
+def _fundamental_filter(metrics: pd.DataFrame) -> pd.Series:
+    """SEPA 기준 4개 중 3개 이상 충족"""
+    passed = (
+        (metrics["sales_growth"] >= SEPA_THRESHOLDS["sales_growth"]).astype(int) +
+        (metrics["operating_income_growth"] >= SEPA_THRESHOLDS["operating_income_growth"]).astype(int) +
+        (metrics["roe"] >= SEPA_THRESHOLDS["roe"]).astype(int) +
+        (metrics["debt_ratio"] <= SEPA_THRESHOLDS["debt_ratio"]).astype(int)
+    )
+    return passed >= 3
+
+def recommendations(total: pd.Series, all_filters_passed: pd.Series) -> np.ndarray:
+    """종합 점수와 필터로 투자 추천 (scoring.recommend의 벡터 버전)"""
+    return np.select(
+        [(total >= 0.8) & all_filters_passed, (total >= 0.6) & all_filters_passed, total >= 0.4],
+        ["강력 매수", "매수", "관망"],
+        default="매도"
+    )
+
+def score_universe(stock_data: Dict[str, Dict], now: pd.Timestamp = None, use_numba: bool = None,
+                   price_panel: PricePanel = None) -> pd.DataFrame:
+    """전 종목 점수표를 한 번에 계산합니다.
+
+    stock_data: {code: {"price": DataFrame 또는 CompactOHLCV, "financial": {"annual": ...}, "info": {...}}}
+    now: 패턴 점수의 최근 30일 기준 시각 (기본값은 현재 시각, 종목 마지막 봉보다 늦으면 마지막 봉)
+    price_panel: 수집 때 저장한 패널 (PricePanel.open). 가격이 다르면 무시합니다.
+    반환값은 SCORE_COLUMNS 열의 DataFrame이며 입력 순서를 유지합니다.
+    """
+    codes = pd.Index(list(stock_data), name="code", dtype=object)
+    if codes.empty:
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+
+    # 가격: 채점에 필요한 최근 구간만 패널로 모음
+    frames: Dict[str, pd.DataFrame] = {}
+    sources = {}
+    for code, data in stock_data.items():
+        price = data.get("price")
+        if price is None:
+            continue
+        df = as_price_frame(price)
+        sources[code] = df.attrs.get("source", "unknown")
+        if not df.empty:
+            frames[code] = df.iloc[-SCORE_LOOKBACK:]
+
+    trend_conds = pd.DataFrame(False, index=codes, columns=["price_above_ma", "ma_alignment", "ma_slope", "price_vs_52w"])
+    rs_score = pd.Series(0.0, index=codes)
+    pattern_score = pd.Series(0.0, index=codes)
+    if frames:
+        try:
+            panel = _stored_panel(price_panel, frames) if price_panel is not None else None
+            if panel is None:
+                if price_panel is not None:
+                    logger.warning("가격 패널이 채점할 가격과 달라 종목별 가격으로 패널을 만듭니다.")
+                panel = PanelIndicators.from_frames(frames)
+            trend_conds = _trend_columns(panel, codes)
+            rs_score = _rs_column(panel, codes, frames)
+            events = evaluate_patterns(frames, days=30, now=now, use_numba=use_numba, panel=panel)
+            pattern_score = pattern_scores(events, codes).clip(upper=1.0)
+        except Exception as e:
+            logger.error(f"가격 지표 일괄 계산 실패: {str(e)}")
+
+    trend_score = trend_conds.sum(axis=1) * 0.25
+    trend_ok = trend_conds.all(axis=1)
+    rs_ok = rs_score >= RS_FILTER_THRESHOLD
+
+    # 재무제표
+    financials = {code: data.get("financial", {}).get("annual") for code, data in stock_data.items()}
+    has_annual = pd.Series({code: annual is not None and not annual.empty for code, annual in financials.items()}).reindex(codes)
+    try:
+        metrics = fundamental_metrics(financials, codes)
+    except Exception as e:
+        logger.error(f"재무 지표 일괄 계산 실패: {str(e)}")
+        metrics = pd.DataFrame(0.0, index=codes, columns=list(FUNDAMENTAL_WEIGHTS))
+    fundamental_score = fundamental_scores(get_normalized_fundamentals(metrics), metrics, has_annual)
+    fundamental_ok = _fundamental_filter(metrics)
+
+    w = SCORE_WEIGHTS
+    total = (
+        trend_score * w["trend"] + fundamental_score * w["fundamental"] +
+        rs_score * w["rs"] + pattern_score * w["pattern"]
+    ).clip(0, 1)
+    all_ok = trend_ok & fundamental_ok & rs_ok
+
+    result = pd.DataFrame({
+        "code": codes,
+        "name": [stock_data[code].get("info", {}).get("name", f"기업 {code}") for code in codes],
+        "total_score": total.to_numpy(),
+        "trend_score": trend_score.to_numpy(),
+        "fundamental_score": fundamental_score.to_numpy(),
+        "rs_score": rs_score.to_numpy(),
+        "pattern_score": pattern_score.to_numpy(),
+        "recommendation": recommendations(total, all_ok),
+        "all_filters_passed": all_ok.to_numpy(),
+        "trend_filter_passed": trend_ok.to_numpy(),
+        "fundamental_filter_passed": fundamental_ok.to_numpy(),
+        "rs_filter_passed": rs_ok.to_numpy(),
+        "price_source": [sources.get(code, "unknown") for code in codes],
+    }, columns=SCORE_COLUMNS)
+    logger.info(f"일괄 채점 완료: {len(result)}개 종목")
+    return result
@@ -0,0 +1,104 @@
+"""합성 유니버스로 스크리닝 파이프라인 성능을 측정합니다.
+
+네트워크 없이 고정 시드 데이터로 실행되므로 결과를 재현할 수 있습니다.
+
+    python benchmark.py --tickers 5000 --score-tickers 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from config import SYNTHETIC_MARKET
+from synthetic_market import SyntheticMarket
+from scoring import ScoringEngine
+from panel_indicators import PanelIndicators
+from pattern_detector import PatternDetector
+import pattern_kernels
+from pattern_registry import evaluate_patterns
+from batch_scoring import score_universe
+from incremental_scoring import ScoreCache, score_universe_incremental
+
+@contextmanager
+def timed(label: str, n: int = None):
+    """구간 실행 시간을 출력합니다."""
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    per_item = f" ({elapsed / n * 1000:.2f} ms/종목)" if n else ""
+    print(f"{label:<28} {elapsed:8.3f} s{per_item}")
+
+def main():
+    parser = argparse.ArgumentParser(description="SEPA 스크리너 벤치마크")
+    parser.add_argument("--tickers", type=int, default=SYNTHETIC_MARKET["n_tickers"], help="합성 종목 수")
+    parser.add_argument("--score-tickers", type=int, default=100, help="ScoringEngine으로 채점할 종목 수")
+    parser.add_argument("--seed", type=int, default=SYNTHETIC_MARKET["seed"], help="난수 시드")
+    parser.add_argument("--start", default="2020-01-01", help="가격 시작일")
+    parser.add_argument("--end", default="2025-12-31", help="가격 종료일")
+    args = parser.parse_args()
+
+    market = SyntheticMarket(seed=args.seed)
+    print(f"종목 {args.tickers}개, 기간 {args.start} ~ {args.end}, seed={args.seed}")
+
+    with timed("합성 유니버스 생성", args.tickers):
+        universe = market.universe(args.tickers, start_date=args.start, end_date=args.end)
+
+    codes = list(universe)[:args.score_tickers]
+    with timed("ScoringEngine 종목별 채점", len(codes)):
+        for code in codes:
+            ScoringEngine(universe[code]).get_recommendation()
+
+    with timed("패널 지표 계산 (전 종목)", len(universe)):
+        panel = PanelIndicators.from_frames({code: data["price"] for code, data in universe.items()})
+        panel.trend_table()
+        panel.rs_table()
+
+    with timed("ScoringEngine 패널 기반 채점", len(codes)):
+        for code in codes:
+            ScoringEngine(universe[code], panel.ticker(code)).get_recommendation()
+
+    price_frames = {code: data["price"] for code, data in universe.items()}
+    as_of = max(df.index[-1] for df in price_frames.values())
+    with timed("일괄 채점 (전 종목)", len(universe)):
+        scores = score_universe(universe, now=as_of)
+    print(f"{'':<28} 필터 통과 {int(scores['all_filters_passed'].sum())}개 종목")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ScoreCache(os.path.join(tmp_dir, "scores.parquet"))
+        with timed("증분 채점 (최초, 전 종목)", len(universe)):
+            score_universe_incremental(universe, now=as_of, cache=cache)
+        # 종목 1%의 마지막 봉 종가만 바꿔 증분 재계산
+        for code in list(universe)[::100]:
+            price = universe[code]["price"].copy()
+            price.iloc[-1, price.columns.get_loc("Close")] *= 1.01
+            universe[code] = {**universe[code], "price": price}
+        with timed("증분 채점 (종목 1% 변경)", len(universe)):
+            rescored = score_universe_incremental(universe, now=as_of, cache=cache).attrs["rescored"]
+        print(f"{'':<28} 다시 계산 {rescored}개 종목")
+
+    with timed("패턴 일괄 평가 (최근 30일)", len(price_frames)):
+        events = evaluate_patterns(price_frames, days=30, now=as_of)
+    print(f"{'':<28} 이벤트 {len(events)}건")
+
+    # 패턴 스캔 백엔드 비교 (지표 계산은 캐시되어 있으므로 스캔 시간만 측정)
+    detectors = [PatternDetector(universe[code]["price"]) for code in codes]
+    with timed("패턴 스캔 (NumPy)", len(codes)):
+        for detector in detectors:
+            detector.use_numba = False
+            detector.get_all_patterns()
+    with timed("패턴 스캔 최근 30일 (NumPy)", len(codes)):
+        for detector in detectors:
+            detector.get_recent_patterns(30, now=detector.price_data.index[-1])
+    if pattern_kernels.NUMBA_AVAILABLE:
+        detectors[0].use_numba = True
+        with timed("numba 커널 준비 (컴파일·캐시 로드)"):
+            detectors[0].get_all_patterns()
+        with timed("패턴 스캔 (numba)", len(codes)):
+            for detector in detectors:
+                detector.use_numba = True
+                detector.get_all_patterns()
+    else:
+        print("numba가 설치되어 있지 않아 JIT 커널 측정을 건너뜁니다.")
+
+if __name__ == "__main__":
+    main()
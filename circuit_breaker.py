@@ -0,0 +1,165 @@
+import time
+import threading
+import urllib.error
+from typing import Callable, Dict, Hashable, Tuple, Type
+import requests
+from config import CIRCUIT_BREAKER
+from utils import logger
+
+class SourceUnavailableError(Exception):
+    """회로 차단 또는 실패 캐시 때문에 요청을 보내지 않았을 때 발생합니다."""
+
+class CircuitOpenError(SourceUnavailableError):
+    """소스·메서드 회로가 열려 있을 때 발생합니다."""
+
+class NegativeCacheHit(SourceUnavailableError):
+    """최근 실패한 종목·소스 조합을 다시 요청하려 할 때 발생합니다."""
+
+# 엔드포인트 자체의 장애 (연결 실패·시간 초과). 이 밖의 예외(잘못된 응답 형식으로 인한
+# TypeError·KeyError 등 포함)는 종목별 실패로 봅니다.
+ENDPOINT_ERRORS = (
+    ConnectionError, TimeoutError, urllib.error.URLError,
+    requests.exceptions.ConnectionError, requests.exceptions.Timeout
+)
+
+def is_endpoint_error(e: BaseException) -> bool:
+    """회로 실패로 셀 예외인지 판단합니다 (연결·시간 초과·5xx).
+
+    상장폐지·거래정지 종목처럼 특정 종목만 실패하는 경우(4xx, 데이터 없음 등)는
+    다른 종목 요청을 막지 않도록 False입니다.
+    """
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    if status is None and isinstance(e, urllib.error.HTTPError):
+        status = e.code
+    if isinstance(status, int):
+        return status >= 500
+    return isinstance(e, ENDPOINT_ERRORS)
+
+class CircuitBreaker:
+    """키(소스, 메서드)별 회로 차단기
+
+    연속 실패가 failure_threshold에 도달하면 회로를 열고 cooldown 동안 요청을 막습니다.
+    쿨다운이 지나면 요청 하나만 시험적으로 통과시켜(half-open) 성공하면 닫고,
+    실패하면 다시 쿨다운을 시작합니다.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._failures: Dict[Hashable, int] = {}
+        self._opened_at: Dict[Hashable, float] = {}
+        self._trial: Dict[Hashable, bool] = {}
+        self._lock = threading.Lock()
+
+    def before_call(self, key: Hashable) -> None:
+        """요청 가능 여부를 확인합니다. 막혀 있으면 CircuitOpenError를 발생시킵니다."""
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return
+            remaining = self.cooldown - (self.clock() - opened_at)
+            if remaining > 0 or self._trial.get(key):
+                raise CircuitOpenError(f"회로 차단 중: {key} (남은 시간 {max(0.0, remaining):.0f}초)")
+            # 쿨다운 경과: 시험 요청 하나만 통과
+            self._trial[key] = True
+
+    def record_success(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._opened_at:
+                logger.info(f"회로 복구: {key}")
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+            self._trial.pop(key, None)
+
+    def record_failure(self, key: Hashable) -> None:
+        with self._lock:
+            count = self._failures.get(key, 0) + 1
+            self._failures[key] = count
+            if count >= self.failure_threshold or self._trial.get(key):
+                if key not in self._opened_at or self._trial.get(key):
+                    logger.error(f"회로 차단: {key}, 실패 {count}회, {self.cooldown:.0f}초 동안 요청 중단")
+                self._opened_at[key] = self.clock()
+                self._trial[key] = False
+
+    def release_trial(self, key: Hashable) -> None:
+        """결과를 판단할 수 없는 시험 요청이었을 때 다음 요청이 다시 시험할 수 있게 합니다."""
+        with self._lock:
+            if self._trial.get(key):
+                self._trial[key] = False
+
+    def is_open(self, key: Hashable) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            return opened_at is not None and self.clock() - opened_at < self.cooldown
+
+class NegativeCache:
+    """최근 실패한 요청 키를 ttl 동안 기억하는 캐시"""
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries[key] = self.clock() + self.ttl
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < self.clock():
+                del self._entries[key]
+                return False
+            return True
+
+class SourceGuard:
+    """외부 데이터 소스 호출을 회로 차단기와 실패 캐시로 감쌉니다."""
+
+    def __init__(self, failure_threshold: int = None, cooldown: float = None, negative_ttl: float = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.breaker = CircuitBreaker(
+            CIRCUIT_BREAKER["failure_threshold"] if failure_threshold is None else failure_threshold,
+            CIRCUIT_BREAKER["cooldown_seconds"] if cooldown is None else cooldown,
+            clock
+        )
+        self.negative = NegativeCache(
+            CIRCUIT_BREAKER["negative_ttl_seconds"] if negative_ttl is None else negative_ttl,
+            clock
+        )
+
+    def call(self, source: str, method: str, code: str, fn: Callable, *args,
+             passthrough: Tuple[Type[BaseException], ...] = ()):
+        """fn(*args)를 실행합니다.
+
+        회로가 열려 있거나 (source, method, code)가 최근 실패했으면 요청 없이
+        SourceUnavailableError를 발생시킵니다. passthrough 예외는 실패로 기록하지 않습니다.
+        실패는 모두 실패 캐시에 기록하고, 엔드포인트 장애(is_endpoint_error)만
+        (source, method) 회로의 연속 실패로 셉니다.
+        """
+        key = (source, method)
+        if (source, method, code) in self.negative:
+            raise NegativeCacheHit(f"최근 실패한 요청: {source}.{method}({code})")
+        self.breaker.before_call(key)
+        try:
+            result = fn(*args)
+        except passthrough:
+            self.breaker.release_trial(key)
+            raise
+        except Exception as e:
+            self.negative.add((source, method, code))
+            if is_endpoint_error(e):
+                self.breaker.record_failure(key)
+            else:
+                # 종목별 실패: 엔드포인트 상태는 알 수 없으므로 시험 요청만 풀어 둠
+                self.breaker.release_trial(key)
+            raise
+        self.breaker.record_success(key)
+        return result
+
+    def mark_failed(self, source: str, method: str, code: str) -> None:
+        """엔드포인트는 정상이지만 해당 종목 데이터가 없을 때 실패 캐시에만 기록합니다."""
+        self.negative.add((source, method, code))
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+from price_cache import PRICE_COLUMNS
+from utils import logger
+
+# float32 가수부(24비트)로 정확히 표현되는 최대 정수 가격
+FLOAT32_EXACT_MAX = 2 ** 24
+
+class TradingCalendar:
+    """여러 종목이 공유하는 거래일 달력
+
+    종목별 날짜는 이 달력에 대한 int32 일 오프셋으로 저장합니다.
+    """
+
+    __slots__ = ("dates",)
+
+    def __init__(self, dates: pd.DatetimeIndex):
+        self.dates = pd.DatetimeIndex(dates).sort_values().unique()
+
+    @classmethod
+    def from_indexes(cls, indexes: List[pd.DatetimeIndex]) -> "TradingCalendar":
+        """여러 종목 인덱스의 합집합 달력 (같은 달력은 한 번만 합침)"""
+        distinct: List[pd.DatetimeIndex] = []
+        for index in indexes:
+            if not any(index.equals(seen) for seen in distinct[-4:]):
+                distinct.append(index)
+        dates = pd.DatetimeIndex([])
+        for index in distinct:
+            dates = dates.union(index)
+        return cls(dates)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getstate__(self):
+        return self.dates.values.astype("datetime64[ns]").view(np.int64)
+
+    def __setstate__(self, state):
+        self.dates = pd.DatetimeIndex(state.view("datetime64[ns]"))
+
+    def offsets(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """날짜를 달력 오프셋(int32)으로 변환합니다. 달력에 없는 날짜가 있으면 ValueError"""
+        positions = self.dates.get_indexer(pd.DatetimeIndex(index))
+        if (positions < 0).any():
+            raise ValueError("거래일 달력에 없는 날짜가 있습니다.")
+        return positions.astype(np.int32)
+
+class CompactOHLCV:
+    """한 종목 일봉의 압축 표현
+
+    가격은 float32, 거래량은 uint32(범위를 넘으면 int64, 결측이 있으면 float32),
+    날짜는 공유 TradingCalendar 오프셋으로 보관합니다. 달력상 연속 구간이면
+    오프셋 배열 없이 시작 위치만 저장합니다.
+    지표 계산은 to_frame()으로 float64 DataFrame을 만든 뒤 수행합니다.
+    """
+
+    __slots__ = ("calendar", "first_day", "day", "open", "high", "low", "close", "volume", "source")
+
+    def __init__(self, calendar: TradingCalendar, first_day: int, day: Optional[np.ndarray],
+                 open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 volume: np.ndarray, source: str = None):
+        self.calendar = calendar
+        self.first_day = first_day
+        self.day = day
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.source = source
+
+    @staticmethod
+    def _compact_volume(volume: np.ndarray) -> np.ndarray:
+        volume = np.asarray(volume)
+        if len(volume) == 0:
+            return volume.astype(np.uint32)
+        if not np.isfinite(volume).all() or (volume != np.round(volume)).any():
+            return volume.astype(np.float32)
+        if volume.min() >= 0 and volume.max() < 2 ** 32:
+            return volume.astype(np.uint32)
+        return volume.astype(np.int64)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, calendar: TradingCalendar = None) -> "CompactOHLCV":
+        """가격 DataFrame을 압축합니다. 달력을 주지 않으면 종목 자체 날짜로 달력을 만듭니다."""
+        calendar = calendar or TradingCalendar(df.index)
+        offsets = calendar.offsets(df.index)
+        first_day = int(offsets[0]) if len(offsets) else 0
+        contiguous = len(offsets) == 0 or (offsets == np.arange(first_day, first_day + len(offsets))).all()
+
+        prices = {}
+        for field in ("Open", "High", "Low", "Close"):
+            values = df[field].to_numpy(dtype=np.float64)
+            if np.nanmax(np.abs(values), initial=0.0) >= FLOAT32_EXACT_MAX:
+                logger.warning(f"float32로 정확히 표현할 수 없는 가격이 있습니다: {field}")
+            prices[field] = values.astype(np.float32)
+
+        return cls(
+            calendar, first_day, None if contiguous else offsets,
+            prices["Open"], prices["High"], prices["Low"], prices["Close"],
+            cls._compact_volume(df["Volume"].to_numpy()),
+            df.attrs.get("source")
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.close) == 0
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self.day is None:
+            return self.calendar.dates[self.first_day:self.first_day + len(self.close)]
+        return self.calendar.dates[self.day]
+
+    @property
+    def nbytes(self) -> int:
+        """배열이 차지하는 바이트 수 (공유 달력 제외)"""
+        arrays = [self.open, self.high, self.low, self.close, self.volume]
+        if self.day is not None:
+            arrays.append(self.day)
+        return sum(a.nbytes for a in arrays)
+
+    def to_frame(self) -> pd.DataFrame:
+        """지표 계산용 float64 가격 DataFrame (거래량은 정수면 int64)"""
+        volume = self.volume.astype(np.float64 if self.volume.dtype.kind == "f" else np.int64)
+        df = pd.DataFrame({
+            "Open": self.open.astype(np.float64),
+            "High": self.high.astype(np.float64),
+            "Low": self.low.astype(np.float64),
+            "Close": self.close.astype(np.float64),
+            "Volume": volume,
+        }, index=self.index, columns=PRICE_COLUMNS, copy=False)
+        if self.source is not None:
+            df.attrs["source"] = self.source
+        return df
+
+def as_price_frame(price: Union[pd.DataFrame, CompactOHLCV]) -> pd.DataFrame:
+    """stock_data["price"]가 압축 표현이면 DataFrame으로 풀어 반환합니다."""
+    if isinstance(price, CompactOHLCV):
+        return price.to_frame()
+    return price
+
+def compact_stock_data(stock_data: Dict[str, Dict]) -> Dict[str, Dict]:
+    """get_all_stock_data() 결과의 가격을 공유 달력 기반 CompactOHLCV로 바꿉니다 (제자리 변경)."""
+    frames = {
+        code: data["price"] for code, data in stock_data.items()
+        if isinstance(data.get("price"), pd.DataFrame) and not data["price"].empty
+    }
+    calendar = TradingCalendar.from_indexes([pd.DatetimeIndex(df.index) for df in frames.values()])
+    before = after = 0
+    for code, df in frames.items():
+        compact = CompactOHLCV.from_frame(df, calendar)
+        before += df.memory_usage(index=True, deep=False).sum()
+        after += compact.nbytes
+        stock_data[code]["price"] = compact
+    if frames:
+        logger.info(f"가격 데이터 압축: {len(frames)}개 종목, {before / 1e6:.1f}MB → {after / 1e6:.1f}MB (달력 {len(calendar)}일 공유)")
+    return stock_data
@@ -0,0 +1,71 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+from config import COMPANY_CACHE
+from utils import logger
+
+class CompanyInfoCache:
+    """DART 회사 개요를 디스크에 보관하는 TTL 캐시
+
+    회사명·업종은 거의 바뀌지 않으므로 한 번 받은 결과를 ttl_days 동안
+    재사용합니다. 만료된 항목도 지우지 않고 남겨 두어, API를 쓸 수 없을 때
+    (일일 한도 초과 등) 마지막으로 받은 값으로 대신할 수 있습니다.
+    """
+
+    QUERY_CHUNK = 500   # get_many 쿼리 한 번에 묶는 종목 수
+
+    def __init__(self, path: str = None, ttl_days: float = None):
+        self.path = path or COMPANY_CACHE["path"]
+        self.ttl = (COMPANY_CACHE["ttl_days"] if ttl_days is None else ttl_days) * 86400
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS company_info ("
+                "stock_code TEXT PRIMARY KEY, info TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    def get(self, code: str, allow_stale: bool = False) -> Optional[Dict]:
+        """캐시된 회사 정보를 반환합니다. 만료되었으면 allow_stale일 때만 반환합니다."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT info, fetched_at FROM company_info WHERE stock_code = ?", (code,)
+            ).fetchone()
+        if row is None or not (allow_stale or self._is_fresh(row[1])):
+            return None
+        return json.loads(row[0])
+
+    def get_many(self, codes: Iterable[str]) -> Dict[str, Dict]:
+        """여러 종목의 유효한 캐시 항목을 읽습니다.
+
+        SQLite 바인딩 변수 수 제한(구버전 999개)을 넘지 않도록 QUERY_CHUNK개씩 나눠 조회합니다.
+        """
+        codes = list(codes)
+        rows = []
+        with self._connect() as conn:
+            for start in range(0, len(codes), self.QUERY_CHUNK):
+                chunk = codes[start:start + self.QUERY_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows.extend(conn.execute(
+                    f"SELECT stock_code, info, fetched_at FROM company_info WHERE stock_code IN ({placeholders})",
+                    chunk
+                ).fetchall())
+        return {code: json.loads(info) for code, info, fetched_at in rows if self._is_fresh(fetched_at)}
+
+    def put(self, code: str, info: Dict) -> None:
+        """회사 정보를 저장하고 수집 시각을 갱신합니다."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO company_info (stock_code, info, fetched_at) VALUES (?, ?, ?)",
+                (code, json.dumps(info, ensure_ascii=False), time.time())
+            )
+        logger.info(f"회사 정보 캐시 저장: {code}")
@@ -42,6 +42,21 @@ PRICE_HISTORY = {
     "end_date": datetime.datetime.now().strftime("%Y-%m-%d")
 }
 
+# ───────── 시장 달력 ─────────
+MARKET_CALENDAR = {
+    "close_time": "15:30",     # 정규장 마감 (이전에는 전 거래일 봉이 최신)
+    # 평일 휴장일 (빠진 휴장일은 캐시가 오래된 것으로 보여 마지막 저장일 이후 구간만 한 번 더 요청)
+    "holidays": [
+        "2025-01-01", "2025-01-27", "2025-01-28", "2025-01-29", "2025-01-30", "2025-03-03",
+        "2025-05-01", "2025-05-05", "2025-05-06", "2025-06-03", "2025-06-06", "2025-08-15",
+        "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08", "2025-10-09", "2025-12-25",
+        "2025-12-31",
+        "2026-01-01", "2026-02-16", "2026-02-17", "2026-02-18", "2026-03-02", "2026-05-01",
+        "2026-05-05", "2026-05-25", "2026-06-03", "2026-08-17", "2026-09-24", "2026-09-25",
+        "2026-10-09", "2026-12-25", "2026-12-31",
+    ]
+}
+
 # ───────── 볼린저 밴드 설정 ─────────
 BOLLINGER_BANDS = {
     "window": 20,
@@ -60,4 +75,134 @@ RETRY_CONFIG = {
     "max_retries": 3,
     "backoff_factor": 0.5,
     "status_forcelist": [500, 502, 503, 504]
-} 
\ No newline at end of file
+} 
+
+# ───────── 병렬 수집 설정 ─────────
+FETCH_CONFIG = {
+    "parallel": True,          # False면 기존처럼 순차 수집
+    "max_workers": 8,          # 전체 작업 스레드 수
+    "source_concurrency": {    # 데이터 소스별 동시 요청 상한
+        "price": 8,            # FinanceDataReader
+        "dart": 4              # OpenDartReader (재무제표·회사정보), 속도는 DART_RATE_LIMIT로 제한
+    },
+    "ticker_timeout": 60       # 종목당 최대 대기 시간(초)
+}
+
+# ───────── 가격 캐시 설정 ─────────
+PRICE_CACHE = {
+    "enabled": True,
+    "dir": "price_data"        # 종목별 {code}.parquet
+}
+
+# 가격 데이터 소스 체인 (앞에서부터 시도, 실패할 때만 다음 소스 실행)
+PRICE_SOURCES = ["cache", "fdr", "stale_cache", "synthetic"]
+
+# ───────── 가격 패널 설정 ─────────
+PRICE_PANEL = {
+    "enabled": True,           # 수집 후 패널 파일을 만들고 채점에서 메모리 맵으로 사용
+    "dir": "price_data/panel"  # {field}.npy, dates.npy, tickers.json
+}
+
+# ───────── 재무제표 저장소 설정 ─────────
+FINANCIAL_STORE = {
+    "path": "financial_data/financials.db"  # SQLite, 기존 CSV는 최초 생성 시 가져옴
+}
+
+# 저장소에 없는 종목은 DART 다중회사 요청(fnlttMultiAcnt)으로 묶어서 수집
+FINANCIAL_BULK = {
+    "enabled": True,
+    "batch_size": 50           # 요청 1건당 종목 수
+}
+
+# ───────── 회사 정보 캐시 설정 ─────────
+COMPANY_CACHE = {
+    "path": "financial_data/company_info.db",
+    "ttl_days": 30             # 만료 후에도 API 실패 시 마지막 값 사용
+}
+
+# ───────── 합성 데이터 설정 ─────────
+SYNTHETIC_MARKET = {
+    "seed": 42,
+    "volatility": 0.02,        # 일간 수익률 표준편차
+    "n_tickers": 5000          # 벤치마크 기본 종목 수
+}
+
+# ───────── DART 요청 제한 ─────────
+DART_RATE_LIMIT = {
+    "requests_per_second": 10,   # 토큰 버킷 충전 속도
+    "burst": 10,                 # 토큰 버킷 용량
+    "daily_quota": 20000,        # DART 일일 요청 한도
+    "ledger_path": "financial_data/dart_quota.json"
+}
+
+# ───────── 회로 차단기 설정 ─────────
+CIRCUIT_BREAKER = {
+    "failure_threshold": 3,        # 소스·메서드별 연속 실패 허용 횟수
+    "cooldown_seconds": 300,       # 회로가 열린 뒤 요청을 막는 시간
+    "negative_ttl_seconds": 900    # 실패한 종목·소스 조합을 다시 요청하지 않는 시간
+}
+
+# ───────── 지표 캐시 설정 ─────────
+INDICATOR_CACHE = {
+    "max_entries": 512         # 메모리에 유지할 종목(가격 데이터 버전) 수
+}
+
+# ───────── 증분 지표 상태 ─────────
+STREAMING_INDICATORS = {
+    "enabled": True,                 # 수집 후 새 봉만 반영해 ScoringEngine의 추세·RS 입력으로 사용
+    "dir": "price_data/indicators"   # 종목별 {code}.json
+}
+
+# ───────── 패턴 스캔 백엔드 ─────────
+PATTERN_BACKEND = {
+    "use_numba": True          # numba가 설치되어 있으면 JIT 커널 사용 (없으면 NumPy 경로)
+}
+
+# ───────── 패턴 점수 가중치 ─────────
+PATTERN_WEIGHTS = {
+    "vcp": 0.4,
+    "pocket_pivot": 0.3,
+    "breakout": 0.3
+}
+
+# ───────── 가격 데이터 저장 형식 ─────────
+PRICE_STORAGE = {
+    "compact": False           # True면 float32 가격·공유 거래일 달력(CompactOHLCV)으로 보관
+}
+
+# ───────── 점수 가중치 ─────────
+SCORE_WEIGHTS = {
+    "trend": 0.25,
+    "fundamental": 0.30,
+    "rs": 0.20,
+    "pattern": 0.25
+}
+
+FUNDAMENTAL_WEIGHTS = {
+    "sales_growth": 0.3,
+    "operating_income_growth": 0.3,
+    "roe": 0.2,
+    "debt_ratio": 0.2
+}
+
+RS_FILTER_THRESHOLD = 0.7      # RS 점수 필터 기준
+
+# ───────── 점수 결과 캐시 ─────────
+SCORE_CACHE = {
+    "path": "price_data/scores.parquet"   # 종목별 점수와 입력 해시
+}
+
+# ───────── 펀더멘털 정규화 ─────────
+FUNDAMENTAL_NORMALIZATION = {
+    "method": "single",        # "single": 종목 단독(지표가 있으면 0.5), "percentile": 유니버스 백분위, "zscore": z-점수
+    "winsor": (0.05, 0.95),    # 정규화 전 분위 절단 범위
+    "max_entries": 8           # 메모리에 유지할 정규화 행렬 수
+}
+
+# ───────── 상대강도(RS) 등급 ─────────
+RS_RATING = {
+    "mode": "absolute",        # "absolute": 13/26주 절대 수익률, "rating": 유니버스 내 상대 순위(1-99)
+    # 기간(거래일): 가중치 — 최근 분기 40%, 이전 분기들 20% (IBD 방식)
+    "horizons": {63: 0.4, 126: 0.2, 189: 0.2, 252: 0.2},
+    "max_entries": 8           # 메모리에 유지할 등급표 수 (거래일·유니버스별)
+}
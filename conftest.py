@@ -0,0 +1,82 @@
+"""테스트 공용 합성 데이터 팩토리와 비교 헬퍼"""
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from synthetic_market import SyntheticMarket
+
+@pytest.fixture
+def synthetic_prices():
+    """단일 종목 합성 일봉 팩토리 (seed=7, 기본 2023-01-01 ~ 2024-12-31)"""
+    def make(code: str = "900001", start: str = "2023-01-01", end: str = "2024-12-31", seed: int = 7) -> pd.DataFrame:
+        return SyntheticMarket(seed=seed).prices([code], start, end)[code]
+    return make
+
+@pytest.fixture
+def price_frames():
+    """여러 종목 합성 일봉 {code: DataFrame} 팩토리 (같은 거래일 달력)"""
+    def make(codes=("900001", "900002", "900003"), start: str = "2023-01-01", end: str = "2024-12-31",
+             seed: int = 7):
+        return SyntheticMarket(seed=seed).prices(list(codes), start, end)
+    return make
+
+@pytest.fixture
+def synthetic_universe():
+    """stock_data 형식의 합성 유니버스 팩토리
+
+    end를 주지 않으면 오늘까지 days일 (패턴 점수가 최근 30일 기준이므로)입니다.
+    """
+    def make(n: int, seed: int, start: str = None, end: str = None, days: int = 900):
+        if end is None:
+            end = pd.Timestamp.today().normalize()
+            start = end - pd.Timedelta(days=days)
+        return SyntheticMarket(seed=seed).universe(n, start_date=start, end_date=end)
+    return make
+
+@pytest.fixture
+def mixed_calendar():
+    """keep 종목만 휴장일이 들어간 합성 달력(B)으로 두고 나머지 종목에서 휴장일을 뺍니다.
+
+    data는 {code: DataFrame} 또는 stock_data 형식이며, 같은 형식의 새 dict를 반환합니다.
+    """
+    def apply(data, keep, step: int = 23):
+        def price(value):
+            return value if isinstance(value, pd.DataFrame) else value["price"]
+
+        holidays = max((price(data[code]) for code in keep), key=len).index[::step]
+        result = {}
+        for code, value in data.items():
+            if code in keep:
+                result[code] = value
+                continue
+            df = price(value)
+            df = df.loc[~df.index.isin(holidays)]
+            result[code] = df if isinstance(value, pd.DataFrame) else {**value, "price": df}
+        return result
+    return apply
+
+@pytest.fixture
+def assert_same_values():
+    """NaN을 같은 값으로 보는 {이름: 값} 비교"""
+    def check(actual, expected, rel: float = 1e-12):
+        assert actual.keys() == expected.keys()
+        for key in expected:
+            if pd.isna(expected[key]):
+                assert pd.isna(actual[key]), key
+            else:
+                assert actual[key] == pytest.approx(expected[key], rel=rel), key
+    return check
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    """작업 디렉터리를 tmp_path로 옮기고 DART 클라이언트를 빈 대역으로 바꾼 DataFetcher
+
+    테스트에서 fetcher.dart에 finstate 등을 지정해 응답을 흉내 냅니다.
+    회로 차단기·실패 캐시는 테스트마다 새로 만듭니다.
+    """
+    import data_fetcher
+    from circuit_breaker import SourceGuard
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_fetcher, "OpenDartReader", lambda api_key: SimpleNamespace())
+    monkeypatch.setattr(data_fetcher, "_source_guard", SourceGuard())
+    monkeypatch.setattr(data_fetcher, "_dart_limiter", None)
+    return data_fetcher.DataFetcher()
@@ -3,19 +3,90 @@ import pandas as pd
 import OpenDartReader
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import logging
 import os
-from config import DART_API_KEY, SEMICONDUCTOR_STOCKS, PRICE_HISTORY
+import threading
+import time
+from config import DART_API_KEY, SEMICONDUCTOR_STOCKS, PRICE_HISTORY, FETCH_CONFIG, PRICE_CACHE, PRICE_SOURCES, DART_RATE_LIMIT, FINANCIAL_BULK, PRICE_STORAGE, PRICE_PANEL, STREAMING_INDICATORS
 from utils import create_retry_session, safe_get, parse_amount, logger
+from price_cache import PriceCache
+from price_panel import PricePanel
+from streaming_indicators import StreamingIndicatorStore
+from compact_ohlcv import as_price_frame, compact_stock_data
+from financial_store import FinancialStore
+from company_cache import CompanyInfoCache
+from synthetic_market import SyntheticMarket
+from price_sources import PriceSource, CachePriceSource, FdrPriceSource, SyntheticPriceSource
+from rate_limiter import RateLimiter, QuotaExceededError
+from circuit_breaker import SourceGuard, SourceUnavailableError
 import numpy as np
 
+# 회로 차단기·실패 캐시와 DART 요청 제한은 인스턴스가 새로 만들어져도 프로세스 안에서 공유
+# (한도 장부 파일을 읽으므로 import 시점이 아니라 처음 사용할 때 생성)
+_source_guard: Optional[SourceGuard] = None
+_dart_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+def get_source_guard() -> SourceGuard:
+    """프로세스 공유 회로 차단기·실패 캐시"""
+    global _source_guard
+    with _shared_lock:
+        if _source_guard is None:
+            _source_guard = SourceGuard()
+        return _source_guard
+
+def get_dart_limiter() -> RateLimiter:
+    """프로세스 공유 DART 요청 속도·일일 한도 제한"""
+    global _dart_limiter
+    with _shared_lock:
+        if _dart_limiter is None:
+            _dart_limiter = RateLimiter("DART", **DART_RATE_LIMIT)
+        return _dart_limiter
+
 class DataFetcher:
+    @property
+    def source_guard(self) -> SourceGuard:
+        return get_source_guard()
+
+    @property
+    def dart_limiter(self) -> RateLimiter:
+        return get_dart_limiter()
+    
     def __init__(self):
         self.dart = OpenDartReader(DART_API_KEY)
         self.session = create_retry_session()
         self.data_dir = "financial_data"
         os.makedirs(self.data_dir, exist_ok=True)
+        # 재무제표 저장소 (기존 CSV는 최초 생성 시 가져옴)
+        self.financial_store = FinancialStore()
+        self._financial_preload: Dict[tuple, pd.DataFrame] = {}
+        # 회사 정보 캐시 (TTL 동안 API 재요청 없음)
+        self.company_cache = CompanyInfoCache()
+        self._company_preload: Dict[str, Dict] = {}
+        # 데이터 소스별 동시 요청 제한
+        self.source_limits = {
+            source: threading.BoundedSemaphore(limit)
+            for source, limit in FETCH_CONFIG["source_concurrency"].items()
+        }
+        # 일봉 가격 캐시 (마지막 저장일 이후만 추가 요청)
+        self.price_cache = PriceCache() if PRICE_CACHE["enabled"] else None
+        self.price_sources = self._build_price_sources()
+        # 종목별 증분 지표 상태 (지난 실행 이후 새 봉만 반영)
+        self.indicator_store = StreamingIndicatorStore() if STREAMING_INDICATORS["enabled"] else None
+        
+    def _dart_call(self, method: str, code: str, *args):
+        """DART 요청을 동시 실행 수·속도·일일 한도 제한 아래에서 실행합니다.
         
+        회로가 열려 있거나 같은 종목이 최근 실패했으면 요청하지 않고
+        SourceUnavailableError를 발생시킵니다.
+        """
+        def request():
+            with self.source_limits["dart"]:
+                self.dart_limiter.acquire()
+                return getattr(self.dart, method)(code, *args)
+        return self.source_guard.call("dart", method, code, request, passthrough=(QuotaExceededError,))
+            
     def validate_financial_data(self, financial_data: Dict[str, pd.DataFrame]) -> bool:
         """재무제표 데이터 유효성 검사"""
         if financial_data["annual"].empty:
@@ -33,77 +104,60 @@ class DataFetcher:
         return True
         
     def get_stock_price(self, code: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """주가 데이터를 가져옵니다."""
-        try:
-            if start_date is None:
-                start_date = PRICE_HISTORY["start_date"]
-            if end_date is None:
-                end_date = PRICE_HISTORY["end_date"]
-                
-            logger.info(f"주가 데이터 요청: {code}, {start_date} ~ {end_date}")
-            
-            # 샘플 데이터 생성 (테스트용)
-            sample_data = self._create_sample_price_data(code, start_date, end_date)
+        """주가 데이터를 가져옵니다.
+        
+        PRICE_SOURCES 순서(캐시 → FinanceDataReader → 만료 캐시 → 합성 데이터)대로 시도하며,
+        뒤쪽 소스는 앞의 소스가 실패했을 때만 실행됩니다. 데이터 출처는
+        반환값의 attrs["source"]에 기록됩니다.
+        """
+        if start_date is None:
+            start_date = PRICE_HISTORY["start_date"]
+        if end_date is None:
+            end_date = PRICE_HISTORY["end_date"]
             
-            # 실제 데이터 요청
+        logger.info(f"주가 데이터 요청: {code}, {start_date} ~ {end_date}")
+        
+        for source in self.price_sources:
             try:
-                df = fdr.DataReader(code, start_date, end_date)
-                if not df.empty:
-                    # 인덱스가 DatetimeIndex가 아니면 변환
-                    if not isinstance(df.index, pd.DatetimeIndex):
-                        df.index = pd.to_datetime(df.index)
-                    logger.info(f"주가 데이터 가져오기 성공: {code}, {len(df)}개 레코드")
-                    return df
+                if source.remote:
+                    df = self.source_guard.call(source.name, "fetch", code, source.fetch, code, start_date, end_date)
+                    if df is None or df.empty:
+                        self.source_guard.mark_failed(source.name, "fetch", code)
                 else:
-                    logger.warning(f"주가 데이터가 비어있어 샘플 데이터 사용: {code}")
-                    return sample_data
+                    df = source.fetch(code, start_date, end_date)
+            except SourceUnavailableError as e:
+                logger.info(f"주가 데이터 요청 생략({source.name}): {code}, {str(e)}")
+                continue
             except Exception as e:
-                logger.error(f"주가 데이터 요청 실패, 샘플 데이터 사용: {code}, 에러: {str(e)}")
-                return sample_data
+                logger.error(f"주가 데이터 요청 실패({source.name}), 다음 소스 사용: {code}, 에러: {str(e)}")
+                continue
+            if df is not None and not df.empty:
+                if source.name == "synthetic":
+                    logger.warning(f"실제 주가 데이터를 가져오지 못해 샘플 데이터 사용: {code}")
+                return df
                 
-        except Exception as e:
-            logger.error(f"주가 데이터 수집 실패: {code}, 에러: {str(e)}")
-            return self._create_sample_price_data(code, start_date, end_date)
+        df = self._create_sample_price_data(code, start_date, end_date)
+        df.attrs["source"] = "synthetic"
+        return df
+        
+    def _build_price_sources(self) -> List[PriceSource]:
+        """설정된 가격 소스 체인을 구성합니다."""
+        factories = {
+            "cache": lambda: CachePriceSource(self.price_cache) if self.price_cache else None,
+            "fdr": lambda: FdrPriceSource(self.price_cache, self.source_limits["price"]),
+            "stale_cache": lambda: CachePriceSource(self.price_cache, allow_stale=True) if self.price_cache else None,
+            "synthetic": lambda: SyntheticPriceSource(),
+        }
+        sources = [factories[name]() for name in PRICE_SOURCES]
+        return [source for source in sources if source is not None]
             
     def _create_sample_price_data(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
-        """테스트용 샘플 주가 데이터를 생성합니다."""
+        """테스트용 샘플 주가 데이터를 생성합니다.
+        
+        고정 시드의 합성 시장 생성기를 사용하므로 같은 종목·기간이면 항상 같은 데이터입니다.
+        """
         try:
-            # 날짜 범위 생성
-            start = pd.to_datetime(start_date)
-            end = pd.to_datetime(end_date)
-            date_range = pd.date_range(start=start, end=end, freq='B')  # 영업일만
-            
-            # 기본 가격 설정 (종목코드 기반으로 다양한 값 생성)
-            base_price = int(code) % 900 + 100  # 100~1000 사이 값
-            price_volatility = 0.02  # 가격 변동성
-            
-            # 데이터 프레임 생성
-            prices = []
-            volume = []
-            current_price = base_price
-            
-            for i in range(len(date_range)):
-                # 가격 변동
-                daily_change = current_price * np.random.normal(0, price_volatility)
-                open_price = current_price
-                close_price = max(10, current_price + daily_change)  # 최소 10원
-                high_price = max(open_price, close_price) * (1 + abs(np.random.normal(0, 0.01)))
-                low_price = min(open_price, close_price) * (1 - abs(np.random.normal(0, 0.01)))
-                
-                # 거래량 (평균 100만 주, 표준편차 50만 주)
-                daily_volume = max(1000, int(np.random.normal(1000000, 500000)))
-                
-                prices.append([open_price, high_price, low_price, close_price])
-                volume.append(daily_volume)
-                current_price = close_price
-            
-            # 데이터프레임 생성
-            df = pd.DataFrame(
-                prices, 
-                columns=['Open', 'High', 'Low', 'Close'],
-                index=date_range
-            )
-            df['Volume'] = volume
+            df = SyntheticMarket().prices([code], start_date, end_date)[code]
             logger.info(f"샘플 주가 데이터 생성 완료: {code}, {len(df)}개 레코드")
             return df
             
@@ -122,32 +176,35 @@ class DataFetcher:
     def get_financial_statements(self, code: str, year: int = 2024) -> Dict[str, pd.DataFrame]:
         """연간 재무제표를 가져옵니다."""
         try:
-            # CSV 파일 경로
-            csv_path = os.path.join(self.data_dir, f'financial_statement_{code}_{year}.csv')
-            
-            # CSV 파일이 존재하면 파일에서 데이터 읽기
-            if os.path.exists(csv_path):
-                try:
-                    annual = pd.read_csv(csv_path, encoding='utf-8-sig')
-                    logger.info(f"{code} 종목의 재무제표 데이터를 파일에서 읽었습니다.")
-                except Exception as e:
-                    logger.error(f"CSV 파일 읽기 실패: {str(e)}")
-                    annual = pd.DataFrame()
+            # 저장소 확인 (전 종목 일괄 로드 결과가 있으면 우선 사용)
+            preloaded = self._financial_preload.get((code, year))
+            annual = preloaded if preloaded is not None else self.financial_store.load(code, year)
+            if not annual.empty:
+                logger.info(f"{code} 종목의 재무제표 데이터를 저장소에서 읽었습니다.")
             else:
                 # DART API에서 데이터 가져오기
                 try:
-                    annual = self.dart.finstate(code, year)
+                    annual = self._dart_call("finstate", code, year)
                     if isinstance(annual, dict) and 'status' in annual:
                         # API 오류 응답 처리
                         logger.error(f"DART API 오류: {annual}")
+                        self.source_guard.mark_failed("dart", "finstate", code)
                         annual = pd.DataFrame()
                     elif annual.empty:
                         logger.warning(f"연간 재무제표 데이터가 비어있습니다: {code}")
+                        self.source_guard.mark_failed("dart", "finstate", code)
                         annual = pd.DataFrame()
                     else:
-                        # 성공적으로 가져온 경우 CSV로 저장
-                        annual.to_csv(csv_path, index=False, encoding='utf-8-sig')
+                        # 성공적으로 가져온 경우 저장소에 저장 (금액은 숫자로 변환)
+                        self.financial_store.save(annual, code, year)
+                        annual = self.financial_store.load(code, year)
                         logger.info(f"{code} 종목의 재무제표 데이터를 API에서 가져와 저장했습니다.")
+                except QuotaExceededError as e:
+                    logger.warning(f"DART 일일 한도 초과로 재무제표 요청 생략: {code}, {str(e)}")
+                    annual = pd.DataFrame()
+                except SourceUnavailableError as e:
+                    logger.info(f"재무제표 요청 생략: {code}, {str(e)}")
+                    annual = pd.DataFrame()
                 except Exception as e:
                     logger.error(f"DART API 요청 실패: {str(e)}")
                     annual = pd.DataFrame()
@@ -297,16 +354,53 @@ class DataFetcher:
 
     def get_company_info(self, code: str) -> Dict:
         """회사 기본 정보를 가져옵니다."""
+        # 캐시 확인 (일괄 워밍업 결과 → 디스크 캐시 순)
+        cached = self._company_preload.get(code) or self.company_cache.get(code)
+        if cached:
+            return cached
+            
+        company_info = self._fetch_company_info(code)
+        if company_info is not None:
+            self.company_cache.put(code, company_info)
+            return company_info
+            
+        # API 실패 시 만료된 캐시라도 있으면 사용
+        stale = self.company_cache.get(code, allow_stale=True)
+        if stale:
+            logger.warning(f"만료된 회사 정보 캐시 사용: {code}")
+            return stale
+        return self._create_sample_company_info(code)
+        
+    def warm_company_cache(self, codes: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """여러 종목의 회사 정보를 캐시에 미리 채웁니다.
+        
+        유효한 캐시 항목은 한 번의 쿼리로 읽고, 없거나 만료된 종목만 API로 요청합니다.
+        """
+        if codes is None:
+            codes = SEMICONDUCTOR_STOCKS
+        self._company_preload = self.company_cache.get_many(codes)
+        missing = [code for code in codes if code not in self._company_preload]
+        if missing:
+            logger.info(f"회사 정보 캐시 워밍업: {len(missing)}개 종목 요청")
+            with ThreadPoolExecutor(max_workers=FETCH_CONFIG["max_workers"]) as executor:
+                for code, info in zip(missing, executor.map(self.get_company_info, missing)):
+                    self._company_preload[code] = info
+        return self._company_preload
+        
+    def _fetch_company_info(self, code: str) -> Optional[Dict]:
+        """DART에서 회사 개요를 요청합니다. 실패하면 None을 반환합니다."""
         try:
             # 회사 개요 정보
-            info = self.dart.company(code)
+            info = self._dart_call("company", code)
             if isinstance(info, dict) and 'status' in info:
                 # API 오류 응답 처리
                 logger.error(f"DART API 오류: {info}")
-                return self._create_sample_company_info(code)
+                self.source_guard.mark_failed("dart", "company", code)
+                return None
             elif info is None or (isinstance(info, pd.DataFrame) and info.empty):
                 logger.warning(f"회사 개요 정보가 없습니다: {code}")
-                return self._create_sample_company_info(code)
+                self.source_guard.mark_failed("dart", "company", code)
+                return None
                 
             # 회사 정보 추출
             if isinstance(info, pd.DataFrame):
@@ -329,13 +423,19 @@ class DataFetcher:
             # 필수 정보 검증
             if not company_info["name"]:
                 logger.warning(f"회사명 정보가 없습니다: {code}")
-                return self._create_sample_company_info(code)
+                return None
                 
             return company_info
             
+        except QuotaExceededError as e:
+            logger.warning(f"DART 일일 한도 초과로 회사 정보 요청 생략: {code}, {str(e)}")
+            return None
+        except SourceUnavailableError as e:
+            logger.info(f"회사 정보 요청 생략: {code}, {str(e)}")
+            return None
         except Exception as e:
             logger.error(f"회사 정보 수집 실패: {code}, 에러: {str(e)}")
-            return self._create_sample_company_info(code)
+            return None
 
     def _create_sample_company_info(self, code: str) -> Dict:
         """샘플 회사 정보를 생성합니다."""
@@ -420,37 +520,181 @@ class DataFetcher:
                 "market_cap": 0
             }
             
-    def get_all_stock_data(self) -> Dict[str, Dict]:
-        """모든 대상 종목의 데이터를 수집합니다."""
-        result = {}
-        for code in SEMICONDUCTOR_STOCKS:
+    def preload_financial_statements(self, codes: List[str], year: int = 2024) -> None:
+        """저장소에서 여러 종목의 재무제표를 한 번에 읽어 둡니다."""
+        try:
+            loaded = self.financial_store.load_year(year, codes)
+            self._financial_preload = {(code, year): df for code, df in loaded.items()}
+            logger.info(f"재무제표 일괄 로드: {len(loaded)}/{len(codes)}개 종목 ({year})")
+        except Exception as e:
+            logger.error(f"재무제표 일괄 로드 실패: {str(e)}")
+            self._financial_preload = {}
+            
+    def fetch_financial_statements_bulk(self, codes: List[str], year: int = 2024) -> int:
+        """저장소에 없는 종목의 재무제표를 DART 다중회사 요청으로 일괄 수집합니다.
+        
+        FINANCIAL_BULK["batch_size"]개 종목을 한 번의 finstate 요청으로 묶고,
+        응답을 종목별로 나눠 저장소에 저장합니다. 수집한 종목 수를 반환합니다.
+        """
+        missing = [code for code in codes if (code, year) not in self._financial_preload]
+        # 고유번호가 없는 종목은 다중 요청 전체를 실패시키므로 미리 제외 (로컬 조회)
+        known = []
+        for code in missing:
+            if self.dart.find_corp_code(code):
+                known.append(code)
+            else:
+                logger.warning(f"DART 고유번호가 없어 재무제표 일괄 요청에서 제외: {code}")
+                self.source_guard.mark_failed("dart", "finstate", code)
+        if not known:
+            return 0
+            
+        batch_size = FINANCIAL_BULK["batch_size"]
+        fetched = 0
+        for i in range(0, len(known), batch_size):
+            batch = known[i:i + batch_size]
             try:
-                # 주가 데이터
-                price_data = self.get_stock_price(code)
-                if price_data.empty:
-                    logger.warning(f"주가 데이터 수집 실패로 건너뜀: {code}")
-                    continue
+                response = self._dart_call("finstate", ",".join(batch), year)
+            except QuotaExceededError as e:
+                logger.warning(f"DART 일일 한도 초과로 재무제표 일괄 요청 중단: {str(e)}")
+                break
+            except Exception as e:
+                logger.error(f"재무제표 일괄 요청 실패: {len(batch)}개 종목, 에러: {str(e)}")
+                continue
+            if not isinstance(response, pd.DataFrame) or response.empty or "stock_code" not in response.columns:
+                logger.warning(f"재무제표 일괄 응답이 비어있습니다: {len(batch)}개 종목")
+                continue
+                
+            response = response.copy()
+            response["stock_code"] = response["stock_code"].astype(str).str.strip().str.zfill(6)
+            self.financial_store.save(response, year=year)
+            returned = set(response["stock_code"])
+            for code in batch:
+                if code not in returned:
+                    self.source_guard.mark_failed("dart", "finstate", code)
+            fetched += len(returned & set(batch))
+            
+        # 새로 저장한 종목을 일괄 로드 결과에 반영
+        if fetched:
+            loaded = self.financial_store.load_year(year, known)
+            self._financial_preload.update({(code, year): df for code, df in loaded.items()})
+        logger.info(f"재무제표 일괄 수집: {fetched}/{len(known)}개 종목 ({year})")
+        return fetched
+        
+    def _fetch_stock_data(self, code: str) -> Optional[Dict]:
+        """한 종목의 주가·재무제표·회사 정보를 수집합니다."""
+        try:
+            # 주가 데이터
+            price_data = self.get_stock_price(code)
+            if price_data.empty:
+                logger.warning(f"주가 데이터 수집 실패로 건너뜀: {code}")
+                return None
+                
+            # 재무제표
+            financial_data = self.get_financial_statements(code, 2024)
+            if financial_data["annual"].empty:
+                logger.warning(f"재무제표 데이터 수집 실패로 건너뜀: {code}")
+                return None
+                
+            # 회사 정보
+            company_info = self.get_company_info(code)
+            if not company_info:
+                logger.warning(f"회사 정보 수집 실패로 건너뜀: {code}")
+                return None
+                
+            return {
+                "price": price_data,
+                "financial": financial_data,
+                "info": company_info
+            }
+            
+        except Exception as e:
+            logger.error(f"데이터 수집 실패: {code}, 에러: {str(e)}")
+            return None
+            
+    def get_all_stock_data(self, codes: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """모든 대상 종목의 데이터를 수집합니다."""
+        if codes is None:
+            codes = SEMICONDUCTOR_STOCKS
+        self.preload_financial_statements(codes, 2024)
+        if FINANCIAL_BULK["enabled"]:
+            self.fetch_financial_statements_bulk(codes, 2024)
+        self._company_preload = self.company_cache.get_many(codes)
+        if FETCH_CONFIG["parallel"] and len(codes) > 1:
+            result = self._get_all_stock_data_parallel(codes)
+        else:
+            result = {}
+            for code in codes:
+                stock = self._fetch_stock_data(code)
+                if stock is not None:
+                    result[code] = stock
                     
-                # 재무제표
-                financial_data = self.get_financial_statements(code, 2024)
-                if financial_data["annual"].empty:
-                    logger.warning(f"재무제표 데이터 수집 실패로 건너뜀: {code}")
-                    continue
+        # 공유 거래일 달력 기반 float32 압축 (캐시·작업 프로세스 메모리 절감)
+        if PRICE_STORAGE["compact"]:
+            compact_stock_data(result)
+        if self.indicator_store is not None:
+            self.advance_indicators(result)
+        # 채점에서 메모리 맵으로 여는 패널 파일 (압축 후 가격과 같은 값)
+        if PRICE_PANEL["enabled"] and result:
+            try:
+                self.build_price_panel(result)
+            except Exception as e:
+                logger.error(f"가격 패널 생성 실패: {str(e)}")
+        return result
+        
+    def _get_all_stock_data_parallel(self, codes: List[str]) -> Dict[str, Dict]:
+        """작업 스레드 풀로 여러 종목을 동시에 수집합니다.
+        
+        종목별 시간 제한은 작업이 실제로 시작된 시점부터 계산하며,
+        시간을 초과한 종목은 결과에서 제외합니다.
+        """
+        timeout = FETCH_CONFIG["ticker_timeout"]
+        started: Dict[str, float] = {}
+        
+        def run(code: str) -> Optional[Dict]:
+            started[code] = time.monotonic()
+            return self._fetch_stock_data(code)
+            
+        fetched = {}
+        executor = ThreadPoolExecutor(
+            max_workers=FETCH_CONFIG["max_workers"],
+            thread_name_prefix="fetch"
+        )
+        try:
+            futures = {executor.submit(run, code): code for code in codes}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    fetched[futures[future]] = future.result()
                     
-                # 회사 정보
-                company_info = self.get_company_info(code)
-                if not company_info:
-                    logger.warning(f"회사 정보 수집 실패로 건너뜀: {code}")
+                # 시간 초과 종목 정리 (실행 중인 스레드는 중단할 수 없으므로 결과만 버림)
+                now = time.monotonic()
+                for future in list(pending):
+                    code = futures[future]
+                    if code in started and now - started[code] > timeout:
+                        logger.error(f"데이터 수집 시간 초과로 건너뜀: {code} ({timeout}초)")
+                        pending.discard(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+        # 기존 순차 수집과 동일한 종목 순서 유지
+        return {code: fetched[code] for code in codes if fetched.get(code) is not None}
+        
+    def advance_indicators(self, stock_data: Dict[str, Dict]) -> None:
+        """종목별 증분 지표 상태에 새 봉만 반영해 stock_data[code]["indicators"]에 담습니다.
+        
+        채점과 같은 값이 되도록 압축 후 가격으로 반영하며, 합성 주가는 상태를 오염시키지
+        않도록 건너뜁니다.
+        """
+        for code, data in stock_data.items():
+            try:
+                price = as_price_frame(data["price"])
+                if price.empty or price.attrs.get("source") == "synthetic":
                     continue
-                    
-                result[code] = {
-                    "price": price_data,
-                    "financial": financial_data,
-                    "info": company_info
-                }
-                
+                data["indicators"] = self.indicator_store.advance(code, price)
             except Exception as e:
-                logger.error(f"데이터 수집 실패: {code}, 에러: {str(e)}")
-                continue
+                logger.error(f"증분 지표 갱신 실패: {code}, 에러: {str(e)}")
                 
-        return result 
\ No newline at end of file
+    def build_price_panel(self, stock_data: Dict[str, Dict], path: str = None) -> PricePanel:
+        """수집한 종목들의 주가로 메모리 맵 가격 패널을 생성합니다."""
+        return PricePanel.build({code: as_price_frame(data["price"]) for code, data in stock_data.items()}, path)
@@ -0,0 +1,125 @@
+import os
+import glob
+import sqlite3
+import threading
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from config import FINANCIAL_STORE
+from utils import parse_amount, logger
+
+# DART 주요계정(fnlttSinglAcnt/fnlttMultiAcnt) 응답 컬럼
+COLUMNS = [
+    "rcept_no", "reprt_code", "bsns_year", "corp_code", "stock_code", "fs_div", "fs_nm",
+    "sj_div", "sj_nm", "account_nm", "thstrm_nm", "thstrm_dt", "thstrm_amount",
+    "frmtrm_nm", "frmtrm_dt", "frmtrm_amount", "bfefrmtrm_nm", "bfefrmtrm_dt",
+    "bfefrmtrm_amount", "ord", "currency"
+]
+AMOUNT_COLUMNS = ["thstrm_amount", "frmtrm_amount", "bfefrmtrm_amount"]
+KEY_COLUMNS = ["stock_code", "bsns_year", "reprt_code", "fs_div", "account_nm"]
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS financial_statements (
+    {", ".join(f"{c} REAL" if c in AMOUNT_COLUMNS else f"{c} TEXT" for c in COLUMNS)},
+    PRIMARY KEY ({", ".join(KEY_COLUMNS)})
+) WITHOUT ROWID
+"""
+
+class FinancialStore:
+    """전 종목 재무제표를 하나의 SQLite 테이블로 보관하는 저장소
+
+    (stock_code, bsns_year, reprt_code, fs_div, account_nm)를 기본키로 하는
+    클러스터드 B-tree라 종목·연도 조회는 O(log n)이며, 금액 컬럼은
+    쉼표 문자열이 아닌 숫자로 저장됩니다.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or FINANCIAL_STORE["path"]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        is_new = not os.path.exists(self.path)
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+        if is_new:
+            self.import_csv_dir(os.path.dirname(self.path) or ".")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _normalize(df: pd.DataFrame, code: str = None, year: int = None) -> pd.DataFrame:
+        """DART 응답을 저장 형식(문자열 키, 숫자 금액)으로 변환합니다."""
+        df = df.copy()
+        for col in COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+        if code is not None:
+            df["stock_code"] = df["stock_code"].fillna(code)
+        if year is not None:
+            df["bsns_year"] = df["bsns_year"].fillna(str(year))
+        for col in COLUMNS:
+            if col in AMOUNT_COLUMNS:
+                # 쉼표 문자열·숫자 모두 실수로, 빈 값과 "-"는 NULL로 저장
+                df[col] = [
+                    None if pd.isna(v) or str(v).strip() in ("", "-") else parse_amount(v)
+                    for v in df[col]
+                ]
+            else:
+                df[col] = [None if pd.isna(v) else str(v) for v in df[col]]
+        df["stock_code"] = df["stock_code"].str.zfill(6)
+        df["reprt_code"] = df["reprt_code"].fillna("11011")
+        return df[COLUMNS]
+
+    def save(self, df: pd.DataFrame, code: str = None, year: int = None) -> int:
+        """재무제표 행을 저장합니다. 같은 키의 기존 행은 교체됩니다."""
+        if df is None or df.empty:
+            return 0
+        rows = self._normalize(df, code, year)
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._write_lock, self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO financial_statements ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None)
+            )
+        return len(rows)
+
+    def _query(self, where: str = "", params: Tuple = ()) -> pd.DataFrame:
+        with self._connect() as conn:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(COLUMNS)} FROM financial_statements {where} ORDER BY stock_code, fs_div, CAST(ord AS INTEGER)",
+                conn, params=params
+            )
+        return df
+
+    def load(self, code: str, year: int) -> pd.DataFrame:
+        """한 종목·연도의 재무제표를 읽습니다."""
+        return self._query("WHERE stock_code = ? AND bsns_year = ?", (code, str(year)))
+
+    def load_year(self, year: int, codes: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """한 연도의 전 종목 재무제표를 한 번의 쿼리로 읽어 종목별로 나눕니다."""
+        df = self._query("WHERE bsns_year = ?", (str(year),))
+        if codes is not None:
+            df = df[df["stock_code"].isin(codes)]
+        return {code: group.reset_index(drop=True) for code, group in df.groupby("stock_code", sort=False)}
+
+    def has(self, code: str, year: int) -> bool:
+        """해당 종목·연도의 재무제표가 저장되어 있는지 확인합니다."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM financial_statements WHERE stock_code = ? AND bsns_year = ? LIMIT 1",
+                (code, str(year))
+            ).fetchone()
+        return row is not None
+
+    def import_csv_dir(self, data_dir: str) -> int:
+        """기존 financial_statement_{code}_{year}.csv 파일들을 저장소로 옮깁니다."""
+        total = 0
+        for csv_path in sorted(glob.glob(os.path.join(data_dir, "financial_statement_*_*.csv"))):
+            try:
+                df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=str)
+                code, year = os.path.basename(csv_path)[len("financial_statement_"):-len(".csv")].rsplit("_", 1)
+                total += self.save(df, code, int(year))
+            except Exception as e:
+                logger.error(f"재무제표 CSV 가져오기 실패: {csv_path}, 에러: {str(e)}")
+        if total:
+            logger.info(f"재무제표 CSV {total}개 행을 저장소로 가져왔습니다: {self.path}")
+        return total
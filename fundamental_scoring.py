@@ -0,0 +1,172 @@
+"""유니버스 펀더멘털 지표와 횡단면 정규화
+
+전 종목의 연간 재무제표로 SEPA 지표 행렬(매출·영업이익 성장률, ROE, 부채비율)을 한 번에
+계산하고, 설정한 방식으로 0-1 범위 정규화 행렬을 만듭니다.
+
+    metrics = fundamental_metrics(financials, codes)
+    normalized = get_normalized_fundamentals(metrics)      # 지표 내용별 캐시
+    scores = fundamental_scores(normalized, metrics, has_annual)
+
+정규화 방식 (FUNDAMENTAL_NORMALIZATION["method"]):
+    single     : 기존 종목 단독 정규화 (0이 아닌 지표 0.5, ScoringEngine 기본 동작)
+    percentile : 분위 절단(winsorize) 후 유니버스 백분위
+    zscore     : 분위 절단 후 z-점수를 ±3σ 범위에서 0-1로 변환
+부채비율은 낮을수록 좋으므로 1 - 값으로 뒤집습니다. 값이 0인 지표는 계산할 수 없었던
+값으로 보고 분포에서 빼며, percentile·zscore에서는 0점입니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from config import FUNDAMENTAL_WEIGHTS, FUNDAMENTAL_NORMALIZATION
+from utils import sorted_percentile, logger
+
+# 펀더멘털 지표 계산에 쓰는 계정과목
+FUNDAMENTAL_ACCOUNTS = ["매출액", "영업이익", "당기순이익", "자본총계", "부채총계"]
+
+def _parse_amounts(values: pd.Series) -> np.ndarray:
+    """금액 열을 숫자 배열로 변환합니다 (utils.parse_amount와 같이 쉼표 제거, 변환 실패·결측은 0)."""
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = pd.to_numeric(values, errors="coerce")
+    else:
+        text = values.astype("string").str.replace(",", "", regex=False)
+        numbers = pd.to_numeric(text, errors="coerce")
+    return numbers.fillna(0.0).to_numpy(dtype=np.float64)
+
+def _growth_rate(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """utils.calculate_growth_rate의 벡터 버전 (이전값이 0이면 0)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(previous == 0, 0.0, (current - previous) / np.abs(previous) * 100)
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator == 0, 0.0, numerator / denominator * 100)
+
+def fundamental_metrics(financials: Dict[str, pd.DataFrame], codes: Iterable[str]) -> pd.DataFrame:
+    """종목별 SEPA 재무 지표 표 (SEPAMetrics.get_all_metrics()와 같은 열)
+
+    모든 종목의 연간 재무제표 행을 하나로 이어 붙인 뒤, 연결재무제표(CFS)에서
+    종목·계정과목별 첫 행만 남겨 한 번에 계산합니다.
+    """
+    codes = list(codes)
+    columns = ["fs_div", "account_nm", "thstrm_amount", "frmtrm_amount"]
+    parts = {column: [] for column in columns}
+    owners = []
+    for code in codes:
+        annual = financials.get(code)
+        if annual is None or annual.empty:
+            continue
+        for column in columns:
+            parts[column].append(annual[column].to_numpy(dtype=object))
+        owners.append(np.full(len(annual), code, dtype=object))
+
+    current = pd.DataFrame(0.0, index=pd.Index(codes, name="code"), columns=FUNDAMENTAL_ACCOUNTS)
+    previous = current.copy()
+    if owners:
+        rows = pd.DataFrame({column: np.concatenate(arrays) for column, arrays in parts.items()})
+        rows["code"] = np.concatenate(owners)
+        rows = rows[(rows["fs_div"] == "CFS") & rows["account_nm"].isin(FUNDAMENTAL_ACCOUNTS)]
+        # 종목·계정과목별 최신(첫) 행
+        rows = rows.drop_duplicates(["code", "account_nm"], keep="first")
+        for target, column in ((current, "thstrm_amount"), (previous, "frmtrm_amount")):
+            table = pd.DataFrame({
+                "code": rows["code"].to_numpy(),
+                "account_nm": rows["account_nm"].to_numpy(),
+                "amount": _parse_amounts(rows[column]),
+            }).pivot(index="code", columns="account_nm", values="amount")
+            target.update(table.reindex(index=current.index, columns=FUNDAMENTAL_ACCOUNTS))
+
+    capital = current["자본총계"].to_numpy()
+    return pd.DataFrame({
+        "sales_growth": _growth_rate(current["매출액"].to_numpy(), previous["매출액"].to_numpy()),
+        "operating_income_growth": _growth_rate(current["영업이익"].to_numpy(), previous["영업이익"].to_numpy()),
+        "roe": _ratio(current["당기순이익"].to_numpy(), capital),
+        "debt_ratio": _ratio(current["부채총계"].to_numpy(), capital),
+    }, index=current.index)
+
+def _winsorize(values: np.ndarray, limits) -> np.ndarray:
+    low, high = np.quantile(values, limits)
+    return np.clip(values, low, high)
+
+def _normalize_column(values: np.ndarray, method: str, limits) -> np.ndarray:
+    """지표 하나(종목 열)를 0-1로 정규화합니다. 0·결측은 0"""
+    valid = np.isfinite(values) & (values != 0)
+    norm = np.zeros(len(values))
+    if not valid.any():
+        return norm
+    x = _winsorize(values[valid], limits)
+    if method == "percentile":
+        norm[valid] = sorted_percentile(np.sort(x), x) / 100
+    elif method == "zscore":
+        std = x.std()
+        z = (x - x.mean()) / std if std > 0 else np.zeros(len(x))
+        norm[valid] = np.clip(0.5 + z / 6, 0, 1)
+    else:
+        raise ValueError(f"알 수 없는 정규화 방식: {method}")
+    return norm
+
+def normalize_fundamentals(metrics: pd.DataFrame, method: str = None) -> pd.DataFrame:
+    """지표 행렬(종목 × 지표)을 0-1 정규화 행렬로 변환합니다 (부채비율은 뒤집은 값)."""
+    method = method or FUNDAMENTAL_NORMALIZATION["method"]
+    if method == "single":
+        norm = (metrics != 0).astype(np.float64) * 0.5
+        norm["debt_ratio"] = 1 - norm["debt_ratio"]
+        return norm
+
+    limits = FUNDAMENTAL_NORMALIZATION["winsor"]
+    norm = pd.DataFrame({
+        column: _normalize_column(metrics[column].to_numpy(dtype=np.float64), method, limits)
+        for column in metrics.columns
+    }, index=metrics.index)
+    valid_debt = metrics["debt_ratio"].to_numpy() != 0
+    norm["debt_ratio"] = np.where(valid_debt, 1 - norm["debt_ratio"], 0.0)
+    return norm
+
+def metrics_key(metrics: pd.DataFrame, method: str) -> str:
+    """정규화 캐시 키: 지표 행렬 내용(종목 코드 포함)과 정규화 설정"""
+    digest = hashlib.blake2b(metrics.to_numpy(dtype=np.float64).tobytes(), digest_size=16)
+    digest.update(",".join(map(str, metrics.index)).encode())
+    digest.update(",".join(map(str, metrics.columns)).encode())
+    digest.update(f"{method}|{FUNDAMENTAL_NORMALIZATION['winsor']}".encode())
+    return digest.hexdigest()
+
+_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_normalized_fundamentals(metrics: pd.DataFrame, method: str = None) -> pd.DataFrame:
+    """지표 행렬의 정규화 행렬을 반환합니다 (내용별 LRU 캐시).
+
+    같은 재무 지표로 앱과 백테스트가 반복 호출해도 한 번만 계산합니다.
+    반환된 DataFrame은 공유 객체이므로 수정하지 않아야 합니다.
+    """
+    method = method or FUNDAMENTAL_NORMALIZATION["method"]
+    key = metrics_key(metrics, method)
+    with _cache_lock:
+        normalized = _cache.get(key)
+        if normalized is not None:
+            _cache.move_to_end(key)
+            return normalized
+
+    normalized = normalize_fundamentals(metrics, method)
+    logger.info(f"펀더멘털 정규화 완료: {len(normalized)}개 종목, 방식={method}")
+    with _cache_lock:
+        _cache[key] = normalized
+        while len(_cache) > FUNDAMENTAL_NORMALIZATION["max_entries"]:
+            _cache.popitem(last=False)
+    return normalized
+
+def clear_fundamental_cache() -> None:
+    """펀더멘털 정규화 캐시를 비웁니다."""
+    with _cache_lock:
+        _cache.clear()
+
+def fundamental_scores(normalized: pd.DataFrame, metrics: pd.DataFrame, has_annual: pd.Series) -> pd.Series:
+    """정규화 행렬의 가중합 펀더멘털 점수 (ScoringEngine.calculate_fundamental_score와 같은 규칙)
+
+    재무제표가 없거나 모든 지표가 0인 종목은 0점입니다.
+    """
+    score = sum(normalized[k] * w for k, w in FUNDAMENTAL_WEIGHTS.items()).clip(0, 1)
+    all_zero = (metrics == 0).all(axis=1)
+    return score.where(has_annual & ~all_zero, 0.0)
@@ -0,0 +1,168 @@
+"""입력 변경 추적 기반 증분 채점
+
+종목마다 점수 계산에 들어가는 입력(가격 최근 구간, 연간 재무제표 행, 이름·가격 출처)과
+공통 입력(점수 설정, 등록 패턴)의 내용 해시를 만들고, 저장된 결과의 해시와 같은
+종목은 다시 계산하지 않고 그대로 사용합니다.
+
+    scores = score_universe_incremental(stock_data)
+
+RS 등급(RS_RATING["mode"] == "rating")이나 횡단면 펀더멘털 정규화를 쓰면 한 종목의
+점수가 유니버스 전체에 의존하므로, 유니버스 입력 해시를 모든 종목 키에 넣고 바뀐 종목이
+하나라도 있으면 전 종목을 다시 계산합니다.
+
+패턴 점수의 최근 30일 구간은 종목 마지막 봉 기준(recent_as_of)이므로 실행 날짜는 키에
+넣지 않습니다. 새 봉이 없으면 다음 날 실행해도 다시 계산하지 않습니다.
+"""
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import config
+from config import SCORE_CACHE
+from batch_scoring import score_universe, SCORE_COLUMNS, SCORE_LOOKBACK
+from compact_ohlcv import as_price_frame
+from fundamental_scoring import fundamental_metrics, metrics_key
+from pattern_detector import recent_as_of
+from pattern_registry import PATTERN_REGISTRY
+from price_panel import PricePanel
+from rs_rating import universe_key
+from utils import logger
+
+# 점수에 영향을 주는 설정 (값이 바뀌면 모든 종목을 다시 계산)
+SCORE_CONFIG_NAMES = [
+    "SCORE_WEIGHTS", "FUNDAMENTAL_WEIGHTS", "RS_FILTER_THRESHOLD", "SEPA_THRESHOLDS", "RS_RATING",
+    "FUNDAMENTAL_NORMALIZATION", "BOLLINGER_BANDS", "VCP_WINDOW", "POCKET_PIVOT_VOL"
+]
+
+class ScoreCache:
+    """종목별 점수와 입력 해시(input_key)를 Parquet 파일 하나에 보관합니다."""
+
+    def __init__(self, path: str = None):
+        self.path = path or SCORE_CACHE["path"]
+
+    def load(self) -> pd.DataFrame:
+        """저장된 결과 (code 인덱스). 없거나 읽을 수 없으면 빈 DataFrame"""
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=SCORE_COLUMNS + ["input_key"]).set_index("code")
+        try:
+            return pd.read_parquet(self.path)
+        except Exception as e:
+            logger.error(f"점수 캐시 읽기 실패: {self.path}, 에러: {str(e)}")
+            return pd.DataFrame(columns=SCORE_COLUMNS + ["input_key"]).set_index("code")
+
+    def save(self, results: pd.DataFrame) -> None:
+        """결과를 원자적으로 덮어씁니다."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        try:
+            results.to_parquet(tmp_path)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"점수 캐시 저장 실패: {self.path}, 에러: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def config_key() -> str:
+    """점수 설정·등록 패턴의 해시"""
+    settings = {name: getattr(config, name) for name in SCORE_CONFIG_NAMES}
+    settings["patterns"] = {pid: spec.weight for pid, spec in PATTERN_REGISTRY.items()}
+    text = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def _array_bytes(values) -> bytes:
+    """숫자·날짜 배열은 원시 바이트, 그 밖(문자열 등)은 문자열로 이어 붙인 바이트"""
+    values = np.asarray(values)
+    if values.dtype.kind in "biufmM":
+        return np.ascontiguousarray(values).tobytes()
+    return "\x1f".join(map(str, values)).encode()
+
+def _frame_digest(digest, df: Optional[pd.DataFrame]) -> None:
+    # hash_pandas_object는 열마다 Series를 만들어 종목 수천 개에서는 채점보다 느림
+    if df is None or df.empty:
+        digest.update(b"-")
+        return
+    dtypes = df.dtypes.tolist()
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(",".join(map(str, dtypes)).encode())
+    digest.update(_array_bytes(df.index))
+    # 가격 프레임처럼 모두 숫자 열이면 원시 바이트, 재무제표처럼 섞여 있으면 문자열로 한 번에 변환
+    if all(isinstance(dtype, np.dtype) and dtype.kind in "biuf" for dtype in dtypes):
+        digest.update(_array_bytes(df.to_numpy(dtype=np.float64)))
+    else:
+        digest.update(_array_bytes(df.to_numpy(dtype=object).ravel()))
+
+def ticker_input_keys(stock_data: Dict[str, Dict], now: pd.Timestamp = None) -> pd.Series:
+    """종목별 입력 해시 (가격 최근 SCORE_LOOKBACK일, 패턴 기준일, 연간 재무제표, 이름, 가격 출처, 공통 입력)"""
+    now = pd.Timestamp.now() if now is None else now
+    shared = config_key()
+
+    frames = {}
+    for code, data in stock_data.items():
+        price = data.get("price")
+        frames[code] = None if price is None else as_price_frame(price).iloc[-SCORE_LOOKBACK:]
+    annuals = {code: data.get("financial", {}).get("annual") for code, data in stock_data.items()}
+
+    # 유니버스 전체에 의존하는 점수 설정이면 유니버스 입력도 모든 종목의 입력
+    if config.RS_RATING["mode"] == "rating":
+        shared += universe_key({code: df for code, df in frames.items() if df is not None})
+    if config.FUNDAMENTAL_NORMALIZATION["method"] != "single":
+        codes = list(stock_data)
+        shared += metrics_key(fundamental_metrics(annuals, codes), config.FUNDAMENTAL_NORMALIZATION["method"])
+
+    keys = {}
+    for code, data in stock_data.items():
+        digest = hashlib.blake2b(shared.encode(), digest_size=16)
+        _frame_digest(digest, frames[code])
+        # 패턴 기준일은 보통 마지막 봉이라 가격 해시에 이미 들어 있고, now가 더 이를 때만 달라짐
+        if frames[code] is not None:
+            digest.update(recent_as_of(frames[code].index, now).normalize().isoformat().encode())
+        digest.update(str(frames[code].attrs.get("source") if frames[code] is not None else None).encode())
+        _frame_digest(digest, annuals[code])
+        digest.update(str(data.get("info", {}).get("name", "")).encode())
+        keys[code] = digest.hexdigest()
+    return pd.Series(keys, dtype=object)
+
+def score_universe_incremental(stock_data: Dict[str, Dict], now: pd.Timestamp = None,
+                               cache: ScoreCache = None, price_panel: PricePanel = None) -> pd.DataFrame:
+    """입력이 바뀐 종목만 다시 채점하고 나머지는 저장된 결과를 사용합니다.
+
+    반환값은 score_universe()와 같은 열·순서이며, attrs["rescored"]에 다시 계산한 종목 수를 담습니다.
+    price_panel은 다시 계산하는 종목의 score_universe()에 그대로 넘깁니다.
+    """
+    now = pd.Timestamp.now() if now is None else now
+    cache = cache or ScoreCache()
+    codes = list(stock_data)
+    if not codes:
+        return score_universe({}, now)
+
+    keys = ticker_input_keys(stock_data, now)
+    cached = cache.load()
+    known = cached["input_key"].reindex(keys.index)
+    changed = [code for code in codes if known.get(code) != keys[code]]
+
+    cross_sectional = (config.RS_RATING["mode"] == "rating" or
+                       config.FUNDAMENTAL_NORMALIZATION["method"] != "single")
+    if changed and cross_sectional:
+        changed = codes
+
+    if changed:
+        # 부분집합의 패널 달력은 전체와 다를 수 있지만 가격 지표는 종목 자신의 봉 기준이므로
+        # (PanelIndicators.by_bar) 다시 계산한 종목과 재사용한 종목의 점수가 같은 기준임
+        fresh = score_universe({code: stock_data[code] for code in changed}, now,
+                               price_panel=price_panel).set_index("code")
+        fresh["input_key"] = keys.reindex(fresh.index).to_numpy()
+        reused = cached.loc[[code for code in codes if code not in set(changed)]]
+        # 이번 유니버스에 없는 종목의 결과는 다른 호출을 위해 남겨 둠
+        others = cached.loc[~cached.index.isin(codes)]
+        merged = pd.concat([frame for frame in (others, reused, fresh) if not frame.empty])
+        cache.save(merged)
+    else:
+        merged = cached
+
+    result = merged.loc[codes].reset_index()[SCORE_COLUMNS]
+    result.attrs["rescored"] = len(changed)
+    logger.info(f"증분 채점: {len(codes)}개 종목 중 {len(changed)}개 다시 계산")
+    return result
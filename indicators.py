@@ -0,0 +1,115 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Tuple
+import pandas as pd
+from config import INDICATOR_CACHE, BOLLINGER_BANDS
+
+class IndicatorFrame:
+    """한 종목 가격 데이터에 대한 지표 메모이제이션
+
+    지표는 (종류, 컬럼, 기간, min_periods) 키로 처음 요청될 때 한 번만 계산되며,
+    ScoringEngine·PatternDetector·앱이 같은 객체를 공유합니다.
+    반환된 Series는 공유 객체이므로 수정하지 않아야 합니다.
+    """
+
+    def __init__(self, price_data: pd.DataFrame, key: str = None):
+        self.price_data = price_data
+        self.key = key
+        self._memo: Dict[Hashable, object] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, key: Hashable, compute):
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    def sma(self, window: int, min_periods: int = None, column: str = "Close") -> pd.Series:
+        """이동평균 (min_periods=None이면 window와 같음, pandas rolling 기본값)"""
+        return self._get(
+            ("sma", column, window, min_periods),
+            lambda: self.price_data[column].rolling(window=window, min_periods=min_periods).mean()
+        )
+
+    def rolling_std(self, window: int, min_periods: int = None, column: str = "Close") -> pd.Series:
+        """이동 표준편차"""
+        return self._get(
+            ("std", column, window, min_periods),
+            lambda: self.price_data[column].rolling(window=window, min_periods=min_periods).std()
+        )
+
+    def bollinger(self, window: int = None, std_dev: float = None) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+        """볼린저 밴드 (중심선, 표준편차, 상단, 하단). 초기 구간은 min_periods=1로 계산합니다."""
+        window = window or BOLLINGER_BANDS["window"]
+        std_dev = std_dev or BOLLINGER_BANDS["std_dev"]
+
+        def compute():
+            middle = self.sma(window, 1)
+            std = self.rolling_std(window, 1)
+            return middle, std, middle + std * std_dev, middle - std * std_dev
+        return self._get(("bollinger", window, std_dev), compute)
+
+    def tail_extreme(self, column: str, bars: int, how: str) -> float:
+        """최근 bars개 봉의 최대(how="max")·최소(how="min") 값"""
+        return self._get(
+            ("tail", column, bars, how),
+            lambda: getattr(self.price_data[column].tail(bars), how)()
+        )
+
+    def trend_inputs(self) -> Dict[str, float]:
+        """추세 점수·필터에 쓰는 최신 값 (종가, 50/150/200일선과 5/10/20일 전 값, 52주 고저)"""
+        def compute():
+            close = self.price_data["Close"]
+            ma50, ma150, ma200 = self.sma(50), self.sma(150), self.sma(200)
+            return {
+                "latest": close.iloc[-1],
+                "ma50": ma50.iloc[-1],
+                "ma150": ma150.iloc[-1],
+                "ma200": ma200.iloc[-1],
+                "ma50_prev": ma50.iloc[-6],
+                "ma150_prev": ma150.iloc[-11],
+                "ma200_prev": ma200.iloc[-21],
+                "high52": self.tail_extreme("High", 250, "max"),
+                "low52": self.tail_extreme("Low", 250, "min"),
+            }
+        return self._get(("trend_inputs",), compute)
+
+    def rs_returns(self) -> Tuple[float, float]:
+        """13주(65봉)·26주(130봉) 수익률(%), 이력이 짧으면 첫 거래일 종가 기준"""
+        def compute():
+            close = self.price_data["Close"]
+            current = close.iloc[-1]
+            price_13w_ago = close.iloc[-65] if len(close) >= 65 else close.iloc[0]
+            price_26w_ago = close.iloc[-130] if len(close) >= 130 else close.iloc[0]
+            return ((current / price_13w_ago) - 1) * 100, ((current / price_26w_ago) - 1) * 100
+        return self._get(("rs_returns",), compute)
+
+def price_data_key(price_data: pd.DataFrame) -> str:
+    """가격 데이터 내용(인덱스 포함)의 해시"""
+    hashed = pd.util.hash_pandas_object(price_data, index=True).to_numpy()
+    digest = hashlib.blake2b(hashed.tobytes(), digest_size=16)
+    digest.update(",".join(map(str, price_data.columns)).encode())
+    return digest.hexdigest()
+
+_cache: "OrderedDict[str, IndicatorFrame]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_indicators(price_data: pd.DataFrame) -> IndicatorFrame:
+    """가격 데이터 해시에 해당하는 공유 IndicatorFrame을 반환합니다 (LRU 캐시)."""
+    key = price_data_key(price_data)
+    with _cache_lock:
+        frame = _cache.get(key)
+        if frame is not None:
+            _cache.move_to_end(key)
+            return frame
+        frame = IndicatorFrame(price_data, key)
+        _cache[key] = frame
+        while len(_cache) > INDICATOR_CACHE["max_entries"]:
+            _cache.popitem(last=False)
+        return frame
+
+def clear_indicator_cache() -> None:
+    """지표 캐시를 비웁니다."""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,208 @@
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Tuple
+from config import BOLLINGER_BANDS
+from price_panel import PricePanel
+
+class PanelIndicators:
+    """(날짜 × 종목) 가격 패널 전체에 대한 지표를 2차원 연산으로 한 번에 계산합니다.
+
+    이동평균·표준편차·52주 고저는 종목 열 전체에 대해 pandas rolling을 한 번씩만
+    호출하고, 종목별 최신 값은 각 종목의 마지막 거래일 행을 인덱싱해 읽습니다.
+    행은 유니버스 합집합 거래일이므로, 달력이 다른 종목이 섞여 중간에 결측 행이 생긴
+    종목은 추세·RS 표를 종목 자신의 봉 위치 기준 패널(by_bar)에서 계산해
+    종목별 계산과 같은 창 구간을 씁니다.
+    """
+
+    TREND_COLUMNS = ["latest", "ma50", "ma150", "ma200", "ma50_prev", "ma150_prev", "ma200_prev", "high52", "low52"]
+
+    def __init__(self, panel: PricePanel):
+        self.panel = panel
+        self.dates = panel.dates
+        self.tickers = panel.tickers
+        self.ticker_index = panel.ticker_index
+        self._memo: Dict[Hashable, object] = {}
+        self._lock = threading.RLock()
+
+        close = panel.arrays["Close"]
+        valid = ~np.isnan(close)
+        n = len(self.dates)
+        self.first_row = valid.argmax(axis=0)
+        self.last_row = n - 1 - valid[::-1].argmax(axis=0)
+        self.bars = valid.sum(axis=0)
+
+    @classmethod
+    def from_frames(cls, price_frames: Dict[str, pd.DataFrame]) -> "PanelIndicators":
+        """종목별 가격 DataFrame으로 메모리 상의 패널을 만들어 지표를 계산합니다."""
+        return cls(PricePanel.from_frames(price_frames))
+
+    def by_bar(self) -> "PanelIndicators":
+        """행이 거래일 대신 종목별 봉 위치인 패널 (각 종목의 봉을 위로 당겨 채움)
+
+        rolling 창과 수익률 기간이 합집합 거래일이 아닌 종목 자신의 봉 수로 계산됩니다.
+        모든 종목이 패널 안에서 결측 없이 연속이면 같은 결과이므로 자기 자신을 반환합니다.
+        """
+        def compute():
+            if (self.bars == self.last_row - self.first_row + 1).all():
+                return self
+            valid = ~np.isnan(self.panel.arrays["Close"])
+            n_bars = int(self.bars.max())
+            # 열마다 유효 행 번호를 앞으로 모음 (stable 정렬이라 날짜 순서 유지)
+            order = np.argsort(~valid, axis=0, kind="stable")[:n_bars]
+            filled = np.arange(n_bars)[:, None] < self.bars[None, :]
+            arrays = {
+                field: np.asfortranarray(np.where(filled, np.take_along_axis(arr, order, axis=0), np.nan))
+                for field, arr in self.panel.arrays.items()
+            }
+            return PanelIndicators(PricePanel(None, pd.RangeIndex(n_bars), self.tickers, arrays))
+        return self._get(("by_bar",), compute)
+
+    def _get(self, key: Hashable, compute):
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+            return self._memo[key]
+
+    def _frame(self, field: str) -> pd.DataFrame:
+        return self._get(("frame", field), lambda: pd.DataFrame(self.panel.arrays[field], copy=False))
+
+    def _rolling(self, field: str, window: int, min_periods: int, how: str) -> np.ndarray:
+        return self._get(
+            (how, field, window, min_periods),
+            lambda: getattr(self._frame(field).rolling(window, min_periods=min_periods), how)().to_numpy()
+        )
+
+    # ───────── (날짜 × 종목) 지표 행렬 ─────────
+
+    def sma(self, window: int, min_periods: int = None, field: str = "Close") -> np.ndarray:
+        """이동평균 행렬 (min_periods=None이면 window)"""
+        return self._rolling(field, window, min_periods, "mean")
+
+    def rolling_std(self, window: int, min_periods: int = None, field: str = "Close") -> np.ndarray:
+        """이동 표준편차 행렬"""
+        return self._rolling(field, window, min_periods, "std")
+
+    def bollinger(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """볼린저 밴드 (중심선, 상단, 하단), PatternDetector와 같이 min_periods=1"""
+        def compute():
+            window, std_dev = BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"]
+            middle = self.sma(window, 1)
+            std = self.rolling_std(window, 1)
+            return middle, middle + std * std_dev, middle - std * std_dev
+        return self._get(("bollinger",), compute)
+
+    def band_width(self) -> np.ndarray:
+        """볼린저 밴드 폭 ((상단 - 하단) / 중심선)"""
+        def compute():
+            middle, upper, lower = self.bollinger()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return (upper - lower) / middle
+        return self._get(("band_width",), compute)
+
+    def high52(self) -> np.ndarray:
+        """최근 250 거래일 최고가 행렬"""
+        return self._rolling("High", 250, 1, "max")
+
+    def low52(self) -> np.ndarray:
+        """최근 250 거래일 최저가 행렬"""
+        return self._rolling("Low", 250, 1, "min")
+
+    def returns(self, lag: int) -> np.ndarray:
+        """lag 거래일 전 종가 대비 수익률(%) 행렬
+
+        상장 후 lag일이 지나지 않은 구간은 첫 거래일 종가를 기준으로 합니다
+        (ScoringEngine.calculate_rs_score와 동일).
+        """
+        def compute():
+            close = self.panel.arrays["Close"]
+            n, m = close.shape
+            base = np.full((n, m), np.nan)
+            if lag < n:
+                base[lag:] = close[:n - lag]
+            cols = np.arange(m)
+            before = np.arange(n)[:, None] - lag < self.first_row[None, :]
+            base = np.where(before, close[self.first_row, cols][None, :], base)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return (close / base - 1) * 100
+        return self._get(("returns", lag), compute)
+
+    # ───────── 종목별 최신 값 ─────────
+
+    def _at(self, matrix: np.ndarray, lag: int = 0) -> np.ndarray:
+        """각 종목의 마지막 거래일에서 lag행 전의 값 (범위를 벗어나면 NaN)"""
+        rows = self.last_row - lag
+        values = matrix[np.maximum(rows, 0), np.arange(len(self.tickers))]
+        return np.where(rows >= 0, values, np.nan)
+
+    def trend_table(self) -> pd.DataFrame:
+        """종목별 추세 입력값 표 (IndicatorFrame.trend_inputs()와 같은 열, bars 열 포함)"""
+        bar_panel = self.by_bar()
+        if bar_panel is not self:
+            return bar_panel.trend_table()
+
+        def compute():
+            ma50, ma150, ma200 = self.sma(50), self.sma(150), self.sma(200)
+            table = pd.DataFrame({
+                "latest": self._at(self.panel.arrays["Close"]),
+                "ma50": self._at(ma50),
+                "ma150": self._at(ma150),
+                "ma200": self._at(ma200),
+                "ma50_prev": self._at(ma50, 5),
+                "ma150_prev": self._at(ma150, 10),
+                "ma200_prev": self._at(ma200, 20),
+                "high52": self._at(self.high52()),
+                "low52": self._at(self.low52()),
+                "bars": self.bars,
+            }, index=pd.Index(self.tickers, name="code"))
+            return table
+        return self._get(("trend_table",), compute)
+
+    def rs_table(self) -> pd.DataFrame:
+        """종목별 13주·26주 수익률(%) 표"""
+        bar_panel = self.by_bar()
+        if bar_panel is not self:
+            return bar_panel.rs_table()
+
+        def compute():
+            return pd.DataFrame({
+                "returns_13w": self._at(self.returns(64)),
+                "returns_26w": self._at(self.returns(129)),
+            }, index=pd.Index(self.tickers, name="code"))
+        return self._get(("rs_table",), compute)
+
+    def weighted_returns(self, horizons: Dict[int, float]) -> np.ndarray:
+        """종목별 마지막 거래일 기준 {기간(종목 자신의 봉 수): 가중치} 수익률(%)의 가중합"""
+        bar_panel = self.by_bar()
+        if bar_panel is not self:
+            return bar_panel.weighted_returns(horizons)
+        return sum(self._at(self.returns(lag)) * weight for lag, weight in horizons.items())
+
+    def trend_inputs(self, code: str) -> Dict[str, float]:
+        """한 종목의 추세 입력값. 이력이 21일 미만이면 종목별 계산처럼 IndexError를 발생시킵니다."""
+        row = self.trend_table().loc[code]
+        if row["bars"] < 21:
+            raise IndexError(f"추세 계산에 필요한 이력이 부족합니다: {code}, {int(row['bars'])}일")
+        return {key: row[key] for key in self.TREND_COLUMNS}
+
+    def rs_returns(self, code: str) -> Tuple[float, float]:
+        """한 종목의 13주·26주 수익률(%)"""
+        row = self.rs_table().loc[code]
+        return row["returns_13w"], row["returns_26w"]
+
+    def ticker(self, code: str) -> "PanelTicker":
+        """ScoringEngine에 넘길 종목별 보기"""
+        return PanelTicker(self, code)
+
+class PanelTicker:
+    """PanelIndicators의 한 종목 보기 (IndicatorFrame과 같은 최신 값 인터페이스)"""
+
+    def __init__(self, panel: PanelIndicators, code: str):
+        self.panel = panel
+        self.code = code
+
+    def trend_inputs(self) -> Dict[str, float]:
+        return self.panel.trend_inputs(self.code)
+
+    def rs_returns(self) -> Tuple[float, float]:
+        return self.panel.rs_returns(self.code)
@@ -1,167 +1,271 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
-from config import VCP_WINDOW, POCKET_PIVOT_VOL, BOLLINGER_BANDS
-from utils import calculate_rolling_mean, calculate_rolling_std, detect_volume_spike, logger
+from typing import Dict, List, Optional, Tuple
+from config import VCP_WINDOW, POCKET_PIVOT_VOL, BOLLINGER_BANDS, PATTERN_BACKEND
+from indicators import IndicatorFrame, get_indicators
+import pattern_kernels
+from utils import logger
+
+def _trailing_mean(values: np.ndarray, idx: np.ndarray, lookback: int) -> np.ndarray:
+    """각 i에 대해 values[i-lookback:i]의 평균(NaN 제외)을 한 번에 계산합니다.
+    
+    i < lookback이면 파이썬 음수 슬라이스와 같은 구간을 사용하며,
+    구간이 비어 있으면 NaN을 반환합니다 (pandas .iloc[i-lookback:i].mean()과 동일).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    valid = ~np.isnan(values)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    
+    start = idx - lookback
+    start = np.where(start < 0, np.maximum(start + n, 0), start)
+    start = np.minimum(start, idx)  # 시작이 끝보다 뒤면 빈 구간
+    count = ccount[idx] - ccount[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, (csum[idx] - csum[start]) / count, np.nan)
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """분모가 0보다 클 때만 나누고, 아니면(0·음수·NaN) 1.0을 반환합니다."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    positive = denominator > 0
+    return np.divide(numerator, denominator, out=np.ones_like(numerator), where=positive)
+
+def _clip_strength(strength: np.ndarray) -> np.ndarray:
+    """패턴 강도를 0.1-1.0 범위로 자릅니다 (max(0.1, min(1.0, x))와 같이 NaN은 1.0)."""
+    return np.where(np.isnan(strength), 1.0, np.clip(strength, 0.1, 1.0))
+
+def _vcp_arrays(close: np.ndarray, volume: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """VCP 스캔 (NumPy 경로). 감지된 행 번호와 강도를 반환합니다."""
+    n = len(close)
+    # j: 구간의 마지막 날 (i-1), 첫날은 j-window+1, 전날은 j-1
+    last = np.arange(window - 1, n - 1)
+    first, prev = last - window + 1, last - 1
+    
+    # 가격 하락 후 반등, 거래량 감소 후 증가
+    price_decline = close[first] > close[last]
+    price_rebound = close[last] > close[prev]
+    volume_decline = volume[first] > volume[prev]
+    volume_increase = volume[last] > volume[prev]
+    idx = last[price_decline & price_rebound & volume_decline & volume_increase]
+    
+    # 패턴 강도 계산 (거래량 증가 비율과 가격 반등 비율의 조합, 0.1-1 범위)
+    volume_increase_ratio = _safe_ratio(volume[idx], volume[idx - 1])
+    price_rebound_ratio = _safe_ratio(close[idx], close[idx - 1])
+    return idx, _clip_strength(volume_increase_ratio * 0.5 + price_rebound_ratio * 0.5 - 1.0)
+
+def _pocket_pivot_arrays(close: np.ndarray, volume: np.ndarray, volume_ma20: np.ndarray,
+                         ma50: np.ndarray, volume_multiplier: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Pocket Pivot 스캔 (NumPy 경로)"""
+    # 전일 대비 상승, 거래량 급증, 50일 이동평균선 위 (모두 i >= 1 구간)
+    price_increase = close[1:] > close[:-1]
+    volume_spike = volume[1:] > volume_ma20[1:] * volume_multiplier
+    above_ma = close[1:] > ma50[1:]
+    idx = np.flatnonzero(price_increase & volume_spike & above_ma) + 1
+    
+    # 패턴 강도 계산 (직전 20일 평균 대비 거래량 비율과 가격 상승 비율의 조합)
+    volume_ratio = _safe_ratio(volume[idx], _trailing_mean(volume, idx, 20))
+    price_increase_ratio = _safe_ratio(close[idx], close[idx - 1])
+    return idx, _clip_strength((volume_ratio * 0.6 + price_increase_ratio * 0.4 - 1.0) / 3.0)
+
+def _breakout_arrays(close: np.ndarray, volume: np.ndarray, upper: np.ndarray,
+                     lower: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """볼린저 밴드 돌파 스캔 (NumPy 경로). 행 번호, 강도, 상단 돌파 여부를 반환합니다."""
+    # 상단 돌파: 오늘 상단 위 & 어제 상단 이하, 하단 돌파: 오늘 하단 아래 & 어제 하단 이상
+    upper_breakout = (close[1:] > upper[1:]) & (close[:-1] <= upper[:-1])
+    lower_breakout = (close[1:] < lower[1:]) & (close[:-1] >= lower[:-1])
+    idx = np.flatnonzero(upper_breakout | lower_breakout) + 1
+    is_upper = upper_breakout[idx - 1]
+    
+    # 돌파 정도 (상단 돌파는 상단밴드, 하단 돌파는 하단밴드와의 차이 기준)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        breakout_degree = np.where(
+            is_upper,
+            (close[idx] - upper[idx]) / upper[idx],
+            (lower[idx] - close[idx]) / lower[idx]
+        )
+    volume_ratio = _safe_ratio(volume[idx], _trailing_mean(volume, idx, 10))
+    
+    # 강도는 0.1-1 범위로 정규화
+    return idx, _clip_strength(breakout_degree * 5.0 + volume_ratio * 0.2), is_upper
+
+# 최근 구간 스캔 시 평가 구간 앞에 붙이는 워밍업 봉 수
+# (50일선, 볼린저 밴드, VCP 창, 직전 20일 거래량 평균 중 가장 긴 구간 + 전일 비교 1봉)
+PATTERN_WARMUP = max(50, BOLLINGER_BANDS["window"], VCP_WINDOW, 20) + 1
+
+def recent_as_of(dates: pd.DatetimeIndex, now: pd.Timestamp) -> pd.Timestamp:
+    """최근 구간의 기준 시각: now와 종목 마지막 봉 중 이른 쪽
+
+    기준을 종목 자신의 마지막 봉에 맞추므로 새 봉이 없으면 다음 날 실행해도 같은 패턴이 남고,
+    점수는 가격 데이터만으로 정해집니다 (같은 날 장 마감 후 now와는 결과가 같음).
+    """
+    return min(now, dates[-1]) if len(dates) else now
+
+def recent_scan_start(dates: pd.DatetimeIndex, days: int, now: pd.Timestamp) -> Optional[int]:
+    """최근 days일 패턴 스캔에 필요한 시작 행 (워밍업 포함). 최근 구간에 봉이 없으면 None"""
+    # (now - date).days <= days 인 첫 행
+    first = dates.searchsorted(now - pd.Timedelta(days=days + 1), side="right")
+    if first >= len(dates):
+        return None
+    return max(0, first - PATTERN_WARMUP)
 
 class PatternDetector:
-    def __init__(self, price_data: pd.DataFrame):
+    def __init__(self, price_data: pd.DataFrame, indicators: IndicatorFrame = None, use_numba: bool = None):
         self.price_data = price_data
+        self.indicators = indicators
+        # numba가 설치되어 있고 설정에서 끄지 않았으면 JIT 커널로 스캔
+        if use_numba is None:
+            use_numba = PATTERN_BACKEND["use_numba"]
+        self.use_numba = use_numba and pattern_kernels.NUMBA_AVAILABLE
         self._calculate_indicators()
         
     def _calculate_indicators(self):
-        """기술적 지표를 계산합니다."""
+        """기술적 지표를 준비합니다 (종목별 공유 지표 캐시 사용, 실제 계산은 처음 읽을 때)."""
         try:
-            # 볼린저 밴드
-            self.bb_middle = calculate_rolling_mean(
-                self.price_data["Close"], 
-                BOLLINGER_BANDS["window"]
-            )
-            self.bb_std = calculate_rolling_std(
-                self.price_data["Close"], 
-                BOLLINGER_BANDS["window"]
-            )
-            self.bb_upper = self.bb_middle + (self.bb_std * BOLLINGER_BANDS["std_dev"])
-            self.bb_lower = self.bb_middle - (self.bb_std * BOLLINGER_BANDS["std_dev"])
-            
-            # 이동평균선
-            self.ma20 = calculate_rolling_mean(self.price_data["Close"], 20)
-            self.ma50 = calculate_rolling_mean(self.price_data["Close"], 50)
-            self.ma200 = calculate_rolling_mean(self.price_data["Close"], 200)
-            
+            if self.indicators is None:
+                self.indicators = get_indicators(self.price_data)
         except Exception as e:
             logger.error(f"기술적 지표 계산 실패: {str(e)}")
             
+    # 볼린저 밴드
+    @property
+    def bb_middle(self) -> pd.Series:
+        return self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[0]
+        
+    @property
+    def bb_std(self) -> pd.Series:
+        return self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[1]
+        
+    @property
+    def bb_upper(self) -> pd.Series:
+        return self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[2]
+        
+    @property
+    def bb_lower(self) -> pd.Series:
+        return self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[3]
+        
+    # 이동평균선
+    @property
+    def ma20(self) -> pd.Series:
+        return self.indicators.sma(20, min_periods=1)
+        
+    @property
+    def ma50(self) -> pd.Series:
+        return self.indicators.sma(50, min_periods=1)
+        
+    @property
+    def ma200(self) -> pd.Series:
+        return self.indicators.sma(200, min_periods=1)
+            
     def detect_vcp(self) -> List[Dict]:
-        """Volume Cup with Handle 패턴을 감지합니다."""
+        """Volume Cup with Handle 패턴을 감지합니다.
+        
+        각 시점 i의 최근 window 구간 [i-window, i)을 DataFrame으로 자르지 않고,
+        구간의 첫날·전전날·마지막 날 값을 시프트한 배열로 한 번에 비교합니다.
+        """
         try:
-            vcp_patterns = []
             window = VCP_WINDOW
+            close = self.price_data["Close"].to_numpy(dtype=np.float64)
+            volume = self.price_data["Volume"].to_numpy()
+            if len(close) <= window:
+                return []
+            
+            scan = pattern_kernels.vcp_scan if self.use_numba else _vcp_arrays
+            idx, strength = scan(close, volume.astype(np.float64), window)
             
-            for i in range(window, len(self.price_data)):
-                # 최근 window 기간의 데이터
-                recent_data = self.price_data.iloc[i-window:i]
-                
-                # 가격 하락 후 반등 확인
-                price_decline = recent_data["Close"].iloc[0] > recent_data["Close"].iloc[-1]
-                price_rebound = recent_data["Close"].iloc[-1] > recent_data["Close"].iloc[-2]
-                
-                # 거래량 감소 후 증가 확인
-                volume_decline = recent_data["Volume"].iloc[0] > recent_data["Volume"].iloc[-2]
-                volume_increase = recent_data["Volume"].iloc[-1] > recent_data["Volume"].iloc[-2]
-                
-                if price_decline and price_rebound and volume_decline and volume_increase:
-                    # 패턴 강도 계산 (거래량 증가 비율과 가격 반등 비율의 조합)
-                    volume_increase_ratio = recent_data["Volume"].iloc[-1] / recent_data["Volume"].iloc[-2] if recent_data["Volume"].iloc[-2] > 0 else 1.0
-                    price_rebound_ratio = recent_data["Close"].iloc[-1] / recent_data["Close"].iloc[-2] if recent_data["Close"].iloc[-2] > 0 else 1.0
-                    
-                    # 강도는 0-1 범위로 정규화
-                    strength = min(1.0, (volume_increase_ratio * 0.5 + price_rebound_ratio * 0.5 - 1.0))
-                    strength = max(0.1, strength)  # 최소값 0.1 보장
-                    
-                    vcp_patterns.append({
-                        "date": recent_data.index[-1],
-                        "price": recent_data["Close"].iloc[-1],
-                        "volume": recent_data["Volume"].iloc[-1],
-                        "strength": strength
-                    })
-                    
-            return vcp_patterns
+            dates = self.price_data.index
+            prices = self.price_data["Close"].to_numpy()
+            return [
+                {"date": date, "price": price, "volume": vol, "strength": st}
+                for date, price, vol, st in zip(dates[idx], prices[idx], volume[idx], strength.tolist())
+            ]
         except Exception as e:
             logger.error(f"VCP 패턴 감지 실패: {str(e)}")
             return []
             
     def detect_pocket_pivot(self) -> List[Dict]:
-        """Pocket Pivot 패턴을 감지합니다."""
+        """Pocket Pivot 패턴을 감지합니다.
+        
+        모든 조건과 강도를 전체 구간에 대한 배열 연산으로 한 번에 계산합니다.
+        """
         try:
-            pivot_patterns = []
+            close = self.price_data["Close"].to_numpy(dtype=np.float64)
+            volume = self.price_data["Volume"].to_numpy()
+            if len(close) < 2:
+                return []
+            
+            volume_ma20 = self.indicators.sma(20, min_periods=1, column="Volume").to_numpy(dtype=np.float64)
+            scan = pattern_kernels.pocket_pivot_scan if self.use_numba else _pocket_pivot_arrays
+            idx, strength = scan(
+                close, volume.astype(np.float64), volume_ma20,
+                self.ma50.to_numpy(dtype=np.float64), float(POCKET_PIVOT_VOL)
+            )
             
-            for i in range(1, len(self.price_data)):
-                # 전일 대비 상승 확인
-                price_increase = self.price_data["Close"].iloc[i] > self.price_data["Close"].iloc[i-1]
-                
-                # 거래량 급증 확인
-                volume_spike = detect_volume_spike(
-                    self.price_data["Volume"], 
-                    POCKET_PIVOT_VOL
-                ).iloc[i]
-                
-                # 이동평균선 위에서 거래 확인
-                above_ma = self.price_data["Close"].iloc[i] > self.ma50.iloc[i]
-                
-                if price_increase and volume_spike and above_ma:
-                    # 패턴 강도 계산 (거래량 증가 비율과 가격 상승 비율의 조합)
-                    volume_ratio = self.price_data["Volume"].iloc[i] / self.price_data["Volume"].iloc[i-20:i].mean() if self.price_data["Volume"].iloc[i-20:i].mean() > 0 else 1.0
-                    price_increase_ratio = self.price_data["Close"].iloc[i] / self.price_data["Close"].iloc[i-1] if self.price_data["Close"].iloc[i-1] > 0 else 1.0
-                    
-                    # 강도는 0-1 범위로 정규화
-                    strength = min(1.0, (volume_ratio * 0.6 + price_increase_ratio * 0.4 - 1.0) / 3.0)
-                    strength = max(0.1, strength)  # 최소값 0.1 보장
-                    
-                    pivot_patterns.append({
-                        "date": self.price_data.index[i],
-                        "price": self.price_data["Close"].iloc[i],
-                        "volume": self.price_data["Volume"].iloc[i],
-                        "strength": strength
-                    })
-                    
-            return pivot_patterns
+            dates = self.price_data.index
+            prices = self.price_data["Close"].to_numpy()
+            return [
+                {"date": date, "price": price, "volume": vol, "strength": st}
+                for date, price, vol, st in zip(dates[idx], prices[idx], volume[idx], strength.tolist())
+            ]
         except Exception as e:
             logger.error(f"Pocket Pivot 패턴 감지 실패: {str(e)}")
             return []
             
     def detect_breakout(self) -> List[Dict]:
-        """볼린저 밴드 돌파를 감지합니다."""
+        """볼린저 밴드 돌파를 감지합니다.
+        
+        상·하단 돌파 여부, 돌파 정도, 직전 10일 평균 대비 거래량 비율을
+        전체 구간 배열로 한 번에 계산합니다.
+        """
         try:
-            breakouts = []
+            close = self.price_data["Close"].to_numpy(dtype=np.float64)
+            volume = self.price_data["Volume"].to_numpy()
+            if len(close) < 2:
+                return []
+            
+            scan = pattern_kernels.breakout_scan if self.use_numba else _breakout_arrays
+            idx, strength, is_upper = scan(
+                close, volume.astype(np.float64),
+                self.bb_upper.to_numpy(dtype=np.float64), self.bb_lower.to_numpy(dtype=np.float64)
+            )
             
-            for i in range(1, len(self.price_data)):
-                # 상단 돌파 확인
-                upper_breakout = (
-                    self.price_data["Close"].iloc[i] > self.bb_upper.iloc[i] and
-                    self.price_data["Close"].iloc[i-1] <= self.bb_upper.iloc[i-1]
-                )
-                
-                # 하단 돌파 확인
-                lower_breakout = (
-                    self.price_data["Close"].iloc[i] < self.bb_lower.iloc[i] and
-                    self.price_data["Close"].iloc[i-1] >= self.bb_lower.iloc[i-1]
-                )
-                
-                if upper_breakout or lower_breakout:
-                    # 패턴 강도 계산 (돌파 정도와 거래량 증가의 조합)
-                    if upper_breakout:
-                        # 상단 돌파는 상단밴드와의 차이 기준
-                        breakout_degree = (self.price_data["Close"].iloc[i] - self.bb_upper.iloc[i]) / self.bb_upper.iloc[i]
-                        is_upper = True
-                    else:
-                        # 하단 돌파는 하단밴드와의 차이 기준
-                        breakout_degree = (self.bb_lower.iloc[i] - self.price_data["Close"].iloc[i]) / self.bb_lower.iloc[i]
-                        is_upper = False
-                    
-                    # 거래량 비율 계산
-                    volume_ratio = self.price_data["Volume"].iloc[i] / self.price_data["Volume"].iloc[i-10:i].mean() if self.price_data["Volume"].iloc[i-10:i].mean() > 0 else 1.0
-                    
-                    # 강도는 0-1 범위로 정규화
-                    strength = min(1.0, (breakout_degree * 5.0 + volume_ratio * 0.2))
-                    strength = max(0.1, strength)  # 최소값 0.1 보장
-                    
-                    breakouts.append({
-                        "date": self.price_data.index[i],
-                        "price": self.price_data["Close"].iloc[i],
-                        "type": "upper" if is_upper else "lower",
-                        "strength": strength
-                    })
-                    
-            return breakouts
+            dates = self.price_data.index
+            prices = self.price_data["Close"].to_numpy()
+            return [
+                {"date": date, "price": price, "type": "upper" if up else "lower", "strength": st}
+                for date, price, up, st in zip(dates[idx], prices[idx], is_upper.tolist(), strength.tolist())
+            ]
         except Exception as e:
             logger.error(f"돌파 패턴 감지 실패: {str(e)}")
             return []
             
     def get_all_patterns(self) -> Dict[str, List[Dict]]:
-        """모든 패턴을 감지합니다."""
+        """모든 패턴을 감지합니다 (전체 이력, 차트·백테스트용)."""
         return {
             "vcp": self.detect_vcp(),
             "pocket_pivot": self.detect_pocket_pivot(),
             "breakout": self.detect_breakout()
+        }
+        
+    def get_recent_patterns(self, days: int = 30, now: pd.Timestamp = None) -> Dict[str, List[Dict]]:
+        """최근 days일 안에 발생한 패턴만 감지합니다.
+        
+        전체 이력 대신 최근 구간과 그 앞 PATTERN_WARMUP개 봉만 잘라 스캔하므로,
+        지표 워밍업이 끝난 구간의 결과는 get_all_patterns()를 기간으로 거른 것과 같습니다.
+        """
+        now = recent_as_of(self.price_data.index, pd.Timestamp.now() if now is None else now)
+        start = recent_scan_start(self.price_data.index, days, now)
+        if start is None:
+            return {"vcp": [], "pocket_pivot": [], "breakout": []}
+        
+        if start == 0:
+            detector = self
+        else:
+            # 잘라낸 구간은 일회성이므로 공유 캐시(해시 계산) 없이 지표를 계산
+            tail = self.price_data.iloc[start:]
+            detector = PatternDetector(tail, IndicatorFrame(tail), use_numba=self.use_numba)
+        return {
+            pattern_type: [p for p in patterns if (now - p["date"]).days <= days]
+            for pattern_type, patterns in detector.get_all_patterns().items()
         } 
\ No newline at end of file
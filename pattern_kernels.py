@@ -0,0 +1,104 @@
+"""패턴 스캔용 Numba JIT 커널
+
+numba가 설치되어 있으면 VCP·Pocket Pivot·볼린저 돌파 스캔을 NumPy 배열에 대한
+단일 반복문으로 컴파일합니다. 설치되어 있지 않으면 NUMBA_AVAILABLE이 False가 되고
+PatternDetector는 NumPy 벡터 연산 경로를 사용합니다.
+
+각 커널은 패턴이 감지된 행 번호와 강도 배열을 반환하며, 결과는 NumPy 경로와 같습니다.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # numba가 없을 때도 모듈을 가져올 수 있도록 데코레이터를 그대로 통과시킵니다.
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def _safe_ratio(numerator, denominator):
+    return numerator / denominator if denominator > 0 else 1.0
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def _clip_strength(strength):
+    if np.isnan(strength):
+        return 1.0
+    return min(1.0, max(0.1, strength))
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def _trailing_mean(values, i, lookback):
+    # values[i-lookback:i]의 NaN 제외 평균 (파이썬 음수 슬라이스 규칙 포함)
+    n = len(values)
+    start = i - lookback
+    if start < 0:
+        start = max(start + n, 0)
+    total = 0.0
+    count = 0
+    for k in range(start, i):
+        if not np.isnan(values[k]):
+            total += values[k]
+            count += 1
+    return total / count if count > 0 else np.nan
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def vcp_scan(close, volume, window):
+    """VCP: 구간 [i-window, i)의 마지막 날 j=i-1 기준 가격 하락 후 반등, 거래량 감소 후 증가"""
+    n = len(close)
+    idx = np.empty(max(n - window, 0), dtype=np.int64)
+    strength = np.empty(max(n - window, 0), dtype=np.float64)
+    found = 0
+    for j in range(window - 1, n - 1):
+        first = j - window + 1
+        if (close[first] > close[j] and close[j] > close[j - 1] and
+                volume[first] > volume[j - 1] and volume[j] > volume[j - 1]):
+            volume_increase_ratio = _safe_ratio(volume[j], volume[j - 1])
+            price_rebound_ratio = _safe_ratio(close[j], close[j - 1])
+            idx[found] = j
+            strength[found] = _clip_strength(volume_increase_ratio * 0.5 + price_rebound_ratio * 0.5 - 1.0)
+            found += 1
+    return idx[:found], strength[:found]
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def pocket_pivot_scan(close, volume, volume_ma20, ma50, volume_multiplier):
+    """Pocket Pivot: 전일 대비 상승, 20일 평균 대비 거래량 급증, 50일선 위"""
+    n = len(close)
+    idx = np.empty(max(n - 1, 0), dtype=np.int64)
+    strength = np.empty(max(n - 1, 0), dtype=np.float64)
+    found = 0
+    for i in range(1, n):
+        if close[i] > close[i - 1] and volume[i] > volume_ma20[i] * volume_multiplier and close[i] > ma50[i]:
+            volume_ratio = _safe_ratio(volume[i], _trailing_mean(volume, i, 20))
+            price_increase_ratio = _safe_ratio(close[i], close[i - 1])
+            idx[found] = i
+            strength[found] = _clip_strength((volume_ratio * 0.6 + price_increase_ratio * 0.4 - 1.0) / 3.0)
+            found += 1
+    return idx[:found], strength[:found]
+
+@njit(cache=True, nogil=True, error_model="numpy")
+def breakout_scan(close, volume, upper, lower):
+    """볼린저 밴드 상·하단 돌파 (is_upper가 False면 하단 돌파)"""
+    n = len(close)
+    idx = np.empty(max(n - 1, 0), dtype=np.int64)
+    strength = np.empty(max(n - 1, 0), dtype=np.float64)
+    is_upper = np.empty(max(n - 1, 0), dtype=np.bool_)
+    found = 0
+    for i in range(1, n):
+        up = close[i] > upper[i] and close[i - 1] <= upper[i - 1]
+        down = close[i] < lower[i] and close[i - 1] >= lower[i - 1]
+        if not (up or down):
+            continue
+        if up:
+            breakout_degree = (close[i] - upper[i]) / upper[i]
+        else:
+            breakout_degree = (lower[i] - close[i]) / lower[i]
+        volume_ratio = _safe_ratio(volume[i], _trailing_mean(volume, i, 10))
+        idx[found] = i
+        is_upper[found] = up
+        strength[found] = _clip_strength(breakout_degree * 5.0 + volume_ratio * 0.2)
+        found += 1
+    return idx[:found], strength[:found], is_upper[:found]
@@ -0,0 +1,269 @@
+"""선언형 패턴 레지스트리
+
+각 패턴은 한 종목의 OHLCV·지표 배열 묶음(PatternBlock)을 받아
+(감지 행 번호, 강도[, 세부 유형]) 배열을 반환하는 벡터 함수로 등록합니다.
+
+    @register_pattern("my_setup", label="새 패턴")
+    def _my_setup(block):
+        idx = np.flatnonzero(...)
+        return idx, strength
+
+evaluate_patterns()는 등록된 모든 패턴을 여러 종목에 대해 한 번에 평가해
+(ticker, date, pattern, strength, price, variant) 이벤트 표 하나로 반환하고,
+pattern_scores()는 이벤트 표에서 종목별 패턴 점수를 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Iterable, List, Optional
+from config import VCP_WINDOW, POCKET_PIVOT_VOL, BOLLINGER_BANDS, PATTERN_BACKEND, PATTERN_WEIGHTS
+from indicators import IndicatorFrame, get_indicators
+from pattern_detector import _vcp_arrays, _pocket_pivot_arrays, _breakout_arrays, recent_scan_start, recent_as_of
+import pattern_kernels
+from utils import logger
+
+EVENT_COLUMNS = ["ticker", "date", "pattern", "strength", "price", "variant"]
+
+class PatternSpec:
+    """등록된 패턴 정보"""
+
+    def __init__(self, pattern_id: str, fn: Callable, weight: float, label: str):
+        self.pattern_id = pattern_id
+        self.fn = fn
+        self.weight = weight
+        self.label = label
+
+PATTERN_REGISTRY: Dict[str, PatternSpec] = {}
+
+def register_pattern(pattern_id: str, weight: float = None, label: str = None):
+    """패턴 함수를 레지스트리에 등록하는 데코레이터 (가중치 기본값은 config.PATTERN_WEIGHTS)"""
+    def decorator(fn: Callable) -> Callable:
+        PATTERN_REGISTRY[pattern_id] = PatternSpec(
+            pattern_id, fn,
+            PATTERN_WEIGHTS.get(pattern_id, 0.0) if weight is None else weight,
+            label or pattern_id
+        )
+        return fn
+    return decorator
+
+class PatternBlock:
+    """한 종목의 OHLCV 배열과 지표 (등록 패턴 함수의 입력)
+
+    지표 배열은 처음 읽을 때 IndicatorFrame에서 가져오며,
+    from_arrays()로 만든 블록은 미리 계산된 배열(패널 지표 등)을 그대로 사용합니다.
+    """
+
+    def __init__(self, price_data: pd.DataFrame, indicators: IndicatorFrame = None, use_numba: bool = None):
+        self.dates = price_data.index
+        self.close = price_data["Close"].to_numpy(dtype=np.float64)
+        self.volume = price_data["Volume"].to_numpy(dtype=np.float64)
+        self.indicators = indicators if indicators is not None else get_indicators(price_data)
+        self._arrays: Dict[str, np.ndarray] = {}
+        if use_numba is None:
+            use_numba = PATTERN_BACKEND["use_numba"]
+        self.use_numba = use_numba and pattern_kernels.NUMBA_AVAILABLE
+
+    @classmethod
+    def from_arrays(cls, dates: pd.DatetimeIndex, close: np.ndarray, volume: np.ndarray,
+                    arrays: Dict[str, np.ndarray], use_numba: bool = None) -> "PatternBlock":
+        """미리 계산된 지표 배열(ma50, volume_ma20, bb_upper, bb_lower)로 블록을 만듭니다."""
+        block = cls.__new__(cls)
+        block.dates = dates
+        block.close = np.ascontiguousarray(close, dtype=np.float64)
+        block.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        block.indicators = None
+        block._arrays = {name: np.ascontiguousarray(a, dtype=np.float64) for name, a in arrays.items()}
+        if use_numba is None:
+            use_numba = PATTERN_BACKEND["use_numba"]
+        block.use_numba = use_numba and pattern_kernels.NUMBA_AVAILABLE
+        return block
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def _indicator(self, name: str, compute: Callable[[], pd.Series]) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = compute().to_numpy(dtype=np.float64)
+        return self._arrays[name]
+
+    @property
+    def ma50(self) -> np.ndarray:
+        return self._indicator("ma50", lambda: self.indicators.sma(50, min_periods=1))
+
+    @property
+    def volume_ma20(self) -> np.ndarray:
+        return self._indicator("volume_ma20", lambda: self.indicators.sma(20, min_periods=1, column="Volume"))
+
+    @property
+    def bb_upper(self) -> np.ndarray:
+        return self._indicator("bb_upper", lambda: self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[2])
+
+    @property
+    def bb_lower(self) -> np.ndarray:
+        return self._indicator("bb_lower", lambda: self.indicators.bollinger(BOLLINGER_BANDS["window"], BOLLINGER_BANDS["std_dev"])[3])
+
+def _panel_block(panel, code: str, n_rows: int, days: Optional[int], now: Optional[pd.Timestamp],
+                 use_numba: bool) -> Optional[PatternBlock]:
+    """패널 지표에서 한 종목의 스캔 구간 블록을 만듭니다.
+
+    패널 안에서 거래일이 연속이고, 스캔 구간 앞 워밍업이 패널 안에 있거나
+    패널이 종목 이력 전체(n_rows)를 담고 있을 때만 사용하며, 아니면 None을 반환합니다.
+    """
+    j = panel.ticker_index.get(code)
+    if j is None:
+        return None
+    first, last = int(panel.first_row[j]), int(panel.last_row[j])
+    if panel.bars[j] != last - first + 1:
+        return None
+    start = 0
+    if days is not None:
+        start = recent_scan_start(panel.dates[first:last + 1], days, now)
+        if start is None:
+            return None
+    if start == 0 and panel.bars[j] != n_rows:
+        return None
+
+    rows = slice(first + start, last + 1)
+    _, upper, lower = panel.bollinger()
+    arrays = panel.panel.arrays
+    return PatternBlock.from_arrays(
+        panel.dates[rows], arrays["Close"][rows, j], arrays["Volume"][rows, j],
+        {
+            "ma50": panel.sma(50, 1)[rows, j],
+            "volume_ma20": panel.sma(20, 1, field="Volume")[rows, j],
+            "bb_upper": upper[rows, j],
+            "bb_lower": lower[rows, j],
+        },
+        use_numba
+    )
+
+# ───────── 기본 패턴 ─────────
+
+@register_pattern("vcp", label="볼륨 수축 패턴 (VCP)")
+def _vcp(block: PatternBlock):
+    if len(block) <= VCP_WINDOW:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    scan = pattern_kernels.vcp_scan if block.use_numba else _vcp_arrays
+    return scan(block.close, block.volume, VCP_WINDOW)
+
+@register_pattern("pocket_pivot", label="포켓 피봇 (Pocket Pivot)")
+def _pocket_pivot(block: PatternBlock):
+    if len(block) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    scan = pattern_kernels.pocket_pivot_scan if block.use_numba else _pocket_pivot_arrays
+    return scan(block.close, block.volume, block.volume_ma20, block.ma50, float(POCKET_PIVOT_VOL))
+
+@register_pattern("breakout", label="돌파 (Breakout)")
+def _breakout(block: PatternBlock):
+    if len(block) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    scan = pattern_kernels.breakout_scan if block.use_numba else _breakout_arrays
+    idx, strength, is_upper = scan(block.close, block.volume, block.bb_upper, block.bb_lower)
+    return idx, strength, np.where(is_upper, "upper", "lower")
+
+# ───────── 일괄 평가 ─────────
+
+def empty_events() -> pd.DataFrame:
+    """열 구성만 있는 빈 이벤트 표"""
+    return pd.DataFrame({
+        "ticker": pd.Categorical([]),
+        "date": pd.DatetimeIndex([]),
+        "pattern": pd.Categorical([], categories=list(PATTERN_REGISTRY)),
+        "strength": np.empty(0),
+        "price": np.empty(0),
+        "variant": pd.Categorical([]),
+    })
+
+def evaluate_patterns(price_frames: Dict[str, pd.DataFrame], days: int = None, now: pd.Timestamp = None,
+                      patterns: Iterable[str] = None, use_numba: bool = None, panel=None) -> pd.DataFrame:
+    """여러 종목에 대해 등록된 패턴을 모두 평가해 이벤트 표 하나로 반환합니다.
+
+    days를 주면 종목마다 최근 days일 구간(+지표 워밍업)만 스캔하고 그 기간의 이벤트만 남깁니다.
+    panel(PanelIndicators)을 주면 종목별 지표를 다시 계산하지 않고 패널 지표 배열을 잘라 씁니다.
+    결과는 종목·패턴(등록 순)·날짜 순이며, 패턴별 dict 목록 대신 열 배열로 모읍니다.
+    """
+    specs = [PATTERN_REGISTRY[p] for p in (patterns or PATTERN_REGISTRY)]
+    if days is not None:
+        now = pd.Timestamp.now() if now is None else now
+
+    tickers: List[np.ndarray] = []
+    dates: List[np.ndarray] = []
+    pattern_ids: List[np.ndarray] = []
+    strengths: List[np.ndarray] = []
+    prices: List[np.ndarray] = []
+    variants: List[np.ndarray] = []
+
+    for code, price_data in price_frames.items():
+        if price_data is None or price_data.empty:
+            continue
+        try:
+            block = None
+            as_of = None
+            if days is not None:
+                # 최근 구간은 종목 마지막 봉 기준 (recent_as_of)
+                as_of = recent_as_of(price_data.index, now)
+                cutoff = as_of - pd.Timedelta(days=days + 1)
+            if panel is not None:
+                block = _panel_block(panel, code, len(price_data), days, as_of, use_numba)
+            if block is None and days is None:
+                block = PatternBlock(price_data, use_numba=use_numba)
+            elif block is None:
+                start = recent_scan_start(price_data.index, days, as_of)
+                if start is None:
+                    continue
+                # 잘라낸 구간은 일회성이므로 공유 캐시(해시 계산) 없이 지표를 계산
+                tail = price_data.iloc[start:] if start > 0 else price_data
+                block = PatternBlock(tail, IndicatorFrame(tail) if start > 0 else None, use_numba)
+            block_dates = block.dates.values
+
+            for spec in specs:
+                result = spec.fn(block)
+                idx, strength = result[0], result[1]
+                variant = result[2] if len(result) > 2 else np.full(len(idx), "", dtype=object)
+                if days is not None:
+                    keep = block_dates[idx] > cutoff.to_datetime64()
+                    idx, strength, variant = idx[keep], strength[keep], variant[keep]
+                if len(idx) == 0:
+                    continue
+                tickers.append(np.full(len(idx), code, dtype=object))
+                dates.append(block_dates[idx])
+                pattern_ids.append(np.full(len(idx), spec.pattern_id, dtype=object))
+                strengths.append(np.asarray(strength, dtype=np.float64))
+                prices.append(block.close[idx])
+                variants.append(np.asarray(variant, dtype=object))
+        except Exception as e:
+            logger.error(f"패턴 일괄 평가 실패: {code}, 에러: {str(e)}")
+
+    if not tickers:
+        return empty_events()
+    return pd.DataFrame({
+        "ticker": pd.Categorical(np.concatenate(tickers)),
+        "date": pd.DatetimeIndex(np.concatenate(dates)),
+        "pattern": pd.Categorical(np.concatenate(pattern_ids), categories=list(PATTERN_REGISTRY)),
+        "strength": np.concatenate(strengths),
+        "price": np.concatenate(prices),
+        "variant": pd.Categorical(np.concatenate(variants)),
+    })
+
+def pattern_scores(events: pd.DataFrame, tickers: Iterable[str] = None, max_per_pattern: int = 2) -> pd.Series:
+    """이벤트 표에서 종목별 패턴 점수(0.0-1.0)를 계산합니다.
+
+    패턴마다 첫 이벤트는 가중치의 100%, 두 번째부터는 50%씩 (최대 max_per_pattern개) 더합니다.
+    기간 필터는 evaluate_patterns(days=...)에서 적용된 것으로 봅니다.
+    """
+    weights = pd.Series({pid: spec.weight for pid, spec in PATTERN_REGISTRY.items()})
+    counts = events.groupby(["ticker", "pattern"], observed=True).size().clip(upper=max_per_pattern)
+    if counts.empty:
+        scores = pd.Series(dtype=np.float64)
+    else:
+        factor = 1.0 + 0.5 * (counts - 1)
+        weighted = factor * weights.reindex(counts.index.get_level_values("pattern")).to_numpy()
+        scores = weighted.groupby(level="ticker", observed=True).sum().clip(upper=1.0)
+        scores.index = scores.index.astype(object)
+    if tickers is not None:
+        scores = scores.reindex(list(tickers), fill_value=0.0)
+    return scores.astype(np.float64)
+
+def recent_pattern_events(price_data: pd.DataFrame, days: int = 30, now: pd.Timestamp = None,
+                          ticker: str = "", use_numba: bool = None) -> pd.DataFrame:
+    """한 종목의 최근 days일 패턴 이벤트 표"""
+    return evaluate_patterns({ticker: price_data}, days=days, now=now, use_numba=use_numba)
@@ -0,0 +1,88 @@
+import os
+import threading
+import pandas as pd
+from typing import Optional
+from config import PRICE_CACHE
+from utils import logger
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+class PriceCache:
+    """종목별 Parquet 파일로 저장되는 일봉 가격 캐시
+
+    price_data/{code}.parquet 하나에 종목의 전체 이력을 보관하고,
+    마지막 저장 일자 이후의 구간만 새로 받아 덧붙입니다.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        self.cache_dir = cache_dir or PRICE_CACHE["dir"]
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, code: str) -> str:
+        return os.path.join(self.cache_dir, f"{code}.parquet")
+
+    def load(self, code: str) -> Optional[pd.DataFrame]:
+        """캐시된 가격 데이터를 읽습니다. 없으면 None을 반환합니다."""
+        path = self._path(code)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_parquet(path)
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index)
+            return df
+        except Exception as e:
+            logger.error(f"가격 캐시 읽기 실패: {code}, 에러: {str(e)}")
+            return None
+
+    def last_date(self, code: str) -> Optional[pd.Timestamp]:
+        """캐시에 저장된 마지막 거래일을 반환합니다."""
+        df = self.load(code)
+        if df is None or df.empty:
+            return None
+        return df.index.max()
+
+    @staticmethod
+    def covers_start(cached: Optional[pd.DataFrame], start_date: str) -> bool:
+        """캐시가 요청 시작일부터의 이력을 담고 있는지 여부
+
+        첫 봉이 시작일 이전이거나, 시작일 이전부터 요청해 받은 이력(attrs["history_start"])이면
+        참입니다. 시작일이 휴장일이거나 시작일 이후 상장한 종목은 첫 봉이 시작일보다 늦습니다.
+        """
+        if cached is None or cached.empty:
+            return False
+        start = pd.to_datetime(start_date)
+        history_start = cached.attrs.get("history_start")
+        return cached.index.min() <= start or (history_start is not None and pd.Timestamp(history_start) <= start)
+
+    def save(self, code: str, df: pd.DataFrame) -> None:
+        """가격 데이터를 원자적으로 덮어씁니다."""
+        path = self._path(code)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"가격 캐시 저장 실패: {code}, 에러: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def append(self, code: str, cached: Optional[pd.DataFrame], new_rows: pd.DataFrame,
+               history_start: str = None) -> pd.DataFrame:
+        """새로 받은 구간을 캐시에 병합하고 병합 결과를 반환합니다.
+
+        겹치는 날짜는 새 데이터로 교체합니다 (장중에 저장된 마지막 봉 갱신).
+        history_start는 전체 이력을 받을 때 요청한 시작일로, Parquet 메타데이터(attrs)에 남습니다.
+        """
+        if cached is None or cached.empty:
+            merged = new_rows
+        elif new_rows is None or new_rows.empty:
+            return cached
+        else:
+            merged = pd.concat([cached, new_rows])
+            merged = merged[~merged.index.duplicated(keep="last")]
+        merged = merged.sort_index()
+        starts = [s for s in (history_start, (cached.attrs if cached is not None else {}).get("history_start")) if s]
+        merged.attrs = {"history_start": min(starts)} if starts else {}
+        self.save(code, merged)
+        return merged
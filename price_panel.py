@@ -0,0 +1,177 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+from config import PRICE_PANEL
+from price_cache import PRICE_COLUMNS
+from utils import logger
+
+class PricePanel:
+    """유니버스 전체 OHLCV를 (날짜 × 종목) 2차원 배열로 보관하는 패널
+
+    각 필드는 {dir}/{field}.npy 파일로 저장되며 메모리 맵으로 열립니다.
+    배열은 열 우선(Fortran) 순서라 한 종목의 시계열이 연속된 메모리 구간이
+    되므로, 종목별 DataFrame을 복사 없이 뷰로 만들 수 있습니다.
+    여러 프로세스가 같은 파일을 열면 OS 페이지 캐시를 공유합니다.
+    """
+
+    FIELDS = PRICE_COLUMNS
+
+    def __init__(self, path: str, dates: pd.DatetimeIndex, tickers: List[str],
+                 arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.dates = dates
+        self.tickers = tickers
+        self.arrays = arrays
+        self.ticker_index = {code: j for j, code in enumerate(tickers)}
+
+    @classmethod
+    def from_frames(cls, price_frames: Dict[str, pd.DataFrame]) -> "PricePanel":
+        """종목별 가격 DataFrame을 합집합 거래일 기준으로 정렬해 메모리 상의 패널을 만듭니다."""
+        tickers = [code for code, df in price_frames.items() if df is not None and not df.empty]
+        # 대부분의 종목이 같은 거래일 달력을 쓰므로 서로 다른 인덱스만 모아 합집합을 구합니다.
+        indexes = {code: pd.DatetimeIndex(price_frames[code].index) for code in tickers}
+        distinct: List[pd.DatetimeIndex] = []
+        for index in indexes.values():
+            if not any(index.equals(seen) for seen in distinct[-4:]):
+                distinct.append(index)
+        dates = pd.DatetimeIndex([])
+        for index in distinct:
+            dates = dates.union(index)
+
+        # 달력이 전체와 같은 종목은 행 인덱스 대신 전체 슬라이스로 채웁니다.
+        rows = {
+            code: slice(None) if index.equals(dates) else dates.get_indexer(index)
+            for code, index in indexes.items()
+        }
+        arrays = {}
+        for field in cls.FIELDS:
+            arr = np.full((len(dates), len(tickers)), np.nan, dtype=np.float64, order="F")
+            for j, code in enumerate(tickers):
+                df = price_frames[code]
+                if field in df.columns:
+                    arr[rows[code], j] = df[field].to_numpy(dtype=np.float64)
+            arrays[field] = arr
+        return cls(None, dates, tickers, arrays)
+
+    @classmethod
+    def build(cls, price_frames: Dict[str, pd.DataFrame], path: str = None) -> "PricePanel":
+        """종목별 가격 DataFrame으로 패널 파일을 생성하고 메모리 맵으로 엽니다.
+
+        파일마다 임시 파일에 쓴 뒤 교체하므로, 이전 패널을 메모리 맵으로 열어 둔
+        프로세스는 교체 전 파일을 계속 읽습니다.
+        """
+        path = path or PRICE_PANEL["dir"]
+        os.makedirs(path, exist_ok=True)
+
+        def replace(name: str, write) -> None:
+            tmp_path = os.path.join(path, f".{name}.{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, os.path.join(path, name))
+
+        panel = cls.from_frames(price_frames)
+        for field in cls.FIELDS:
+            replace(f"{field}.npy", lambda f: np.save(f, panel.arrays[field]))
+        replace("dates.npy", lambda f: np.save(f, panel.dates.values.astype("datetime64[ns]").view(np.int64)))
+        replace("tickers.json", lambda f: f.write(json.dumps(panel.tickers).encode("utf-8")))
+
+        logger.info(f"가격 패널 생성 완료: {len(panel.dates)}일 × {len(panel.tickers)}종목, {path}")
+        return cls.open(path)
+
+    @classmethod
+    def open(cls, path: str = None, mmap_mode: str = "r") -> "PricePanel":
+        """저장된 패널을 메모리 맵으로 엽니다."""
+        path = path or PRICE_PANEL["dir"]
+        dates = pd.DatetimeIndex(np.load(os.path.join(path, "dates.npy")).view("datetime64[ns]"))
+        with open(os.path.join(path, "tickers.json"), encoding="utf-8") as f:
+            tickers = json.load(f)
+        arrays = {
+            field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode=mmap_mode)
+            for field in cls.FIELDS
+        }
+        # 다른 프로세스가 패널을 다시 만드는 중이면 파일끼리 크기가 다를 수 있음
+        if any(arr.shape != (len(dates), len(tickers)) for arr in arrays.values()):
+            raise ValueError(f"가격 패널 파일 크기가 일치하지 않습니다: {path}")
+        return cls(path, dates, tickers, arrays)
+
+    def __reduce__(self):
+        # 작업 프로세스로 전달할 때는 경로만 보내고 받는 쪽에서 다시 메모리 맵으로 엽니다.
+        if self.path is None:
+            return (PricePanel, (None, self.dates, self.tickers, self.arrays))
+        return (PricePanel.open, (self.path,))
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.ticker_index
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def shape(self):
+        return (len(self.dates), len(self.tickers))
+
+    def subset(self, codes: List[str], lookback: int = None) -> "PricePanel":
+        """codes 종목만 담은 패널 (파일이 아닌 메모리 상의 패널)
+
+        lookback을 주면 각 종목의 최근 lookback개 봉이 모두 들어가는 첫 행부터 자르고,
+        남은 종목 모두 거래가 없는 행은 뺍니다. 패널의 종목 전체를 같은 순서로 고르고
+        뺄 행이 없으면 배열은 메모리 맵의 뷰이며, 아니면 고른 구간만 복사합니다.
+        """
+        cols = [self.ticker_index[code] for code in codes]
+        all_columns = cols == list(range(len(self.tickers)))
+        close = self.arrays["Close"] if all_columns else self.arrays["Close"][:, cols]
+        valid = ~np.isnan(close)
+
+        start = 0
+        if lookback is not None and len(cols):
+            # 종목별로 끝에서 lookback번째 봉의 행 (봉이 더 적으면 첫 봉)
+            counts = valid[::-1].cumsum(axis=0)
+            reached = counts >= np.minimum(valid.sum(axis=0), lookback)[None, :]
+            start = int((len(close) - 1 - reached.argmax(axis=0)).min())
+        keep = valid[start:].any(axis=1)
+        copied = not (all_columns and keep.all())
+
+        arrays = {}
+        for field in self.FIELDS:
+            arr = self.arrays[field][start:]
+            if not all_columns:
+                arr = arr[:, cols]
+            if not keep.all():
+                arr = arr[keep]
+            arrays[field] = np.asfortranarray(arr) if copied else arr
+        dates = self.dates[start:]
+        return PricePanel(None, dates[keep] if copied else dates, list(codes), arrays)
+
+    def column(self, field: str, code: str) -> np.ndarray:
+        """한 종목의 필드 시계열을 복사 없이 반환합니다 (상장 전·거래 없는 날은 NaN)."""
+        return self.arrays[field][:, self.ticker_index[code]]
+
+    def frame(self, code: str) -> Optional[pd.DataFrame]:
+        """한 종목의 가격 DataFrame을 반환합니다.
+
+        첫 거래일부터 마지막 거래일까지 구간은 메모리 맵의 뷰로 구성되며,
+        구간 중간에 거래가 없는 날이 있을 때만 해당 행을 제외한 복사본을 만듭니다.
+        """
+        if code not in self.ticker_index:
+            return None
+        close = self.column("Close", code)
+        valid = np.flatnonzero(~np.isnan(close))
+        if len(valid) == 0:
+            return pd.DataFrame(columns=self.FIELDS)
+        lo, hi = valid[0], valid[-1] + 1
+
+        df = pd.DataFrame(
+            {field: self.column(field, code)[lo:hi] for field in self.FIELDS},
+            index=self.dates[lo:hi],
+            copy=False
+        )
+        if len(valid) != hi - lo:
+            df = df[~np.isnan(close[lo:hi])]
+        return df
+
+    def frames(self, codes: Iterable[str] = None) -> Dict[str, pd.DataFrame]:
+        """여러 종목의 가격 DataFrame을 stock_data["price"]와 같은 형태로 반환합니다."""
+        codes = self.tickers if codes is None else codes
+        return {code: self.frame(code) for code in codes if code in self.ticker_index}
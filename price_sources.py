@@ -0,0 +1,99 @@
+import threading
+import FinanceDataReader as fdr
+import pandas as pd
+from typing import Optional
+from price_cache import PriceCache
+from synthetic_market import SyntheticMarket
+from utils import last_session, logger
+
+class PriceSource:
+    """가격 데이터 소스의 공통 인터페이스
+
+    fetch()는 데이터를 줄 수 없으면 None(또는 빈 DataFrame)을 반환하고,
+    DataFetcher는 다음 소스로 넘어갑니다. 반환한 DataFrame의
+    attrs["source"]에 출처가 기록됩니다.
+    """
+
+    name = "base"
+    remote = False  # 외부 네트워크 소스 여부 (회로 차단 대상)
+
+    def fetch(self, code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        raise NotImplementedError
+
+    def _tag(self, df: pd.DataFrame, source: str = None) -> pd.DataFrame:
+        df.attrs["source"] = source or self.name
+        return df
+
+class CachePriceSource(PriceSource):
+    """로컬 Parquet 캐시
+
+    allow_stale=False면 요청 시작일부터 end_date까지의 마지막 정규장 거래일(last_session)까지
+    덮는 경우에만, True면 마지막 저장일이 지났더라도 요청 시작일을 포함하기만 하면
+    캐시를 반환합니다.
+    """
+
+    def __init__(self, cache: PriceCache, allow_stale: bool = False):
+        self.cache = cache
+        self.allow_stale = allow_stale
+        self.name = "stale_cache" if allow_stale else "cache"
+
+    def fetch(self, code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        cached = self.cache.load(code)
+        if not self.cache.covers_start(cached, start_date):
+            return None
+        if not self.allow_stale and cached.index.max() < last_session(end_date):
+            return None
+        logger.info(f"주가 데이터 캐시 사용: {code}, 마지막 일자 {cached.index.max():%Y-%m-%d}")
+        return self._tag(cached.loc[start_date:end_date])
+
+class FdrPriceSource(PriceSource):
+    """FinanceDataReader
+
+    캐시가 요청 시작일부터의 이력을 담고 있으면(PriceCache.covers_start) 마지막 저장일 이후
+    구간만 요청해 캐시에 덧붙입니다.
+    """
+
+    name = "fdr"
+    remote = True
+
+    def __init__(self, cache: Optional[PriceCache] = None, limit: threading.Semaphore = None):
+        self.cache = cache
+        self.limit = limit or threading.BoundedSemaphore(1)
+
+    def fetch(self, code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        cached = self.cache.load(code) if self.cache else None
+        if PriceCache.covers_start(cached, start_date):
+            fetch_start = cached.index.max().strftime("%Y-%m-%d")
+        else:
+            cached = None
+            fetch_start = start_date
+
+        with self.limit:
+            df = fdr.DataReader(code, fetch_start, end_date)
+        if df is None or df.empty:
+            if cached is not None:
+                logger.info(f"신규 주가 데이터가 없어 캐시 사용: {code}")
+                return self._tag(cached.loc[start_date:end_date], "cache")
+            logger.warning(f"주가 데이터가 비어있습니다: {code}")
+            return None
+
+        # 인덱스가 DatetimeIndex가 아니면 변환
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df.index = pd.to_datetime(df.index)
+        logger.info(f"주가 데이터 가져오기 성공: {code}, {len(df)}개 레코드")
+        if self.cache:
+            df = self.cache.append(code, cached, df, history_start=start_date if cached is None else None)
+        return self._tag(df.loc[start_date:end_date])
+
+class SyntheticPriceSource(PriceSource):
+    """고정 시드 합성 데이터 (최후의 대체 수단)"""
+
+    name = "synthetic"
+
+    def __init__(self, market: SyntheticMarket = None):
+        self.market = market or SyntheticMarket()
+
+    def fetch(self, code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        df = self.market.prices([code], start_date, end_date)[code]
+        logger.info(f"샘플 주가 데이터 생성 완료: {code}, {len(df)}개 레코드")
+        return self._tag(df)
@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable
+from utils import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 안에서만 직렬화
+    fcntl = None
+
+class QuotaExceededError(Exception):
+    """일일 요청 한도를 모두 사용했을 때 발생합니다."""
+
+class TokenBucket:
+    """초당 rate개의 토큰이 최대 capacity개까지 채워지는 토큰 버킷
+
+    여러 스레드가 공유하며, 토큰이 없으면 다음 토큰이 생길 때까지 대기합니다.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """토큰을 꺼냅니다. 대기한 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # 대기 후 다시 계산한 토큰이 부동소수점 오차로 조금 모자랄 수 있음
+                if self._tokens >= tokens - 1e-9:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            self.sleep(wait)
+            waited += wait
+
+class QuotaLedger:
+    """일일 요청 수를 파일에 기록하는 한도 장부
+
+    프로세스를 다시 시작해도 당일 사용량이 유지되며, 날짜가 바뀌면 초기화됩니다.
+    요청을 기록할 때마다 파일 잠금 아래에서 저장된 사용량을 다시 읽어 합치므로
+    같은 장부를 쓰는 다른 인스턴스·프로세스의 사용량도 반영됩니다.
+    """
+
+    def __init__(self, path: str, daily_limit: int):
+        self.path = path
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._date, self._count = self._load()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("date", self._today()), int(data.get("count", 0))
+        except (OSError, ValueError):
+            return self._today(), 0
+
+    @contextmanager
+    def _file_lock(self):
+        """장부 파일 옆의 .lock 파일로 프로세스 간 배타 잠금"""
+        if fcntl is None:
+            yield
+            return
+        try:
+            lock_file = open(f"{self.path}.lock", "a")
+        except OSError as e:
+            logger.error(f"요청 한도 장부 잠금 실패: {str(e)}")
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _merge(self) -> None:
+        """저장된 사용량을 다시 읽어 같은 날짜면 큰 값을 사용합니다."""
+        date, count = self._load()
+        if date == self._date:
+            self._count = max(self._count, count)
+        elif date > self._date:
+            self._date, self._count = date, count
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"date": self._date, "count": self._count, "daily_limit": self.daily_limit}, f)
+        os.replace(tmp_path, self.path)
+
+    def _roll(self) -> None:
+        today = self._today()
+        if self._date != today:
+            self._date, self._count = today, 0
+
+    @property
+    def used(self) -> int:
+        with self._lock:
+            self._merge()
+            self._roll()
+            return self._count
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.used)
+
+    def consume(self, n: int = 1) -> None:
+        """요청 n건을 기록합니다. 한도를 넘으면 QuotaExceededError를 발생시킵니다."""
+        with self._lock, self._file_lock():
+            self._merge()
+            self._roll()
+            if self._count + n > self.daily_limit:
+                raise QuotaExceededError(f"일일 요청 한도 초과: {self._count}/{self.daily_limit} ({self._date})")
+            self._count += n
+            try:
+                self._save()
+            except OSError as e:
+                logger.error(f"요청 한도 장부 저장 실패: {str(e)}")
+
+class RateLimiter:
+    """토큰 버킷 속도 제한과 일일 한도 장부를 함께 적용합니다."""
+
+    def __init__(self, name: str, requests_per_second: float, burst: int,
+                 daily_quota: int, ledger_path: str):
+        self.name = name
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.ledger = QuotaLedger(ledger_path, daily_quota)
+
+    def acquire(self) -> None:
+        """요청 1건을 허가받습니다. 한도를 다 썼으면 대기 없이 바로 예외를 발생시킵니다."""
+        self.ledger.consume()
+        waited = self.bucket.acquire()
+        if waited > 1.0:
+            logger.info(f"{self.name} 요청 속도 제한으로 {waited:.1f}초 대기")
+
+    @property
+    def exhausted(self) -> bool:
+        return self.ledger.remaining <= 0
@@ -0,0 +1,109 @@
+"""유니버스 상대강도(RS) 등급
+
+IBD 방식처럼 여러 기간 수익률의 가중합을 유니버스 전체에서 순위화해 1-99 등급을 매깁니다.
+가중 수익률은 (날짜 × 종목) 패널에서 한 번에 계산하고, 한 번 정렬한 배열에 대해
+searchsorted로 백분위를 구합니다. 등급표는 거래일·유니버스별로 캐시되므로
+같은 날 반복 조회는 dict 조회(유니버스 밖 값은 O(log n))로 끝납니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from config import RS_RATING
+from panel_indicators import PanelIndicators
+from utils import sorted_percentile, logger
+
+class RSRatings:
+    """한 거래일 기준 유니버스 RS 등급표"""
+
+    def __init__(self, codes: List[str], weighted_returns: np.ndarray, as_of: pd.Timestamp = None):
+        self.codes = list(codes)
+        self.as_of = as_of
+        self.weighted_returns = np.asarray(weighted_returns, dtype=np.float64)
+        valid = np.isfinite(self.weighted_returns)
+        self.sorted_returns = np.sort(self.weighted_returns[valid])
+        self.ratings = np.full(len(self.codes), np.nan)
+        self.ratings[valid] = self.rating_of(self.weighted_returns[valid])
+        self._index = {code: j for j, code in enumerate(self.codes)}
+
+    @classmethod
+    def from_panel(cls, panel: PanelIndicators, horizons: Dict[int, float] = None) -> "RSRatings":
+        """패널의 종목별 마지막 거래일 기준 가중 수익률(%)로 등급표를 만듭니다.
+
+        기간은 종목 자신의 봉 수이며(달력이 다른 종목이 섞여도 같음), 상장 후 기간이 짧은
+        종목은 첫 거래일 종가를 기준으로 합니다 (PanelIndicators.weighted_returns).
+        """
+        horizons = horizons or RS_RATING["horizons"]
+        weighted = panel.weighted_returns(horizons)
+        as_of = panel.dates[panel.last_row.max()] if len(panel.tickers) else None
+        return cls(panel.tickers, weighted, as_of)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._index
+
+    def rating_of(self, weighted_return) -> np.ndarray:
+        """가중 수익률(%)의 등급 (1-99). 유니버스 밖 종목의 값도 O(log n)으로 조회합니다."""
+        return np.clip(np.rint(sorted_percentile(self.sorted_returns, weighted_return)), 1, 99)
+
+    def rating(self, code: str) -> float:
+        """종목의 RS 등급 (1-99, 계산할 수 없으면 NaN)"""
+        j = self._index.get(code)
+        return np.nan if j is None else float(self.ratings[j])
+
+    def table(self) -> pd.DataFrame:
+        """종목별 가중 수익률과 등급 표"""
+        return pd.DataFrame({
+            "weighted_return": self.weighted_returns,
+            "rating": self.ratings,
+        }, index=pd.Index(self.codes, name="code"))
+
+def universe_key(price_frames: Dict[str, pd.DataFrame]) -> str:
+    """등급표 캐시 키: 종목 코드와 종목별 마지막 거래일·종가, 기간 가중치 설정
+
+    같은 날 장중 갱신으로 종가가 바뀌면 키도 바뀝니다. 과거 구간만 잘라낸 DataFrame도
+    마지막 봉이 같으면 같은 키가 됩니다.
+    """
+    codes = [code for code, df in price_frames.items() if df is not None and not df.empty]
+    last_dates = np.array([pd.Timestamp(price_frames[code].index[-1]).value for code in codes], dtype=np.int64)
+    last_closes = np.array([price_frames[code]["Close"].iloc[-1] for code in codes], dtype=np.float64)
+    digest = hashlib.blake2b(",".join(codes).encode(), digest_size=16)
+    digest.update(last_dates.tobytes())
+    digest.update(last_closes.tobytes())
+    digest.update(repr(sorted(RS_RATING["horizons"].items())).encode())
+    return digest.hexdigest()
+
+_cache: "OrderedDict[str, RSRatings]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def get_rs_ratings(price_frames: Dict[str, pd.DataFrame], panel: PanelIndicators = None) -> RSRatings:
+    """유니버스 RS 등급표를 반환합니다 (거래일·유니버스별 LRU 캐시).
+
+    panel을 주면 캐시에 없을 때 그 패널로 계산하고, 없으면 price_frames로 패널을 만듭니다.
+    """
+    key = universe_key(price_frames)
+    with _cache_lock:
+        ratings = _cache.get(key)
+        if ratings is not None:
+            _cache.move_to_end(key)
+            return ratings
+
+    if panel is None:
+        panel = PanelIndicators.from_frames(price_frames)
+    ratings = RSRatings.from_panel(panel)
+    logger.info(f"RS 등급 계산 완료: {len(ratings)}개 종목, 기준일 {ratings.as_of}")
+
+    with _cache_lock:
+        _cache[key] = ratings
+        while len(_cache) > RS_RATING["max_entries"]:
+            _cache.popitem(last=False)
+    return ratings
+
+def clear_rs_rating_cache() -> None:
+    """RS 등급 캐시를 비웁니다."""
+    with _cache_lock:
+        _cache.clear()
@@ -1,82 +1,196 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple
+from config import SCORE_WEIGHTS, FUNDAMENTAL_WEIGHTS, RS_FILTER_THRESHOLD, SEPA_THRESHOLDS, RS_RATING
 from utils import normalize_data, logger
 from sepa_metrics import SEPAMetrics
 from pattern_detector import PatternDetector
+from indicators import get_indicators
+from compact_ohlcv import as_price_frame
+from pattern_registry import recent_pattern_events, pattern_scores, empty_events
+
+class ScoreResult(NamedTuple):
+    """ScoringEngine.evaluate()의 결과 (한 번 계산한 뒤 바꾸지 않는 값)"""
+    total: float
+    trend: float
+    fundamental: float
+    rs: float
+    pattern: float
+    trend_filter: bool
+    fundamental_filter: bool
+    rs_filter: bool
+    trend_conditions: Mapping[str, bool]   # price_above_ma, ma_alignment, ma_slope, price_vs_52w
+    metrics: Mapping[str, float]           # SEPAMetrics.get_all_metrics()
+    sepa_status: Mapping[str, bool]        # 재무제표가 없으면 모두 False
+    pattern_events: pd.DataFrame           # 최근 30일 패턴 이벤트 표
+    recommendation: str
+
+    @property
+    def all_filters_passed(self) -> bool:
+        return self.trend_filter and self.fundamental_filter and self.rs_filter
+
+    @property
+    def scores(self) -> Dict[str, float]:
+        """calculate_total_score()와 같은 형태의 점수 dict"""
+        return {"total": self.total, "trend": self.trend, "fundamental": self.fundamental,
+                "rs": self.rs, "pattern": self.pattern}
+
+def rs_rating_score(rating: float) -> float:
+    """RS 등급(1-99)을 RS 점수(0.0-1.0)로 변환합니다 (등급 70 = 점수 0.7)."""
+    return max(0.0, min(1.0, rating / 100))
+
+def recommend(total: float, all_filters_passed: bool) -> str:
+    """종합 점수와 필터 통과 여부로 투자 추천을 정합니다."""
+    if total >= 0.8 and all_filters_passed:
+        return "강력 매수"
+    if total >= 0.6 and all_filters_passed:
+        return "매수"
+    if total >= 0.4:
+        return "관망"
+    return "매도"
 
 class ScoringEngine:
-    def __init__(self, stock_data: Dict):
+    def __init__(self, stock_data: Dict, latest_inputs=None, rs_rating: float = None,
+                 fundamental_norm: Mapping[str, float] = None):
         """
         stock_data: {
             "price": pd.DataFrame,          # Date, Open, High, Low, Close, Volume
             "financial": {"annual": pd.DataFrame, ...}
         }
+        latest_inputs: 추세·RS 최신 값 제공자 (PanelIndicators.ticker(code) 등).
+                       없으면 stock_data["indicators"](수집 때 갱신한 StreamingIndicators)가
+                       가격의 마지막 봉까지 반영되어 있을 때 그 값을, 아니면 종목별 지표 캐시를 사용합니다.
+        rs_rating: 유니버스 RS 등급 (1-99, RSRatings.rating(code)).
+                   RS_RATING["mode"]가 "rating"일 때 RS 점수로 사용합니다.
+        fundamental_norm: 유니버스 정규화 행렬의 이 종목 행 (get_normalized_fundamentals().loc[code]).
+                          없으면 종목 단독으로 정규화합니다.
         """
+        # 압축 가격(CompactOHLCV)은 지표 계산을 위해 float64 DataFrame으로 풀어 사용
+        if not isinstance(stock_data["price"], pd.DataFrame):
+            stock_data = {**stock_data, "price": as_price_frame(stock_data["price"])}
         self.stock_data = stock_data
         self.sepa_metrics = SEPAMetrics(stock_data["financial"])
-        self.pattern_detector = PatternDetector(stock_data["price"])
+        # 이동평균 등 가격 지표는 종목별 공유 캐시에서 한 번만 계산
+        self.indicators = get_indicators(stock_data["price"])
+        self.pattern_detector = PatternDetector(stock_data["price"], self.indicators)
+        if latest_inputs is None:
+            latest_inputs = self._streaming_inputs(stock_data) or self.indicators
+        self.latest_inputs = latest_inputs
+        self.rs_rating = rs_rating
+        self.fundamental_norm = fundamental_norm
+        self._result = None
+        # 가격 데이터 출처 (cache / fdr / stale_cache / synthetic)
+        self.price_source = stock_data["price"].attrs.get("source", "unknown")
+        if self.is_synthetic:
+            logger.warning("합성(샘플) 주가 데이터로 점수를 계산합니다.")
         
-    def calculate_trend_score(self) -> float:
-        """1단계: 기술적 추세 점수 (0.0–1.0)"""
+    @staticmethod
+    def _streaming_inputs(stock_data: Dict):
+        """가격의 모든 봉을 반영한 증분 지표 상태 (없거나 가격과 맞지 않으면 None)"""
+        state = stock_data.get("indicators")
+        price = stock_data["price"]
+        # 21봉 미만은 종목별 계산처럼 추세 조건 없이 채점하도록 지표 캐시 사용
+        if state is None or price.empty or state.bars < 21:
+            return None
+        if state.last_date != price.index[-1] or state.bars != len(price) or state.last_close != price["Close"].iloc[-1]:
+            return None
+        return state
+
+    @property
+    def is_synthetic(self) -> bool:
+        """실제 시세가 아닌 합성 주가 데이터인지 여부"""
+        return self.price_source == "synthetic"
+        
+    def evaluate(self) -> ScoreResult:
+        """점수·필터·재무 지표·패턴·추천을 한 번에 계산합니다.
+
+        결과는 엔진에 보관되어 이후 calculate_*·check_*·get_recommendation 호출은
+        다시 계산하지 않고 이 결과를 읽습니다.
+        """
+        if self._result is None:
+            conds = self._trend_conditions()
+            trend = sum(0.25 for ok in conds.values() if ok)
+            logger.info(f"추세 점수: {trend:.2f}")
+
+            metrics = self._fundamental_metrics()
+            fundamental = self._fundamental_score(metrics)
+            sepa_status = self._sepa_status(metrics)
+
+            rs = self._rs_score()
+            events = self._pattern_events()
+            pattern = self._pattern_score(events)
+
+            total = self._total_score(trend, fundamental, rs, pattern)
+            trend_ok = bool(conds) and all(conds.values())
+            fund_ok = self._fundamental_filter(metrics)
+            rs_ok = rs >= RS_FILTER_THRESHOLD
+
+            self._result = ScoreResult(
+                total=total, trend=trend, fundamental=fundamental, rs=rs, pattern=pattern,
+                trend_filter=trend_ok, fundamental_filter=fund_ok, rs_filter=rs_ok,
+                trend_conditions=MappingProxyType(conds),
+                metrics=MappingProxyType(metrics),
+                sepa_status=MappingProxyType(sepa_status),
+                pattern_events=events,
+                recommendation=recommend(total, trend_ok and fund_ok and rs_ok)
+            )
+        return self._result
+
+    def _trend_conditions(self) -> Dict[str, bool]:
+        """추세 조건 4개 (계산할 수 없으면 빈 dict)"""
         try:
             df = self.stock_data["price"]
             if df.empty:
                 logger.warning("주가 데이터가 없어 추세 점수를 계산할 수 없습니다.")
-                return 0.0
+                return {}
+
+            # 최신 종가, 50/150/200일 이동평균과 5/10/20일 전 값, 52주 고/저가
+            v = self.latest_inputs.trend_inputs()
+            latest = v["latest"]
+            ma50, ma150, ma200 = v["ma50"], v["ma150"], v["ma200"]
+            ma50_prev, ma150_prev, ma200_prev = v["ma50_prev"], v["ma150_prev"], v["ma200_prev"]
+            high52, low52 = v["high52"], v["low52"]
 
-            # 최신 종가
-            latest = df["Close"].iloc[-1]
-            # 이동평균선
-            ma50  = df["Close"].rolling(50).mean().iloc[-1]
-            ma150 = df["Close"].rolling(150).mean().iloc[-1]
-            ma200 = df["Close"].rolling(200).mean().iloc[-1]
-            # 기울기 (5/10/20일 전 비교)
-            ma50_prev  = df["Close"].rolling(50).mean().iloc[-6]
-            ma150_prev = df["Close"].rolling(150).mean().iloc[-11]
-            ma200_prev = df["Close"].rolling(200).mean().iloc[-21]
-            # 52주 고/저가
-            high52 = df["High"].tail(250).max()
-            low52  = df["Low"].tail(250).min()
-
-            conds = {
-                "price_above_ma": latest > ma50 and latest > ma150 and latest > ma200,
-                "ma_alignment":  ma50 > ma150 > ma200,
-                "ma_slope":      (ma50 > ma50_prev and ma150 > ma150_prev and ma200 > ma200_prev),
-                "price_vs_52w":  (latest >= low52 * 1.3 and latest >= high52 * 0.75)
+            return {
+                "price_above_ma": bool(latest > ma50 and latest > ma150 and latest > ma200),
+                "ma_alignment":  bool(ma50 > ma150 > ma200),
+                "ma_slope":      bool(ma50 > ma50_prev and ma150 > ma150_prev and ma200 > ma200_prev),
+                "price_vs_52w":  bool(latest >= low52 * 1.3 and latest >= high52 * 0.75)
             }
-            # 각 조건 0.25점
-            score = sum(0.25 for ok in conds.values() if ok)
-            logger.info(f"추세 점수: {score:.2f}")
-            return score
         except Exception as e:
             logger.error(f"추세 점수 계산 실패: {e}")
-            return 0.0
+            return {}
 
-    def calculate_fundamental_score(self) -> float:
-        """2단계: 펀더멘털 점수 (0.0–1.0)"""
+    def _fundamental_metrics(self) -> Dict[str, float]:
+        try:
+            return self.sepa_metrics.get_all_metrics()
+        except Exception as e:
+            logger.error(f"재무 지표 계산 실패: {e}")
+            return {k: 0.0 for k in FUNDAMENTAL_WEIGHTS}
+
+    def _fundamental_score(self, metas: Dict[str, float]) -> float:
         try:
             df_ann = self.stock_data["financial"]["annual"]
             if df_ann.empty:
                 logger.warning("재무제표 데이터가 없어 펀더멘털 점수를 계산할 수 없습니다.")
                 return 0.0
 
-            metas = self.sepa_metrics.get_all_metrics()
             if all(v == 0.0 for v in metas.values()):
                 logger.warning("모든 펀더멘털 지표가 0입니다.")
                 return 0.0
 
-            norm = {}
-            for k, v in metas.items():
-                norm[k] = 0.0 if v == 0 else normalize_data(pd.Series([v]))[0]
-            # 부채비율 역변환
-            norm["debt_ratio"] = 1 - norm["debt_ratio"]
-
-            w = {
-                "sales_growth":            0.3,
-                "operating_income_growth": 0.3,
-                "roe":                     0.2,
-                "debt_ratio":              0.2
-            }
+            if self.fundamental_norm is not None:
+                # 유니버스 횡단면 정규화 값 (부채비율은 이미 뒤집은 값)
+                norm = {k: float(self.fundamental_norm[k]) for k in FUNDAMENTAL_WEIGHTS}
+            else:
+                norm = {}
+                for k, v in metas.items():
+                    norm[k] = 0.0 if v == 0 else normalize_data(pd.Series([v]))[0]
+                # 부채비율 역변환
+                norm["debt_ratio"] = 1 - norm["debt_ratio"]
+
+            w = FUNDAMENTAL_WEIGHTS
             score = sum(norm[k] * w[k] for k in w)
             score = max(0.0, min(1.0, score))
             logger.info(f"펀더멘털 점수: {score:.2f}")
@@ -85,21 +199,41 @@ class ScoringEngine:
             logger.error(f"펀더멘털 점수 계산 실패: {e}")
             return 0.0
 
-    def calculate_rs_score(self) -> float:
-        """3단계: 상대적 강도 점수 (0.0–1.0)"""
+    def _sepa_status(self, metrics: Dict[str, float]) -> Dict[str, bool]:
+        try:
+            if self.stock_data["financial"]["annual"].empty:
+                logger.warning("재무제표 데이터가 없어 SEPA 기준을 확인할 수 없습니다.")
+                return {k: False for k in SEPA_THRESHOLDS}
+            return self.sepa_metrics.check_sepa_criteria(metrics)
+        except Exception as e:
+            logger.error(f"SEPA 기준 확인 실패: {str(e)}")
+            return {k: False for k in SEPA_THRESHOLDS}
+
+    def _fundamental_filter(self, metrics: Dict[str, float]) -> bool:
+        """최소 3개 지표 통과 (재무제표가 없어도 지표 0 기준으로 판정)"""
+        try:
+            st = self.sepa_metrics.check_sepa_criteria(metrics)
+            return sum(1 for v in st.values() if v) >= 3
+        except Exception as e:
+            logger.error(f"기본 필터 확인 실패: {e}")
+            return False
+
+    def _rs_score(self) -> float:
         try:
             df = self.stock_data["price"]
             if df.empty:
                 logger.warning("주가 데이터가 없어 RS 점수를 계산할 수 없습니다.")
                 return 0.0
 
-            # 13주(약 65 거래일)와 26주(약 130 거래일) 수익률 계산
-            current_price = df["Close"].iloc[-1]
-            price_13w_ago = df["Close"].iloc[-65] if len(df) >= 65 else df["Close"].iloc[0]
-            price_26w_ago = df["Close"].iloc[-130] if len(df) >= 130 else df["Close"].iloc[0]
-            
-            returns_13w = ((current_price / price_13w_ago) - 1) * 100
-            returns_26w = ((current_price / price_26w_ago) - 1) * 100
+            if RS_RATING["mode"] == "rating":
+                if self.rs_rating is not None and not np.isnan(self.rs_rating):
+                    score = rs_rating_score(self.rs_rating)
+                    logger.info(f"RS 점수: 등급={self.rs_rating:.0f}, 점수={score:.2f}")
+                    return score
+                logger.warning("RS 등급이 없어 절대 수익률 기준으로 RS 점수를 계산합니다.")
+
+            # 13주(약 65 거래일)와 26주(약 130 거래일) 수익률
+            returns_13w, returns_26w = self.latest_inputs.rs_returns()
             
             # 13주와 26주 수익률에 가중치 적용 (13주에 더 큰 가중치)
             rs_score_13w = min(max(returns_13w / 20, 0), 1)  # 20% 이상 상승 시 만점
@@ -116,32 +250,23 @@ class ScoringEngine:
             logger.error(f"RS 점수 계산 실패: {e}")
             return 0.0
 
-    def calculate_pattern_score(self) -> float:
-        """4단계: 패턴 점수 (0.0–1.0)"""
+    def _pattern_events(self) -> pd.DataFrame:
+        """최근 30일 구간(+지표 워밍업)만 스캔한 패턴 이벤트 표"""
         try:
             df = self.stock_data["price"]
             if df.empty:
                 logger.warning("주가 데이터가 없어 패턴 점수를 계산할 수 없습니다.")
-                return 0.0
+                return empty_events()
+            return recent_pattern_events(df, days=30)
+        except Exception as e:
+            logger.error(f"패턴 감지 실패: {e}")
+            return empty_events()
 
-            pats = self.pattern_detector.get_all_patterns()
-            weights = {"vcp":0.4, "pocket_pivot":0.3, "breakout":0.3}
-
-            recent = {}
-            for t, lst in pats.items():
-                # 최근 30일, 최대 2개
-                rp = [p for p in lst if (pd.Timestamp.now() - p["date"]).days <= 30]
-                recent[t] = sorted(rp, key=lambda x:x["date"], reverse=True)[:2]
-
-            pat_score = 0.0
-            for t, w in weights.items():
-                lst = recent[t]
-                if not lst:
-                    continue
-                # 첫 패턴 100%, 두 번째 50%
-                pat_score += w * (1.0 if len(lst)>=1 else 0.0)
-                if len(lst)>=2:
-                    pat_score += w * 0.5
+    def _pattern_score(self, events: pd.DataFrame) -> float:
+        try:
+            # 패턴별 첫 이벤트 100%, 두 번째 50% (가중치는 패턴 레지스트리)
+            # 한 종목의 이벤트뿐이므로 합계가 곧 이 종목의 점수
+            pat_score = float(pattern_scores(events).sum())
 
             # 정규화 (최대 1.0)
             score = min(pat_score, 1.0)
@@ -151,101 +276,50 @@ class ScoringEngine:
             logger.error(f"패턴 점수 계산 실패: {e}")
             return 0.0
 
+    def _total_score(self, t: float, f: float, r: float, p: float) -> float:
+        if all(x == 0.0 for x in (t, f, r, p)):
+            logger.warning("모든 점수가 0입니다.")
+            return 0.0
+        w = SCORE_WEIGHTS
+        total = t*w["trend"] + f*w["fundamental"] + r*w["rs"] + p*w["pattern"]
+        return max(0.0, min(1.0, total))
+
+    def calculate_trend_score(self) -> float:
+        """1단계: 기술적 추세 점수 (0.0–1.0)"""
+        return self.evaluate().trend
+
+    def calculate_fundamental_score(self) -> float:
+        """2단계: 펀더멘털 점수 (0.0–1.0)"""
+        return self.evaluate().fundamental
+
+    def calculate_rs_score(self) -> float:
+        """3단계: 상대적 강도 점수 (0.0–1.0)"""
+        return self.evaluate().rs
+
+    def calculate_pattern_score(self) -> float:
+        """4단계: 패턴 점수 (0.0–1.0)"""
+        return self.evaluate().pattern
+
     def calculate_total_score(self) -> Dict[str, float]:
         """4단계 가중 합산한 최종 점수 반환"""
-        try:
-            t = self.calculate_trend_score()
-            f = self.calculate_fundamental_score()
-            r = self.calculate_rs_score()
-            p = self.calculate_pattern_score()
-            if all(x==0.0 for x in (t,f,r,p)):
-                logger.warning("모든 점수가 0입니다.")
-                return {"total":0.0, "trend":t, "fundamental":f, "rs":r, "pattern":p}
-
-            w = {"trend":0.25, "fundamental":0.30, "rs":0.20, "pattern":0.25}
-            total = t*w["trend"] + f*w["fundamental"] + r*w["rs"] + p*w["pattern"]
-            total = max(0.0, min(1.0, total))
-            return {"total":total, "trend":t, "fundamental":f, "rs":r, "pattern":p}
-        except Exception as e:
-            logger.error(f"종합 점수 계산 실패: {e}")
-            return {"total":0.0, "trend":0.0, "fundamental":0.0, "rs":0.0, "pattern":0.0}
+        return self.evaluate().scores
 
     def check_trend_filter(self) -> bool:
         """1단계 필터 (모두 True여야 통과)"""
-        try:
-            df = self.stock_data["price"]
-            if df.empty:
-                return False
-            latest = df["Close"].iloc[-1]
-            ma50  = df["Close"].rolling(50).mean().iloc[-1]
-            ma150 = df["Close"].rolling(150).mean().iloc[-1]
-            ma200 = df["Close"].rolling(200).mean().iloc[-1]
-            ma50_p  = df["Close"].rolling(50).mean().iloc[-6]
-            ma150_p = df["Close"].rolling(150).mean().iloc[-11]
-            ma200_p = df["Close"].rolling(200).mean().iloc[-21]
-            high52 = df["High"].tail(250).max()
-            low52  = df["Low"].tail(250).min()
-
-            return (
-                latest>ma50 and latest>ma150 and latest>ma200 and
-                ma50>ma150>ma200 and
-                ma50>ma50_p and ma150>ma150_p and ma200>ma200_p and
-                latest>=low52*1.3 and latest>=high52*0.75
-            )
-        except Exception as e:
-            logger.error(f"추세 필터 확인 실패: {e}")
-            return False
+        return self.evaluate().trend_filter
 
     def check_fundamental_filter(self) -> bool:
         """2단계 필터: 최소 3개 지표 통과"""
-        try:
-            st = self.sepa_metrics.check_sepa_criteria()
-            return sum(1 for v in st.values() if v) >= 3
-        except Exception as e:
-            logger.error(f"기본 필터 확인 실패: {e}")
-            return False
+        return self.evaluate().fundamental_filter
 
     def check_rs_filter(self) -> bool:
         """3단계 필터: RS ≥ 0.7"""
-        try:
-            return self.calculate_rs_score() >= 0.7
-        except Exception as e:
-            logger.error(f"RS 필터 확인 실패: {e}")
-            return False
+        return self.evaluate().rs_filter
 
     def get_recommendation(self) -> str:
         """최종 투자 추천 생성"""
-        scores = self.calculate_total_score()
-        tot = scores["total"]
-        trend_ok = self.check_trend_filter()
-        fund_ok  = self.check_fundamental_filter()
-        rs_ok    = self.check_rs_filter()
-
-        if tot >= 0.8 and trend_ok and fund_ok and rs_ok:
-            return "강력 매수"
-        if tot >= 0.6 and trend_ok and fund_ok and rs_ok:
-            return "매수"
-        if tot >= 0.4:
-            return "관망"
-        return "매도"
+        return self.evaluate().recommendation
         
     def get_sepa_status(self) -> Dict[str, bool]:
         """SEPA 기준 충족 여부를 확인합니다."""
-        try:
-            if self.stock_data["financial"]["annual"].empty:
-                logger.warning("재무제표 데이터가 없어 SEPA 기준을 확인할 수 없습니다.")
-                return {
-                    "sales_growth": False,
-                    "operating_income_growth": False,
-                    "roe": False,
-                    "debt_ratio": False
-                }
-            return self.sepa_metrics.check_sepa_criteria()
-        except Exception as e:
-            logger.error(f"SEPA 기준 확인 실패: {str(e)}")
-            return {
-                "sales_growth": False,
-                "operating_income_growth": False,
-                "roe": False,
-                "debt_ratio": False
-            }
\ No newline at end of file
+        return dict(self.evaluate().sepa_status)
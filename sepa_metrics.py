@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 from config import SEPA_THRESHOLDS
-from utils import calculate_growth_rate, logger
+from utils import calculate_growth_rate, parse_amount, logger
 
 class SEPAMetrics:
     def __init__(self, financial_data: Dict[str, pd.DataFrame]):
@@ -28,9 +28,9 @@ class SEPAMetrics:
                 return 0.0
                 
             # 최신 데이터 사용
-            amount_str = account_data.iloc[0]["thstrm_amount"].replace(",", "")
-            logger.info(f"계정과목 '{account_name}' 값: {amount_str}")
-            return float(amount_str)
+            amount = parse_amount(account_data.iloc[0]["thstrm_amount"])
+            logger.info(f"계정과목 '{account_name}' 값: {amount:.0f}")
+            return amount
         except Exception as e:
             logger.error(f"계정과목 '{account_name}' 값 추출 실패: {str(e)}")
             return 0.0
@@ -64,8 +64,8 @@ class SEPAMetrics:
             
             logger.info(f"매출액 현재값: {current_str}, 이전값: {previous_str}")
             
-            current = float(current_str.replace(",", ""))
-            previous = float(previous_str.replace(",", ""))
+            current = parse_amount(current_str)
+            previous = parse_amount(previous_str)
             
             growth_rate = calculate_growth_rate(current, previous)
             logger.info(f"매출액 성장률 계산 결과: {growth_rate:.2f}%")
@@ -104,8 +104,8 @@ class SEPAMetrics:
             
             logger.info(f"영업이익 현재값: {current_str}, 이전값: {previous_str}")
             
-            current = float(current_str.replace(",", ""))
-            previous = float(previous_str.replace(",", ""))
+            current = parse_amount(current_str)
+            previous = parse_amount(previous_str)
             
             growth_rate = calculate_growth_rate(current, previous)
             logger.info(f"영업이익 성장률 계산 결과: {growth_rate:.2f}%")
@@ -162,9 +162,10 @@ class SEPAMetrics:
             "debt_ratio": self.calculate_debt_ratio()
         }
         
-    def check_sepa_criteria(self) -> Dict[str, bool]:
-        """SEPA 기준 충족 여부를 확인합니다."""
-        metrics = self.get_all_metrics()
+    def check_sepa_criteria(self, metrics: Dict[str, float] = None) -> Dict[str, bool]:
+        """SEPA 기준 충족 여부를 확인합니다 (이미 계산한 지표를 주면 다시 계산하지 않음)."""
+        if metrics is None:
+            metrics = self.get_all_metrics()
         return {
             "sales_growth": metrics["sales_growth"] >= SEPA_THRESHOLDS["sales_growth"],
             "operating_income_growth": metrics["operating_income_growth"] >= SEPA_THRESHOLDS["operating_income_growth"],
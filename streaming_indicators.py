@@ -0,0 +1,321 @@
+import os
+import json
+import math
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+import pandas as pd
+from config import BOLLINGER_BANDS, STREAMING_INDICATORS
+from utils import logger
+
+class RollingStats:
+    """최근 window개 값의 평균·분산을 봉 하나당 O(1)로 갱신합니다.
+
+    창이 찰 때까지는 Welford 누적, 이후에는 가장 오래된 값을 빼는
+    슬라이딩 Welford 식을 사용합니다. 저장 시에는 창 안의 값만 보관하고
+    불러올 때 다시 누적해 부동소수점 오차를 초기화합니다.
+    """
+
+    def __init__(self, window: int, values: Iterable[float] = ()):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.mean = 0.0
+        self._m2 = 0.0
+        for x in values:
+            self.push(x)
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def push(self, x: float) -> None:
+        """새 값을 창에 추가합니다 (창이 가득 차면 가장 오래된 값 제거)."""
+        if len(self.values) == self.window:
+            self._replace(self.values[0], x)
+            self.values.append(x)
+            return
+        self.values.append(x)
+        delta = x - self.mean
+        self.mean += delta / len(self.values)
+        self._m2 += delta * (x - self.mean)
+
+    def replace_last(self, x: float) -> None:
+        """마지막 값을 교체합니다 (장중 갱신된 당일 봉)."""
+        old = self.values[-1]
+        self.values[-1] = x
+        self._replace(old, x)
+
+    def _replace(self, old: float, new: float) -> None:
+        old_mean = self.mean
+        self.mean += (new - old) / len(self.values)
+        self._m2 += (new - old) * (new - self.mean + old - old_mean)
+
+    def average(self, min_periods: int = None) -> float:
+        """이동평균 (pandas rolling과 같이 min_periods 미만이면 NaN, 기본값은 window)"""
+        min_periods = self.window if min_periods is None else min_periods
+        return self.mean if self.count >= max(min_periods, 1) else math.nan
+
+    def std(self, min_periods: int = None) -> float:
+        """표본 표준편차 (ddof=1)"""
+        min_periods = self.window if min_periods is None else min_periods
+        if self.count < max(min_periods, 2):
+            return math.nan
+        return math.sqrt(max(self._m2, 0.0) / (self.count - 1))
+
+class RollingExtreme:
+    """최근 window개 값의 최댓값(또는 최솟값)을 단조 덱으로 유지합니다."""
+
+    def __init__(self, window: int, mode: str = "max", values: Iterable[float] = ()):
+        self.window = window
+        self.mode = mode
+        self.values = deque(maxlen=window)
+        self._index = 0          # 지금까지 들어온 값의 수
+        self._deque = deque()    # (순번, 값), 값이 단조 감소(max) 또는 증가(min)
+        for x in values:
+            self.push(x)
+
+    def _dominated(self, kept: float, x: float) -> bool:
+        return kept <= x if self.mode == "max" else kept >= x
+
+    def push(self, x: float) -> None:
+        self.values.append(x)
+        while self._deque and self._dominated(self._deque[-1][1], x):
+            self._deque.pop()
+        self._deque.append((self._index, x))
+        self._index += 1
+        while self._deque[0][0] <= self._index - 1 - self.window:
+            self._deque.popleft()
+
+    def replace_last(self, x: float) -> None:
+        """마지막 값을 교체합니다. 덱을 창 값으로 다시 만들므로 O(window)입니다."""
+        values = list(self.values)
+        values[-1] = x
+        self.__init__(self.window, self.mode, values)
+
+    @property
+    def value(self) -> float:
+        return self._deque[0][1] if self._deque else math.nan
+
+class StreamingIndicators:
+    """종목 하나의 증분 지표 상태
+
+    from_history()로 한 번 초기화한 뒤에는 update()로 새 봉만 반영합니다.
+    봉 하나당 이동평균·볼린저 밴드는 O(1), 52주 고저는 분할 상환 O(1)이며,
+    같은 날짜의 봉이 다시 들어오면 마지막 봉을 교체합니다.
+    결측값이 있는 봉은 창을 오염시키지 않도록 건너뜁니다.
+    """
+
+    MA_WINDOWS = (20, 50, 150, 200)
+    # 추세 기울기 비교용 과거 이동평균 (기간: 몇 봉 전)
+    SLOPE_LAGS = {50: 5, 150: 10, 200: 20}
+    EXTREME_WINDOW = 250
+    VOLUME_WINDOW = 20
+
+    def __init__(self, code: str = None):
+        self.code = code
+        self.last_date: Optional[pd.Timestamp] = None
+        self.last_close = math.nan
+        self.bars = 0
+        windows = sorted(set(self.MA_WINDOWS) | {BOLLINGER_BANDS["window"]})
+        self.close_stats = {w: RollingStats(w) for w in windows}
+        self.volume_stats = RollingStats(self.VOLUME_WINDOW)
+        self.high = RollingExtreme(self.EXTREME_WINDOW, "max")
+        self.low = RollingExtreme(self.EXTREME_WINDOW, "min")
+        self.ma_history = {w: deque(maxlen=lag + 1) for w, lag in self.SLOPE_LAGS.items()}
+
+    @classmethod
+    def from_history(cls, price_data: pd.DataFrame, code: str = None) -> "StreamingIndicators":
+        """가격 이력 전체로 상태를 초기화합니다 (종목당 한 번만 O(이력))."""
+        state = cls(code)
+        state.catch_up(price_data)
+        return state
+
+    def catch_up(self, price_data: pd.DataFrame) -> int:
+        """마지막 반영일 이후(당일 포함)의 봉만 반영하고 반영한 봉 수를 반환합니다."""
+        if self.last_date is not None:
+            price_data = price_data.loc[self.last_date:]
+        rows = zip(
+            price_data.index,
+            price_data["High"].to_numpy(dtype=float),
+            price_data["Low"].to_numpy(dtype=float),
+            price_data["Close"].to_numpy(dtype=float),
+            price_data["Volume"].to_numpy(dtype=float)
+        )
+        count = 0
+        for date, high, low, close, volume in rows:
+            count += self.update(date, high, low, close, volume)
+        return count
+
+    def update(self, date, high: float, low: float, close: float, volume: float) -> bool:
+        """봉 하나를 반영합니다. 이미 반영한 날짜보다 이전 봉이면 무시하고 False를 반환합니다."""
+        date = pd.Timestamp(date)
+        if self.last_date is not None and date < self.last_date:
+            logger.warning(f"지난 봉은 반영하지 않습니다: {self.code}, {date:%Y-%m-%d} < {self.last_date:%Y-%m-%d}")
+            return False
+        if not all(math.isfinite(x) for x in (high, low, close, volume)):
+            logger.warning(f"결측값이 있는 봉은 건너뜁니다: {self.code}, {date:%Y-%m-%d}")
+            return False
+
+        if self.last_date is not None and date == self.last_date:
+            # 장중에 저장된 당일 봉 교체
+            for stats in self.close_stats.values():
+                stats.replace_last(close)
+            self.volume_stats.replace_last(volume)
+            self.high.replace_last(high)
+            self.low.replace_last(low)
+            for w, history in self.ma_history.items():
+                history[-1] = self.close_stats[w].average()
+        else:
+            for stats in self.close_stats.values():
+                stats.push(close)
+            self.volume_stats.push(volume)
+            self.high.push(high)
+            self.low.push(low)
+            for w, history in self.ma_history.items():
+                history.append(self.close_stats[w].average())
+            self.bars += 1
+
+        self.last_date = date
+        self.last_close = close
+        return True
+
+    def sma(self, window: int, min_periods: int = None) -> float:
+        """종가 이동평균"""
+        return self.close_stats[window].average(min_periods)
+
+    def bollinger(self) -> Dict[str, float]:
+        """볼린저 밴드 (PatternDetector와 같이 min_periods=1)"""
+        stats = self.close_stats[BOLLINGER_BANDS["window"]]
+        middle = stats.average(1)
+        std = stats.std(1)
+        return {
+            "bb_middle": middle,
+            "bb_std": std,
+            "bb_upper": middle + std * BOLLINGER_BANDS["std_dev"],
+            "bb_lower": middle - std * BOLLINGER_BANDS["std_dev"]
+        }
+
+    def _ma_prev(self, window: int) -> float:
+        history = self.ma_history[window]
+        return history[0] if len(history) == history.maxlen else math.nan
+
+    def trend_inputs(self) -> Dict[str, float]:
+        """IndicatorFrame.trend_inputs()와 같은 키의 최신 추세 값"""
+        return {
+            "latest": self.last_close,
+            "ma50": self.sma(50),
+            "ma150": self.sma(150),
+            "ma200": self.sma(200),
+            "ma50_prev": self._ma_prev(50),
+            "ma150_prev": self._ma_prev(150),
+            "ma200_prev": self._ma_prev(200),
+            "high52": self.high.value,
+            "low52": self.low.value,
+        }
+
+    def rs_returns(self) -> Tuple[float, float]:
+        """IndicatorFrame.rs_returns()와 같은 13주(65봉)·26주(130봉) 수익률(%)
+
+        200일 창의 종가로 계산하므로 이력이 200봉 미만이면 창의 첫 값이 첫 거래일 종가입니다.
+        """
+        closes = self.close_stats[max(self.close_stats)].values
+        if not closes:
+            return math.nan, math.nan
+        base_13w = closes[-65] if len(closes) >= 65 else closes[0]
+        base_26w = closes[-130] if len(closes) >= 130 else closes[0]
+        return (self.last_close / base_13w - 1) * 100, (self.last_close / base_26w - 1) * 100
+
+    def matches(self, price_data: pd.DataFrame) -> bool:
+        """저장된 창의 종가가 price_data의 같은 구간과 같은지 (수정주가 반영 등으로 이력이 바뀌면 False)
+
+        마지막 반영 봉은 장중 값이었을 수 있으므로 그 앞 봉까지만 비교합니다.
+        """
+        closes = list(self.close_stats[max(self.close_stats)].values)[:-1]
+        history = price_data["Close"].loc[:self.last_date].to_numpy(dtype=float)[:-1]
+        return len(history) >= len(closes) and (not closes or (history[-len(closes):] == closes).all())
+
+    def snapshot(self) -> Dict[str, float]:
+        """최신 봉 기준 지표 전체"""
+        values = {f"ma{w}": self.sma(w, 1) for w in self.MA_WINDOWS}
+        values.update(self.bollinger())
+        values["volume_ma20"] = self.volume_stats.average(1)
+        values.update(self.trend_inputs())
+        return values
+
+    # ───────── 저장 / 복원 ─────────
+
+    def to_dict(self) -> Dict:
+        """창 안의 원값만 저장합니다 (평균·분산·덱은 복원 시 다시 계산)."""
+        longest = max(self.close_stats)
+        return {
+            "code": self.code,
+            "last_date": None if self.last_date is None else self.last_date.isoformat(),
+            "bars": self.bars,
+            "close": list(self.close_stats[longest].values),
+            "volume": list(self.volume_stats.values),
+            "high": list(self.high.values),
+            "low": list(self.low.values),
+            "ma_history": {str(w): list(h) for w, h in self.ma_history.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StreamingIndicators":
+        state = cls(data.get("code"))
+        closes = data["close"]
+        for w, stats in state.close_stats.items():
+            for x in closes[-w:]:
+                stats.push(x)
+        for x in data["volume"]:
+            state.volume_stats.push(x)
+        for x in data["high"]:
+            state.high.push(x)
+        for x in data["low"]:
+            state.low.push(x)
+        for w, history in state.ma_history.items():
+            history.extend(data["ma_history"].get(str(w), []))
+        state.bars = data["bars"]
+        state.last_date = pd.Timestamp(data["last_date"]) if data["last_date"] else None
+        state.last_close = closes[-1] if closes else math.nan
+        return state
+
+    def save(self, path: str) -> None:
+        """상태를 JSON 파일에 원자적으로 저장합니다."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["StreamingIndicators"]:
+        """저장된 상태를 읽습니다. 없거나 손상됐으면 None을 반환합니다."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"지표 상태 읽기 실패: {path}, 에러: {str(e)}")
+            return None
+
+class StreamingIndicatorStore:
+    """종목별 증분 지표 상태를 {dir}/{code}.json으로 관리합니다."""
+
+    def __init__(self, state_dir: str = None):
+        self.state_dir = state_dir or STREAMING_INDICATORS["dir"]
+
+    def _path(self, code: str) -> str:
+        return os.path.join(self.state_dir, f"{code}.json")
+
+    def advance(self, code: str, price_data: pd.DataFrame) -> StreamingIndicators:
+        """저장된 상태에 새 봉만 반영해 저장하고 반환합니다. 상태가 없거나 이력과 맞지 않으면 새로 만듭니다."""
+        state = StreamingIndicators.load(self._path(code))
+        if (state is None or state.last_date is None or price_data.empty or
+                state.last_date < price_data.index[0] or not state.matches(price_data)):
+            state = StreamingIndicators.from_history(price_data, code)
+        else:
+            state.catch_up(price_data)
+        try:
+            state.save(self._path(code))
+        except OSError as e:
+            logger.error(f"지표 상태 저장 실패: {code}, 에러: {str(e)}")
+        return state
@@ -0,0 +1,159 @@
+import zlib
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from config import SYNTHETIC_MARKET, PRICE_HISTORY
+from utils import logger
+
+# 샘플 재무제표에 들어가는 계정과목과 재무제표 구분
+_ACCOUNTS = [
+    ("매출액", "IS", "손익계산서"),
+    ("영업이익", "IS", "손익계산서"),
+    ("당기순이익", "IS", "손익계산서"),
+    ("자본총계", "BS", "재무상태표"),
+    ("부채총계", "BS", "재무상태표"),
+]
+
+def _code_number(code: str) -> int:
+    """종목코드를 정수로 바꿉니다 (영문이 섞인 코드는 CRC32 사용)."""
+    return int(code) if code.isdigit() else zlib.crc32(code.encode())
+
+class SyntheticMarket:
+    """고정 시드로 재현 가능한 합성 시장 데이터를 생성합니다.
+
+    모든 종목의 가격을 (영업일 × 종목) 배열 연산 몇 번으로 만들기 때문에
+    수천 종목도 네트워크 없이 빠르게 생성할 수 있습니다.
+    같은 시드·종목·기간이면 항상 같은 데이터가 나옵니다.
+    """
+
+    def __init__(self, seed: int = None, volatility: float = None):
+        self.seed = SYNTHETIC_MARKET["seed"] if seed is None else seed
+        self.volatility = SYNTHETIC_MARKET["volatility"] if volatility is None else volatility
+
+    @staticmethod
+    def make_codes(n_tickers: int, first: int = 900000) -> List[str]:
+        """합성 종목코드 목록을 만듭니다 (실제 종목과 겹치지 않는 9xxxxx 대역)."""
+        return [f"{first + i:06d}" for i in range(n_tickers)]
+
+    def _rng(self, codes: List[str]) -> np.random.Generator:
+        # 시드와 종목 구성이 같으면 같은 난수열
+        return np.random.default_rng([self.seed, *(_code_number(code) for code in codes)])
+
+    def price_arrays(self, codes: List[str], start_date: str = None,
+                     end_date: str = None) -> Dict[str, np.ndarray]:
+        """OHLCV를 (영업일 × 종목) 배열로 생성합니다."""
+        start_date = start_date or PRICE_HISTORY["start_date"]
+        end_date = end_date or PRICE_HISTORY["end_date"]
+        dates = pd.date_range(start=start_date, end=end_date, freq="B")
+        rng = self._rng(codes)
+        n_days, n_tickers = len(dates), len(codes)
+
+        # 기본 가격 (종목코드 기반 100~1000)
+        base_price = np.array([_code_number(code) % 900 + 100 for code in codes], dtype=np.float64)
+
+        # 종목별 시계열이 연속 메모리가 되도록 (종목 × 영업일)로 뽑아 전치 (열 우선 배열)
+        def normal(loc, scale):
+            return rng.normal(loc, scale, size=(n_tickers, n_days)).T
+
+        # 일간 수익률을 누적해 종가 경로 생성 (최소 10원)
+        close = np.maximum(10.0, base_price * np.cumprod(1.0 + normal(0.0, self.volatility), axis=0))
+        open_ = np.empty_like(close)
+        open_[0] = base_price
+        open_[1:] = close[:-1]
+
+        # 고가/저가는 시가·종가 바깥으로 ±1% 수준의 꼬리
+        high = np.maximum(open_, close) * (1.0 + np.abs(normal(0.0, 0.01)))
+        low = np.minimum(open_, close) * (1.0 - np.abs(normal(0.0, 0.01)))
+
+        # 거래량 (평균 100만 주, 표준편차 50만 주, 최소 1000주)
+        volume = np.maximum(1000, normal(1_000_000, 500_000)).astype(np.int64, order="K")
+
+        return {"dates": dates, "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume}
+
+    def prices(self, codes: List[str], start_date: str = None,
+               end_date: str = None) -> Dict[str, pd.DataFrame]:
+        """종목별 가격 DataFrame을 생성합니다."""
+        arrays = self.price_arrays(codes, start_date, end_date)
+        dates = arrays["dates"]
+        frames = {}
+        for j, code in enumerate(codes):
+            frames[code] = pd.DataFrame(
+                {field: arrays[field][:, j] for field in ("Open", "High", "Low", "Close", "Volume")},
+                index=dates,
+                copy=False
+            )
+        return frames
+
+    def financials(self, codes: List[str], year: int = 2024) -> Dict[str, pd.DataFrame]:
+        """_create_sample_financial_data와 같은 형식의 재무제표를 종목별로 생성합니다.
+
+        금액은 재무제표 저장소와 같이 숫자로 채웁니다.
+        """
+        rng = self._rng(codes)
+        n = len(codes)
+        sales = rng.uniform(100, 1000, n).round() * 1e9
+        op_margin = rng.uniform(-0.05, 0.30, n)
+        growth = rng.uniform(-0.20, 0.50, n)
+        equity_ratio = rng.uniform(0.3, 1.5, n)
+        debt_ratio = rng.uniform(0.1, 2.5, n)
+
+        op_income = sales * op_margin
+        net_income = op_income * 0.8
+        equity = sales * equity_ratio
+        liabilities = equity * debt_ratio
+
+        # (종목 × 계정) 순서로 당기/전기 금액 배열 구성
+        current = np.column_stack([sales, op_income, net_income, equity, liabilities])
+        previous = np.column_stack([
+            sales / (1 + growth),
+            op_income / (1 + growth * rng.uniform(0.5, 2.0, n)),
+            net_income / (1 + growth),
+            equity * 0.9,
+            liabilities * 0.95,
+        ])
+
+        n_acc = len(_ACCOUNTS)
+        code_col = np.repeat(np.asarray(codes, dtype=object), n_acc)
+        df = pd.DataFrame({
+            "rcept_no": [f"synthetic_{c}_{k + 1}" for c in codes for k in range(n_acc)],
+            "bsns_year": str(year),
+            "stock_code": code_col,
+            "reprt_code": "11011",
+            "account_nm": np.tile([a[0] for a in _ACCOUNTS], n),
+            "fs_div": "CFS",
+            "fs_nm": "연결재무제표",
+            "sj_div": np.tile([a[1] for a in _ACCOUNTS], n),
+            "sj_nm": np.tile([a[2] for a in _ACCOUNTS], n),
+            "thstrm_nm": "당기",
+            "thstrm_dt": f"{year}-12-31",
+            "thstrm_amount": current.round().ravel(),
+            "frmtrm_nm": "전기",
+            "frmtrm_dt": f"{year - 1}-12-31",
+            "frmtrm_amount": previous.round().ravel(),
+        })
+        # 종목별로 연속된 행 구간을 잘라서 반환 (문자열 컬럼은 object로 두어 슬라이싱 비용 절감)
+        df = df.astype({col: object for col in df.columns if not col.endswith("_amount")})
+        return {code: df.iloc[i * n_acc:(i + 1) * n_acc].reset_index(drop=True) for i, code in enumerate(codes)}
+
+    def universe(self, n_tickers: int = None, codes: Optional[List[str]] = None,
+                 start_date: str = None, end_date: str = None) -> Dict[str, Dict]:
+        """DataFetcher.get_all_stock_data와 같은 형태의 합성 유니버스를 생성합니다."""
+        if codes is None:
+            codes = self.make_codes(n_tickers or SYNTHETIC_MARKET["n_tickers"])
+        prices = self.prices(codes, start_date, end_date)
+        financials = self.financials(codes)
+        logger.info(f"합성 유니버스 생성 완료: {len(codes)}개 종목 (seed={self.seed})")
+        return {
+            code: {
+                "price": prices[code],
+                "financial": {"annual": financials[code], "semi_annual": pd.DataFrame()},
+                "info": {
+                    "name": f"합성 {code}",
+                    "sector": "합성 데이터",
+                    "industry": "합성 데이터",
+                    "listing_date": "",
+                    "market_cap": 0
+                }
+            }
+            for code in codes
+        }
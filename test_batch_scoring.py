@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from batch_scoring import score_universe, SCORE_COLUMNS
+from compact_ohlcv import compact_stock_data
+from scoring import ScoringEngine
+
+@pytest.fixture
+def universe(synthetic_universe):
+    """오늘까지의 합성 유니버스 + 경계 사례 (호출마다 새 dict)"""
+    def make():
+        data = synthetic_universe(40, seed=11)
+        codes = list(data)
+        # 신규 상장(21일 미만), 재무제표 없음, 쉼표가 들어간 문자열 금액
+        data[codes[0]]["price"] = data[codes[0]]["price"].iloc[-15:]
+        data[codes[1]]["financial"] = {**data[codes[1]]["financial"], "annual": pd.DataFrame()}
+        annual = data[codes[2]]["financial"]["annual"].copy()
+        annual["thstrm_amount"] = [f"{x:,.0f}" for x in annual["thstrm_amount"]]
+        data[codes[2]]["financial"] = {**data[codes[2]]["financial"], "annual": annual}
+        return data
+    return make
+
+def per_ticker_scores(data):
+    rows = []
+    for code, stock in data.items():
+        engine = ScoringEngine(stock)
+        scores = engine.calculate_total_score()
+        rows.append({
+            "code": code,
+            "total_score": scores["total"],
+            "trend_score": scores["trend"],
+            "fundamental_score": scores["fundamental"],
+            "rs_score": scores["rs"],
+            "pattern_score": scores["pattern"],
+            "recommendation": engine.get_recommendation(),
+            "trend_filter_passed": engine.check_trend_filter(),
+            "fundamental_filter_passed": engine.check_fundamental_filter(),
+            "rs_filter_passed": engine.check_rs_filter(),
+        })
+    return pd.DataFrame(rows)
+
+def test_matches_per_ticker_scoring_engine(universe):
+    data = universe()
+    result = score_universe(data)
+    expected = per_ticker_scores(data)
+
+    assert list(result.columns) == SCORE_COLUMNS
+    assert result["code"].tolist() == list(data)
+    for column in ["total_score", "trend_score", "fundamental_score", "rs_score", "pattern_score"]:
+        np.testing.assert_allclose(result[column], expected[column], atol=1e-12, err_msg=column)
+    for column in ["recommendation", "trend_filter_passed", "fundamental_filter_passed", "rs_filter_passed"]:
+        assert result[column].tolist() == expected[column].tolist(), column
+    # 비교가 의미 있도록 각 점수가 0이 아닌 종목이 있어야 함
+    assert (result[["trend_score", "rs_score", "pattern_score"]] > 0).any().all()
+
+def test_short_history_and_missing_financials_score_zero(universe):
+    data = universe()
+    codes = list(data)
+    result = score_universe(data).set_index("code")
+    assert result.loc[codes[0], "trend_score"] == 0.0
+    assert not result.loc[codes[0], "trend_filter_passed"]
+    assert result.loc[codes[1], "fundamental_score"] == 0.0
+    assert not result.loc[codes[1], "fundamental_filter_passed"]
+
+def test_compact_prices_and_empty_universe(universe):
+    data = universe()
+    expected = score_universe(data)
+    compact = score_universe(compact_stock_data(universe()))
+    # float32 가격이므로 가격 기반 점수는 근사적으로 같음
+    assert compact["rs_score"].tolist() == pytest.approx(expected["rs_score"].tolist(), abs=1e-4)
+    assert compact["fundamental_score"].tolist() == expected["fundamental_score"].tolist()
+    assert compact["price_source"].tolist() == expected["price_source"].tolist()
+
+    empty = score_universe({})
+    assert empty.empty and list(empty.columns) == SCORE_COLUMNS
+
+def test_mixed_calendars_match_per_ticker_scoring_engine(universe, mixed_calendar):
+    """합성(B 달력, 휴장일 포함) 종목이 섞여도 각 종목은 자기 봉 기준으로 채점"""
+    data = universe()
+    data = mixed_calendar(data, list(data)[:6])
+
+    result = score_universe(data)
+    expected = per_ticker_scores(data)
+    for column in ["total_score", "trend_score", "rs_score", "pattern_score"]:
+        np.testing.assert_allclose(result[column], expected[column], atol=1e-12, err_msg=column)
+    for column in ["recommendation", "trend_filter_passed", "rs_filter_passed"]:
+        assert result[column].tolist() == expected[column].tolist(), column
@@ -0,0 +1,111 @@
+import pytest
+import requests
+from circuit_breaker import SourceGuard, CircuitOpenError, NegativeCacheHit
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def guard(clock):
+    return SourceGuard(failure_threshold=3, cooldown=300, negative_ttl=60, clock=clock)
+
+def ok(code):
+    return code
+
+def down(code):
+    raise requests.exceptions.ConnectionError("연결 실패")
+
+def fail_with(error):
+    def fn(code):
+        raise error
+    return fn
+
+def test_opens_after_consecutive_endpoint_failures(guard):
+    for i in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guard.call("fdr", "fetch", f"00000{i}", down, f"00000{i}")
+    assert guard.breaker.is_open(("fdr", "fetch"))
+    with pytest.raises(CircuitOpenError):
+        guard.call("fdr", "fetch", "000009", ok, "000009")
+    # 다른 메서드는 별도 회로
+    assert guard.call("fdr", "listing", "000009", ok, "000009") == "000009"
+
+def test_success_resets_failure_count(guard):
+    for code in ["000001", "000002"]:
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guard.call("fdr", "fetch", code, down, code)
+    guard.call("fdr", "fetch", "000003", ok, "000003")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        guard.call("fdr", "fetch", "000004", down, "000004")
+    assert not guard.breaker.is_open(("fdr", "fetch"))
+
+def test_half_open_trial_closes_or_reopens(guard, clock):
+    for i in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guard.call("fdr", "fetch", f"00000{i}", down, f"00000{i}")
+
+    clock.advance(301)
+    # 쿨다운 경과 후 시험 요청 하나만 통과, 실패하면 다시 쿨다운
+    with pytest.raises(requests.exceptions.ConnectionError):
+        guard.call("fdr", "fetch", "000010", down, "000010")
+    with pytest.raises(CircuitOpenError):
+        guard.call("fdr", "fetch", "000011", ok, "000011")
+
+    clock.advance(301)
+    assert guard.call("fdr", "fetch", "000012", ok, "000012") == "000012"
+    assert not guard.breaker.is_open(("fdr", "fetch"))
+    assert guard.call("fdr", "fetch", "000013", ok, "000013") == "000013"
+
+def test_trial_blocks_concurrent_requests(guard, clock):
+    for i in range(3):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            guard.call("fdr", "fetch", f"00000{i}", down, f"00000{i}")
+    clock.advance(301)
+
+    def during_trial(code):
+        # 시험 요청이 끝나기 전 다른 요청은 막힘
+        with pytest.raises(CircuitOpenError):
+            guard.call("fdr", "fetch", "000021", ok, "000021")
+        return code
+
+    assert guard.call("fdr", "fetch", "000020", during_trial, "000020") == "000020"
+
+@pytest.mark.parametrize("error", [TypeError("잘못된 응답"), KeyError("Close"), ValueError("상장폐지")])
+def test_ticker_errors_only_hit_negative_cache(guard, clock, error):
+    for i in range(5):
+        with pytest.raises(type(error)):
+            guard.call("fdr", "fetch", f"00000{i}", fail_with(error), f"00000{i}")
+    assert not guard.breaker.is_open(("fdr", "fetch"))
+    assert guard.call("fdr", "fetch", "000009", ok, "000009") == "000009"
+
+    # 실패한 종목은 ttl 동안 요청 없이 거절, 만료 후 다시 요청
+    with pytest.raises(NegativeCacheHit):
+        guard.call("fdr", "fetch", "000000", ok, "000000")
+    clock.advance(61)
+    assert guard.call("fdr", "fetch", "000000", ok, "000000") == "000000"
+
+def test_http_status_decides_endpoint_failure(guard):
+    def http_error(status):
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(response=response)
+
+    for i in range(3):
+        with pytest.raises(requests.HTTPError):
+            guard.call("dart", "finstate", f"00000{i}", fail_with(http_error(404)), f"00000{i}")
+    assert not guard.breaker.is_open(("dart", "finstate"))
+    for i in range(3):
+        with pytest.raises(requests.HTTPError):
+            guard.call("dart", "finstate", f"00001{i}", fail_with(http_error(503)), f"00001{i}")
+    assert guard.breaker.is_open(("dart", "finstate"))
@@ -0,0 +1,48 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from compact_ohlcv import CompactOHLCV, TradingCalendar, compact_stock_data
+from scoring import ScoringEngine
+
+@pytest.fixture
+def integer_prices(synthetic_prices):
+    """원 단위 정수 가격 (실제 KRX 시세와 같은 형태)"""
+    df = synthetic_prices()
+    df[["Open", "High", "Low", "Close"]] = df[["Open", "High", "Low", "Close"]].round()
+    return df
+
+def test_integer_prices_round_trip_exactly(integer_prices):
+    df = integer_prices
+    df.attrs["source"] = "fdr"
+    restored = CompactOHLCV.from_frame(df).to_frame()
+    pd.testing.assert_frame_equal(restored, df, check_freq=False)
+    assert restored.attrs["source"] == "fdr"
+    assert restored["Close"].dtype == np.float64
+
+def test_gaps_use_calendar_offsets(integer_prices):
+    df = integer_prices
+    calendar = TradingCalendar(df.index)
+    gapped = df.drop(df.index[[10, 11, 200]])
+    compact = CompactOHLCV.from_frame(gapped, calendar)
+    assert compact.day is not None and compact.day.dtype == np.int32
+    assert compact.index.equals(gapped.index)
+    assert CompactOHLCV.from_frame(df.iloc[5:], calendar).day is None
+
+def test_compact_universe_pickles_at_most_half(synthetic_universe):
+    universe = synthetic_universe(50, seed=7, start="2023-01-01", end="2024-12-31")
+    prices = {code: {"price": data["price"]} for code, data in universe.items()}
+    before = len(pickle.dumps(prices))
+    compact = compact_stock_data({code: dict(data) for code, data in prices.items()})
+    after = len(pickle.dumps(compact))
+    assert after <= before / 2
+    restored = pickle.loads(pickle.dumps(compact))
+    first = next(iter(restored))
+    np.testing.assert_allclose(restored[first]["price"].to_frame()["Close"], prices[first]["price"]["Close"], rtol=1e-6)
+
+def test_scoring_engine_accepts_compact_price(integer_prices):
+    df = integer_prices
+    stock = {"price": df, "financial": {"annual": pd.DataFrame()}}
+    compact = {"price": CompactOHLCV.from_frame(df), "financial": {"annual": pd.DataFrame()}}
+    assert ScoringEngine(compact).calculate_trend_score() == ScoringEngine(stock).calculate_trend_score()
+    assert ScoringEngine(compact).calculate_rs_score() == pytest.approx(ScoringEngine(stock).calculate_rs_score())
@@ -0,0 +1,87 @@
+import sqlite3
+import pytest
+import company_cache
+from company_cache import CompanyInfoCache
+
+DAY = 86400
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(company_cache, "time", fake)
+    return fake
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return CompanyInfoCache(str(tmp_path / "company_info.db"), ttl_days=30)
+
+def info(code):
+    return {"name": f"회사{code}", "sector": "반도체", "industry": "", "listing_date": "", "market_cap": 0}
+
+def test_get_many_splits_queries_under_variable_limit(cache, monkeypatch):
+    codes = [f"{i:06d}" for i in range(1500)]
+    for code in codes[:1200]:
+        cache.put(code, info(code))
+
+    # 구버전 SQLite처럼 바인딩 변수를 999개로 제한해도 나눠 조회하므로 실패하지 않음
+    connect = cache._connect
+
+    def limited():
+        conn = connect()
+        conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        return conn
+
+    monkeypatch.setattr(cache, "_connect", limited)
+    with pytest.raises(sqlite3.OperationalError):
+        with limited() as conn:
+            conn.execute(f"SELECT 1 WHERE 1 IN ({', '.join('?' for _ in codes)})", codes)
+
+    result = cache.get_many(codes)
+    assert sorted(result) == codes[:1200]
+    assert result["001199"] == info("001199")
+
+def test_expired_entries_are_only_served_as_stale(cache, clock):
+    cache.put("000001", info("000001"))
+    clock.advance(10 * DAY)
+    cache.put("000002", info("000002"))
+
+    clock.advance(25 * DAY)
+    assert cache.get("000001") is None
+    assert cache.get("000001", allow_stale=True) == info("000001")
+    assert cache.get("000002") == info("000002")
+    assert list(cache.get_many(["000001", "000002", "000003"])) == ["000002"]
+
+def test_warm_requests_only_missing_and_expired(fetcher, clock, monkeypatch):
+    cache = fetcher.company_cache
+    cache.put("000001", info("000001"))
+    clock.advance(31 * DAY)
+    cache.put("000002", info("000002"))
+
+    requested = []
+
+    def company(code):
+        requested.append(code)
+        return {"corp_name": f"새회사{code}", "sector": "반도체", "industry": ""}
+
+    monkeypatch.setattr(fetcher.dart, "company", company, raising=False)
+    warmed = fetcher.warm_company_cache(["000001", "000002", "000003"])
+
+    # 000002만 유효, 만료된 000001과 없는 000003은 API로 다시 받아 저장
+    assert sorted(requested) == ["000001", "000003"]
+    assert warmed["000002"] == info("000002")
+    assert warmed["000001"]["name"] == "새회사000001"
+    assert cache.get("000003")["name"] == "새회사000003"
+
+    # 워밍업 결과는 요청 없이 사용
+    assert fetcher.get_company_info("000001")["name"] == "새회사000001"
+    assert sorted(requested) == ["000001", "000003"]
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+import pandas as pd
+import pytest
+import data_fetcher
+from circuit_breaker import NegativeCacheHit
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "financial_data")
+
+def annual(code: str) -> pd.DataFrame:
+    path = os.path.join(CSV_DIR, f"financial_statement_{code}_2024.csv")
+    return pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+
+@pytest.fixture
+def finstate_calls(fetcher, monkeypatch):
+    """다중회사 finstate 대역: 요청한 종목들의 행을 한 프레임으로 섞어 응답 (000990은 응답 없음)"""
+    calls = []
+
+    def finstate(corp, year):
+        calls.append((corp, year))
+        codes = [code for code in corp.split(",") if code != "000990"]
+        frames = [annual(code) for code in codes]
+        mixed = pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=5)
+        # 종목코드가 숫자로 파싱된 응답 (앞자리 0 누락)
+        mixed["stock_code"] = mixed["stock_code"].astype(int)
+        return mixed
+
+    monkeypatch.setattr(fetcher.dart, "finstate", finstate, raising=False)
+    monkeypatch.setattr(fetcher.dart, "find_corp_code", lambda code: None if code == "999999" else f"corp{code}",
+                        raising=False)
+    monkeypatch.setitem(data_fetcher.FINANCIAL_BULK, "batch_size", 2)
+    return calls
+
+def test_bulk_finstate_is_split_per_stock_code(fetcher, finstate_calls):
+    codes = ["005930", "000660", "000990", "042700", "999999"]
+    fetched = fetcher.fetch_financial_statements_bulk(codes, 2024)
+
+    # 고유번호 없는 종목은 요청하지 않고, 나머지는 batch_size개씩 묶어 요청
+    assert finstate_calls == [("005930,000660", 2024), ("000990,042700", 2024)]
+    assert fetched == 3
+    for code in ["005930", "000660", "042700"]:
+        stored = fetcher.financial_store.load(code, 2024)
+        expected = annual(code)
+        assert (stored["stock_code"] == code).all()
+        assert stored["account_nm"].tolist() == expected["account_nm"].tolist(), code
+        # 개별 조회는 일괄 로드 결과(연결재무제표)를 요청 없이 사용
+        cfs = stored[stored["fs_div"] == "CFS"]
+        served = fetcher.get_financial_statements(code, 2024)["annual"]
+        assert served["thstrm_amount"].tolist() == cfs["thstrm_amount"].tolist(), code
+    assert len(finstate_calls) == 2
+
+    # 응답에 없던 종목과 고유번호 없는 종목은 실패 캐시에 기록되어 개별 요청도 생략
+    for code in ["000990", "999999"]:
+        with pytest.raises(NegativeCacheHit):
+            fetcher._dart_call("finstate", code, 2024)
+
+    # 이미 저장된 종목은 다시 요청하지 않음
+    finstate_calls.clear()
+    assert fetcher.fetch_financial_statements_bulk(["005930", "000660"], 2024) == 0
+    assert finstate_calls == []
+
+def test_hung_ticker_is_skipped_by_timeout(fetcher, monkeypatch):
+    release = threading.Event()
+
+    def fetch_stock_data(code):
+        if code == "000002":
+            release.wait(30)   # 응답 없는 요청
+        return {"code": code}
+
+    monkeypatch.setattr(fetcher, "_fetch_stock_data", fetch_stock_data)
+    monkeypatch.setitem(data_fetcher.FETCH_CONFIG, "ticker_timeout", 0.5)
+    codes = [f"{i:06d}" for i in range(1, 21)]
+    try:
+        started = time.monotonic()
+        result = fetcher._get_all_stock_data_parallel(codes)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert list(result) == [code for code in codes if code != "000002"]
+    # 멈춘 종목 하나가 전체 수집을 막지 않고 시간 제한(+확인 주기 1초) 안에 끝남
+    assert elapsed < 3.0
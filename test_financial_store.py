@@ -0,0 +1,84 @@
+import glob
+import os
+import shutil
+import pandas as pd
+import pytest
+from financial_store import FinancialStore, COLUMNS
+from sepa_metrics import SEPAMetrics
+from utils import parse_amount
+
+CSV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "financial_data")
+ACCOUNTS = ["매출액", "영업이익", "당기순이익", "자본총계", "부채총계"]
+
+def read_csv(code: str, year: int = 2024) -> pd.DataFrame:
+    """기존 CSV 경로와 같은 방식(문자열 그대로)으로 읽은 재무제표"""
+    path = os.path.join(CSV_DIR, f"financial_statement_{code}_{year}.csv")
+    return pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+
+@pytest.fixture
+def store(tmp_path):
+    return FinancialStore(str(tmp_path / "financials.db"))
+
+def test_save_load_round_trip(store):
+    annual = read_csv("005930")
+    assert store.save(annual, "005930", 2024) == len(annual)
+    assert store.has("005930", 2024) and not store.has("005930", 2023)
+
+    loaded = store.load("005930", 2024)
+    assert list(loaded.columns) == COLUMNS
+    assert loaded["account_nm"].tolist() == annual["account_nm"].tolist()
+    # 쉼표 문자열 금액은 숫자로 저장
+    assert loaded["thstrm_amount"].tolist() == [parse_amount(v) for v in annual["thstrm_amount"]]
+    assert loaded["rcept_no"].tolist() == annual["rcept_no"].tolist()
+
+def test_save_replaces_rows_with_same_key(store):
+    annual = read_csv("000660")
+    store.save(annual, "000660", 2024)
+
+    revised = annual.iloc[[0]].copy()
+    revised["thstrm_amount"] = "1,234"
+    revised["rcept_no"] = "99999999999999"
+    store.save(revised, "000660", 2024)
+    loaded = store.load("000660", 2024)
+    assert len(loaded) == len(annual)
+    row = loaded[(loaded["fs_div"] == revised["fs_div"].iloc[0]) & (loaded["account_nm"] == revised["account_nm"].iloc[0])]
+    assert row["thstrm_amount"].tolist() == [1234.0]
+    assert row["rcept_no"].tolist() == ["99999999999999"]
+
+    # 보고서 코드가 다르면 별도 행, 누락된 종목코드·연도는 인자로 채움
+    quarterly = annual.drop(columns=["stock_code", "bsns_year"]).assign(reprt_code="11014")
+    store.save(quarterly, "000660", 2024)
+    assert len(store.load("000660", 2024)) == 2 * len(annual)
+
+def test_ord_order_matches_csv_path(store):
+    annual = read_csv("005930")
+    # 저장 순서와 무관하게 fs_div, ord(숫자) 순으로 읽음 ("61"이 "7"보다 뒤)
+    store.save(annual.sample(frac=1.0, random_state=3), "005930", 2024)
+    loaded = store.load("005930", 2024)
+    assert loaded[["fs_div", "ord"]].values.tolist() == annual[["fs_div", "ord"]].values.tolist()
+
+    from_csv = SEPAMetrics({"annual": annual})
+    from_store = SEPAMetrics({"annual": loaded})
+    for account in ACCOUNTS:
+        assert from_store._get_account_value(account) == from_csv._get_account_value(account), account
+
+def test_imports_existing_csv_files_once(tmp_path):
+    paths = sorted(glob.glob(os.path.join(CSV_DIR, "financial_statement_*_*.csv")))
+    for path in paths:
+        shutil.copy(path, tmp_path)
+
+    store = FinancialStore(str(tmp_path / "financials.db"))
+    for path in paths:
+        code, year = os.path.basename(path)[len("financial_statement_"):-len(".csv")].rsplit("_", 1)
+        csv = pd.read_csv(path, encoding="utf-8-sig", dtype=str)
+        loaded = store.load(code, int(year))
+        assert loaded["account_nm"].tolist() == csv["account_nm"].tolist(), code
+        assert loaded["thstrm_amount"].tolist() == [parse_amount(v) for v in csv["thstrm_amount"]], code
+
+    year_2024 = store.load_year(2024, ["005930", "000660"])
+    assert sorted(year_2024) == ["000660", "005930"]
+
+    # 이미 있는 저장소는 다시 가져오지 않음 (저장소에서 고친 값 유지)
+    store.save(read_csv("005930").iloc[[0]].assign(thstrm_amount="1"), "005930", 2024)
+    reopened = FinancialStore(str(tmp_path / "financials.db"))
+    assert reopened.load("005930", 2024)["thstrm_amount"].iloc[0] == 1.0
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+import config
+from batch_scoring import score_universe
+from fundamental_scoring import (
+    fundamental_metrics, normalize_fundamentals, get_normalized_fundamentals, clear_fundamental_cache
+)
+from scoring import ScoringEngine
+from sepa_metrics import SEPAMetrics
+
+@pytest.fixture
+def universe(synthetic_universe):
+    return lambda n=40: synthetic_universe(n, seed=9, days=600)
+
+def metric_matrix():
+    return pd.DataFrame({
+        "sales_growth": [10.0, 20.0, 0.0, 5.0, 1000.0],
+        "operating_income_growth": [1.0, 2.0, 3.0, 4.0, 5.0],
+        "roe": [5.0, 5.0, 10.0, 15.0, 20.0],
+        "debt_ratio": [50.0, 100.0, 150.0, 0.0, 200.0],
+    }, index=pd.Index(["a", "b", "c", "d", "e"], name="code"))
+
+def test_metrics_match_sepa_metrics(universe):
+    data = universe(10)
+    codes = list(data)
+    metrics = fundamental_metrics({code: data[code]["financial"]["annual"] for code in codes}, codes)
+    for code in codes:
+        expected = SEPAMetrics(data[code]["financial"]).get_all_metrics()
+        assert metrics.loc[code].to_dict() == pytest.approx(expected, rel=1e-12)
+
+def test_percentile_normalization():
+    metrics = metric_matrix()
+    norm = normalize_fundamentals(metrics, "percentile")
+    assert ((norm >= 0) & (norm <= 1)).all().all()
+    # 0인 지표는 분포에서 빠지고 0점
+    assert norm.loc["c", "sales_growth"] == 0.0
+    assert norm.loc["d", "debt_ratio"] == 0.0
+    # 값이 클수록 높은 백분위, 부채비율은 낮을수록 높은 점수
+    assert norm["operating_income_growth"].is_monotonic_increasing
+    assert norm.loc["a", "debt_ratio"] > norm.loc["b", "debt_ratio"] > norm.loc["e", "debt_ratio"]
+    # 같은 값은 같은 백분위
+    assert norm.loc["a", "roe"] == norm.loc["b", "roe"]
+
+def test_zscore_normalization_is_winsorized():
+    metrics = metric_matrix()
+    norm = normalize_fundamentals(metrics, "zscore")
+    assert ((norm >= 0) & (norm <= 1)).all().all()
+
+    growth = np.random.default_rng(0).normal(10, 5, 100)
+    sample = pd.DataFrame({"sales_growth": growth, "operating_income_growth": growth,
+                           "roe": growth, "debt_ratio": growth + 100})
+    outlier = sample.copy()
+    outlier.loc[outlier["sales_growth"].idxmax(), "sales_growth"] = 1e9
+    before = normalize_fundamentals(sample, "zscore")["sales_growth"]
+    after = normalize_fundamentals(outlier, "zscore")["sales_growth"]
+    # 극단값이 분위 절단 범위로 잘려 나머지 종목의 점수 분포가 유지됨
+    assert (after - before).abs().max() < 0.05
+    assert after.std() > 0.1
+    with pytest.raises(ValueError):
+        normalize_fundamentals(metrics, "unknown")
+
+def test_normalized_matrix_is_cached():
+    clear_fundamental_cache()
+    metrics = metric_matrix()
+    first = get_normalized_fundamentals(metrics, "percentile")
+    assert get_normalized_fundamentals(metrics.copy(), "percentile") is first
+    assert get_normalized_fundamentals(metrics, "zscore") is not first
+    assert get_normalized_fundamentals(metrics.assign(roe=1.0), "percentile") is not first
+
+@pytest.mark.parametrize("method", ["percentile", "zscore"])
+def test_cross_sectional_mode_in_scoring(monkeypatch, method, universe):
+    monkeypatch.setitem(config.FUNDAMENTAL_NORMALIZATION, "method", method)
+    data = universe()
+    codes = list(data)
+    metrics = fundamental_metrics({code: data[code]["financial"]["annual"] for code in codes}, codes)
+    normalized = get_normalized_fundamentals(metrics)
+
+    result = score_universe(data).set_index("code")
+    for code in codes[:5]:
+        engine = ScoringEngine(data[code], fundamental_norm=normalized.loc[code])
+        assert result.loc[code, "fundamental_score"] == pytest.approx(engine.calculate_fundamental_score())
+    # 단독 정규화(0.5 고정)와 달리 종목마다 점수가 달라짐
+    assert result["fundamental_score"].nunique() > 5
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+import config
+from batch_scoring import score_universe
+from incremental_scoring import ScoreCache, score_universe_incremental, ticker_input_keys
+
+NOW = pd.Timestamp("2024-12-31 15:00")
+
+@pytest.fixture
+def universe(synthetic_universe):
+    return lambda: synthetic_universe(20, seed=13, start="2023-06-01", end="2024-12-31")
+
+def append_bar(stock):
+    """마지막 봉 다음 거래일 봉 하나를 덧붙입니다."""
+    price = stock["price"]
+    bar = price.iloc[[-1]].copy()
+    bar.index = [price.index[-1] + pd.offsets.BDay(1)]
+    bar["Close"] *= 1.02
+    return {**stock, "price": pd.concat([price, bar])}
+
+def test_only_changed_tickers_are_rescored(tmp_path, universe):
+    cache = ScoreCache(str(tmp_path / "scores.parquet"))
+    data = universe()
+    codes = list(data)
+
+    first = score_universe_incremental(data, NOW, cache)
+    assert first.attrs["rescored"] == len(codes)
+    pd.testing.assert_frame_equal(first, score_universe(data, NOW), check_dtype=False)
+
+    again = score_universe_incremental(data, NOW, cache)
+    assert again.attrs["rescored"] == 0
+    pd.testing.assert_frame_equal(again, first, check_dtype=False)
+
+    # 새 봉 하나, 재무제표 행 하나가 바뀐 종목만 다시 계산
+    data[codes[3]] = append_bar(data[codes[3]])
+    annual = data[codes[7]]["financial"]["annual"].copy()
+    annual.loc[annual.index[0], "thstrm_amount"] *= 1.5
+    data[codes[7]] = {**data[codes[7]], "financial": {**data[codes[7]]["financial"], "annual": annual}}
+
+    updated = score_universe_incremental(data, NOW, cache)
+    assert updated.attrs["rescored"] == 2
+    pd.testing.assert_frame_equal(updated, score_universe(data, NOW), check_dtype=False)
+
+def test_next_day_without_new_bars_rescores_nothing(tmp_path, universe):
+    cache = ScoreCache(str(tmp_path / "scores.parquet"))
+    data = universe()
+    first = score_universe_incremental(data, NOW, cache)
+
+    # 새 봉이 없으면 패턴 구간은 마지막 봉 기준이라 날짜가 바뀌어도 점수가 같음
+    for later in [NOW + pd.Timedelta(hours=1), NOW + pd.Timedelta(days=1), NOW + pd.Timedelta(days=10)]:
+        result = score_universe_incremental(data, later, cache)
+        assert result.attrs["rescored"] == 0
+        pd.testing.assert_frame_equal(result, score_universe(data, later), check_dtype=False)
+        pd.testing.assert_frame_equal(result, first, check_dtype=False)
+
+def test_config_change_and_earlier_as_of_rescore(tmp_path, monkeypatch, universe):
+    cache = ScoreCache(str(tmp_path / "scores.parquet"))
+    data = universe()
+    score_universe_incremental(data, NOW, cache)
+
+    monkeypatch.setitem(config.SCORE_WEIGHTS, "trend", 0.3)
+    assert score_universe_incremental(data, NOW + pd.Timedelta(days=1), cache).attrs["rescored"] == len(data)
+
+    # 마지막 봉보다 이른 기준 시각(과거 시점 채점)은 패턴 구간이 달라지므로 다시 계산
+    earlier = NOW - pd.Timedelta(days=5)
+    result = score_universe_incremental(data, earlier, cache)
+    assert result.attrs["rescored"] == len(data)
+    pd.testing.assert_frame_equal(result, score_universe(data, earlier), check_dtype=False)
+
+def test_cross_sectional_inputs_are_tracked(monkeypatch, universe):
+    monkeypatch.setitem(config.RS_RATING, "mode", "rating")
+    data = universe()
+    codes = list(data)
+    before = ticker_input_keys(data, NOW)
+    data[codes[0]] = append_bar(data[codes[0]])
+    after = ticker_input_keys(data, NOW)
+    # 한 종목의 새 봉이 다른 종목의 RS 등급에도 영향을 주므로 모든 키가 바뀜
+    assert (before != after).all()
+
+def test_unreadable_cache_falls_back_to_full_scoring(tmp_path, universe):
+    path = tmp_path / "scores.parquet"
+    path.write_bytes(b"not a parquet file")
+    data = universe()
+    result = score_universe_incremental(data, NOW, ScoreCache(str(path)))
+    assert result.attrs["rescored"] == len(data)
+    assert ScoreCache(str(path)).load().index.tolist() == list(data)
+
+def test_mixed_calendars_match_full_scoring(tmp_path, universe, mixed_calendar):
+    """다시 계산한 일부 종목의 패널 달력이 전체와 달라도 전체 채점과 같은 결과"""
+    cache = ScoreCache(str(tmp_path / "scores.parquet"))
+    # 앞 세 종목은 휴장일이 들어간 달력, 나머지는 휴장일을 뺀 거래소 달력
+    data = universe()
+    data = mixed_calendar(data, list(data)[:3])
+    codes = list(data)
+    score_universe_incremental(data, NOW, cache)
+
+    data[codes[5]] = append_bar(data[codes[5]])
+    updated = score_universe_incremental(data, NOW, cache)
+    assert updated.attrs["rescored"] == 1
+    pd.testing.assert_frame_equal(updated, score_universe(data, NOW), check_dtype=False)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from indicators import get_indicators, clear_indicator_cache
+from pattern_detector import PatternDetector
+from scoring import ScoringEngine
+
+def test_same_data_shares_indicator_frame(synthetic_prices):
+    clear_indicator_cache()
+    df = synthetic_prices()
+    first = get_indicators(df)
+    assert get_indicators(df.copy()) is first
+    assert first.sma(50) is first.sma(50)
+    assert first.sma(50) is not first.sma(50, min_periods=1)
+
+def test_changed_data_gets_new_frame(synthetic_prices):
+    clear_indicator_cache()
+    df = synthetic_prices()
+    changed = df.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] += 1.0
+    assert get_indicators(changed) is not get_indicators(df)
+
+def test_trend_inputs_match_pandas(synthetic_prices):
+    df = synthetic_prices()
+    v = get_indicators(df).trend_inputs()
+    close = df["Close"]
+    assert v["latest"] == close.iloc[-1]
+    assert v["ma50"] == pytest.approx(close.rolling(50).mean().iloc[-1], rel=1e-12)
+    assert v["ma150_prev"] == pytest.approx(close.rolling(150).mean().iloc[-11], rel=1e-12)
+    assert v["ma200_prev"] == pytest.approx(close.rolling(200).mean().iloc[-21], rel=1e-12)
+    assert v["high52"] == df["High"].tail(250).max()
+    assert v["low52"] == df["Low"].tail(250).min()
+
+def test_consumers_share_indicators(synthetic_prices):
+    df = synthetic_prices()
+    engine = ScoringEngine({"price": df, "financial": {"annual": pd.DataFrame()}})
+    assert engine.pattern_detector.indicators is engine.indicators
+    assert PatternDetector(df).ma50 is engine.pattern_detector.ma50
+    np.testing.assert_allclose(engine.pattern_detector.bb_middle, df["Close"].rolling(20, min_periods=1).mean())
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+from indicators import get_indicators
+from panel_indicators import PanelIndicators
+
+@pytest.fixture
+def frames(price_frames):
+    """같은 거래일 달력에서 상장 시점이 다른 종목들 (정상, 신규 상장, 21일 미만)"""
+    frames = price_frames()
+    frames["900002"] = frames["900002"].iloc[-100:]
+    frames["900003"] = frames["900003"].iloc[-15:]
+    return frames
+
+def test_trend_and_rs_match_per_ticker(frames, assert_same_values):
+    panel = PanelIndicators.from_frames(frames)
+    for code in ["900001", "900002"]:
+        indicators = get_indicators(frames[code])
+        assert_same_values(panel.trend_inputs(code), indicators.trend_inputs())
+        assert panel.rs_returns(code) == pytest.approx(indicators.rs_returns(), rel=1e-12)
+
+def test_short_history_raises_like_per_ticker(frames):
+    panel = PanelIndicators.from_frames(frames)
+    with pytest.raises(IndexError):
+        get_indicators(frames["900003"]).trend_inputs()
+    with pytest.raises(IndexError):
+        panel.trend_inputs("900003")
+
+def test_matrices_match_single_series(frames):
+    panel = PanelIndicators.from_frames(frames)
+    j = panel.ticker_index["900002"]
+    rows = panel.dates.get_indexer(frames["900002"].index)
+    close = frames["900002"]["Close"]
+    np.testing.assert_allclose(panel.sma(20, 1)[rows, j], close.rolling(20, min_periods=1).mean(), rtol=1e-12)
+    middle, upper, lower = panel.bollinger()
+    std = close.rolling(20, min_periods=1).std()
+    np.testing.assert_allclose(upper[rows, j], close.rolling(20, min_periods=1).mean() + 2 * std, rtol=1e-12)
+    assert np.isnan(panel.sma(20)[: rows[0], j]).all()
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from config import POCKET_PIVOT_VOL, VCP_WINDOW
+import pattern_kernels
+from pattern_detector import PatternDetector
+from utils import detect_volume_spike
+
+# ───────── 기존 반복문 구현 (동일 결과 검증용 기준) ─────────
+
+def reference_vcp(detector: PatternDetector):
+    price_data = detector.price_data
+    vcp_patterns = []
+    window = VCP_WINDOW
+    for i in range(window, len(price_data)):
+        recent_data = price_data.iloc[i-window:i]
+        price_decline = recent_data["Close"].iloc[0] > recent_data["Close"].iloc[-1]
+        price_rebound = recent_data["Close"].iloc[-1] > recent_data["Close"].iloc[-2]
+        volume_decline = recent_data["Volume"].iloc[0] > recent_data["Volume"].iloc[-2]
+        volume_increase = recent_data["Volume"].iloc[-1] > recent_data["Volume"].iloc[-2]
+        if price_decline and price_rebound and volume_decline and volume_increase:
+            volume_increase_ratio = recent_data["Volume"].iloc[-1] / recent_data["Volume"].iloc[-2] if recent_data["Volume"].iloc[-2] > 0 else 1.0
+            price_rebound_ratio = recent_data["Close"].iloc[-1] / recent_data["Close"].iloc[-2] if recent_data["Close"].iloc[-2] > 0 else 1.0
+            strength = min(1.0, (volume_increase_ratio * 0.5 + price_rebound_ratio * 0.5 - 1.0))
+            strength = max(0.1, strength)
+            vcp_patterns.append({
+                "date": recent_data.index[-1],
+                "price": recent_data["Close"].iloc[-1],
+                "volume": recent_data["Volume"].iloc[-1],
+                "strength": strength
+            })
+    return vcp_patterns
+
+def reference_pocket_pivot(detector: PatternDetector):
+    price_data = detector.price_data
+    pivot_patterns = []
+    for i in range(1, len(price_data)):
+        price_increase = price_data["Close"].iloc[i] > price_data["Close"].iloc[i-1]
+        volume_spike = detect_volume_spike(price_data["Volume"], POCKET_PIVOT_VOL).iloc[i]
+        above_ma = price_data["Close"].iloc[i] > detector.ma50.iloc[i]
+        if price_increase and volume_spike and above_ma:
+            volume_ratio = price_data["Volume"].iloc[i] / price_data["Volume"].iloc[i-20:i].mean() if price_data["Volume"].iloc[i-20:i].mean() > 0 else 1.0
+            price_increase_ratio = price_data["Close"].iloc[i] / price_data["Close"].iloc[i-1] if price_data["Close"].iloc[i-1] > 0 else 1.0
+            strength = min(1.0, (volume_ratio * 0.6 + price_increase_ratio * 0.4 - 1.0) / 3.0)
+            strength = max(0.1, strength)
+            pivot_patterns.append({
+                "date": price_data.index[i],
+                "price": price_data["Close"].iloc[i],
+                "volume": price_data["Volume"].iloc[i],
+                "strength": strength
+            })
+    return pivot_patterns
+
+def reference_breakout(detector: PatternDetector):
+    price_data = detector.price_data
+    breakouts = []
+    for i in range(1, len(price_data)):
+        upper_breakout = (
+            price_data["Close"].iloc[i] > detector.bb_upper.iloc[i] and
+            price_data["Close"].iloc[i-1] <= detector.bb_upper.iloc[i-1]
+        )
+        lower_breakout = (
+            price_data["Close"].iloc[i] < detector.bb_lower.iloc[i] and
+            price_data["Close"].iloc[i-1] >= detector.bb_lower.iloc[i-1]
+        )
+        if upper_breakout or lower_breakout:
+            if upper_breakout:
+                breakout_degree = (price_data["Close"].iloc[i] - detector.bb_upper.iloc[i]) / detector.bb_upper.iloc[i]
+                is_upper = True
+            else:
+                breakout_degree = (detector.bb_lower.iloc[i] - price_data["Close"].iloc[i]) / detector.bb_lower.iloc[i]
+                is_upper = False
+            volume_ratio = price_data["Volume"].iloc[i] / price_data["Volume"].iloc[i-10:i].mean() if price_data["Volume"].iloc[i-10:i].mean() > 0 else 1.0
+            strength = min(1.0, (breakout_degree * 5.0 + volume_ratio * 0.2))
+            strength = max(0.1, strength)
+            breakouts.append({
+                "date": price_data.index[i],
+                "price": price_data["Close"].iloc[i],
+                "type": "upper" if is_upper else "lower",
+                "strength": strength
+            })
+    return breakouts
+
+# ───────── 테스트 데이터 ─────────
+
+@pytest.fixture(params=["normal", "short", "irregular"])
+def price_data(request, synthetic_prices):
+    """정상 이력, 짧은 이력(20일 미만), 거래량 0·결측이 섞인 이력"""
+    if request.param == "normal":
+        return synthetic_prices()
+    if request.param == "short":
+        return synthetic_prices(end="2023-01-20")
+    irregular = synthetic_prices("900002").astype({"Volume": np.float64})
+    irregular.iloc[30:33, irregular.columns.get_loc("Volume")] = 0.0
+    irregular.iloc[60, irregular.columns.get_loc("Volume")] = np.nan
+    return irregular
+
+def assert_same_patterns(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        for key in e:
+            if key == "strength":
+                assert a[key] == pytest.approx(e[key], rel=1e-12)
+            elif isinstance(e[key], float) and np.isnan(e[key]):
+                assert np.isnan(a[key])
+            else:
+                assert a[key] == e[key]
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_pocket_pivot_matches_loop(price_data, use_numba):
+    detector = PatternDetector(price_data, use_numba=use_numba)
+    assert_same_patterns(detector.detect_pocket_pivot(), reference_pocket_pivot(detector))
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_vcp_matches_loop(price_data, use_numba):
+    detector = PatternDetector(price_data, use_numba=use_numba)
+    assert_same_patterns(detector.detect_vcp(), reference_vcp(detector))
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_breakout_matches_loop(price_data, use_numba):
+    detector = PatternDetector(price_data, use_numba=use_numba)
+    assert_same_patterns(detector.detect_breakout(), reference_breakout(detector))
+
+def test_numba_backend_selected_when_available(synthetic_prices):
+    detector = PatternDetector(synthetic_prices(), use_numba=True)
+    assert detector.use_numba == pattern_kernels.NUMBA_AVAILABLE
+    assert not PatternDetector(synthetic_prices(), use_numba=False).use_numba
+
+@pytest.mark.parametrize("offset", [0, 5, 40, 300, 500])
+def test_recent_patterns_match_full_scan(offset, synthetic_prices):
+    price_data = synthetic_prices()
+    detector = PatternDetector(price_data)
+    now = price_data.index[-1 - offset] + pd.Timedelta(hours=15)
+    full = detector.get_all_patterns()
+    recent = detector.get_recent_patterns(30, now=now)
+    for pattern_type, patterns in full.items():
+        expected = [p for p in patterns if p["date"] <= now and (now - p["date"]).days <= 30]
+        actual = [p for p in recent[pattern_type] if p["date"] <= now]
+        assert_same_patterns(actual, expected)
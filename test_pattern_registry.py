@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pattern_detector import PatternDetector
+from pattern_registry import PATTERN_REGISTRY, evaluate_patterns, pattern_scores, register_pattern
+
+def reference_pattern_score(patterns, now):
+    """기존 calculate_pattern_score의 dict 목록 기반 계산"""
+    weights = {"vcp": 0.4, "pocket_pivot": 0.3, "breakout": 0.3}
+    score = 0.0
+    for t, w in weights.items():
+        recent = [p for p in patterns[t] if (now - p["date"]).days <= 30]
+        if recent:
+            score += w
+        if len(recent) >= 2:
+            score += w * 0.5
+    return min(score, 1.0)
+
+def test_events_match_detector_lists(price_frames):
+    frames = price_frames()
+    events = evaluate_patterns(frames)
+    assert list(events.columns) == ["ticker", "date", "pattern", "strength", "price", "variant"]
+    for code, df in frames.items():
+        patterns = PatternDetector(df).get_all_patterns()
+        for pattern_id, expected in patterns.items():
+            actual = events[(events["ticker"] == code) & (events["pattern"] == pattern_id)]
+            assert list(actual["date"]) == [p["date"] for p in expected]
+            np.testing.assert_allclose(actual["strength"], [p["strength"] for p in expected], rtol=1e-12)
+            if pattern_id == "breakout":
+                assert list(actual["variant"]) == [p["type"] for p in expected]
+
+@pytest.mark.parametrize("offset", [0, 7, 120])
+def test_pattern_scores_match_reference(offset, price_frames):
+    frames = price_frames()
+    now = frames["900001"].index[-1 - offset] + pd.Timedelta(hours=15)
+    frames = {code: df.loc[:now] for code, df in frames.items()}
+    scores = pattern_scores(evaluate_patterns(frames, days=30, now=now), frames)
+    for code, df in frames.items():
+        expected = reference_pattern_score(PatternDetector(df).get_all_patterns(), now)
+        assert scores[code] == pytest.approx(expected)
+
+def test_registered_pattern_is_evaluated(price_frames):
+    @register_pattern("up_day", weight=0.1, label="상승일")
+    def _up_day(block):
+        idx = np.flatnonzero(block.close[1:] > block.close[:-1]) + 1
+        return idx, np.ones(len(idx))
+
+    try:
+        frames = price_frames()
+        events = evaluate_patterns(frames, patterns=["up_day"])
+        df = frames["900001"]
+        expected = int((df["Close"].diff() > 0).sum())
+        assert (events["ticker"] == "900001").sum() == expected
+        assert set(events["pattern"]) == {"up_day"}
+    finally:
+        PATTERN_REGISTRY.pop("up_day")
@@ -0,0 +1,74 @@
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+import batch_scoring
+from batch_scoring import score_universe
+from compact_ohlcv import as_price_frame, compact_stock_data
+from price_panel import PricePanel
+
+NOW = pd.Timestamp("2024-12-31 15:00")
+
+@pytest.fixture
+def universe(synthetic_universe):
+    return lambda: synthetic_universe(12, seed=17, start="2022-01-01", end="2024-12-31")
+
+def build(tmp_path, stock_data):
+    return PricePanel.build({code: as_price_frame(data["price"]) for code, data in stock_data.items()},
+                            str(tmp_path / "panel"))
+
+def test_build_reopen_round_trip(tmp_path, price_frames, mixed_calendar):
+    frames = mixed_calendar(price_frames(("900001", "900002", "900003")), ["900001"])
+    frames["900003"] = frames["900003"].loc["2024-03-01":]   # 늦게 상장한 종목
+    PricePanel.build(frames, str(tmp_path / "panel"))
+
+    panel = PricePanel.open(str(tmp_path / "panel"))
+    assert isinstance(panel.arrays["Close"], np.memmap)
+    assert panel.tickers == list(frames)
+    for code, df in frames.items():
+        pd.testing.assert_frame_equal(panel.frame(code), df.astype(np.float64), check_freq=False,
+                                      check_index_type=False)
+
+    # 작업 프로세스로 넘기면 경로로 다시 메모리 맵을 엶
+    restored = pickle.loads(pickle.dumps(panel))
+    assert isinstance(restored.arrays["Close"], np.memmap)
+    pd.testing.assert_frame_equal(restored.frame("900002"), panel.frame("900002"))
+
+def test_subset_keeps_lookback_bars(price_frames, mixed_calendar):
+    frames = mixed_calendar(price_frames(("900001", "900002", "900003")), ["900001"])
+    panel = PricePanel.from_frames(frames)
+    subset = panel.subset(["900002", "900001"], lookback=100)
+    assert subset.tickers == ["900002", "900001"]
+    for code in subset.tickers:
+        pd.testing.assert_frame_equal(subset.frame(code).iloc[-100:], frames[code].iloc[-100:].astype(np.float64),
+                                      check_freq=False)
+    # 전 종목을 같은 순서로 고르면 메모리 맵 배열의 뷰
+    whole = panel.subset(panel.tickers)
+    assert np.shares_memory(whole.arrays["Close"], panel.arrays["Close"])
+
+def test_scoring_from_stored_panel_matches_frames(tmp_path, universe, mixed_calendar, monkeypatch):
+    data = compact_stock_data(mixed_calendar(universe(), list(universe())[:3]))
+    panel = PricePanel.open(str(build(tmp_path, data).path))
+    # 일부 종목만 채점해도 패널에서 그 종목만 골라 같은 결과
+    subset = {code: data[code] for code in list(data)[2:7]}
+    expected = score_universe(data, NOW)
+    expected_subset = score_universe(subset, NOW)
+
+    # 패널을 쓰면 종목별 프레임으로 패널을 다시 만들지 않음
+    def from_frames(cls, frames):
+        raise AssertionError("종목별 프레임으로 패널을 만들었습니다")
+
+    monkeypatch.setattr(batch_scoring.PanelIndicators, "from_frames", classmethod(from_frames))
+    pd.testing.assert_frame_equal(score_universe(data, NOW, price_panel=panel), expected)
+    pd.testing.assert_frame_equal(score_universe(subset, NOW, price_panel=panel), expected_subset)
+
+def test_stale_panel_falls_back_to_frames(tmp_path, universe):
+    data = universe()
+    panel = build(tmp_path, data)
+    code = list(data)[4]
+    price = data[code]["price"].copy()
+    price.iloc[-1, price.columns.get_loc("Close")] *= 1.05
+    data[code] = {**data[code], "price": price}
+
+    pd.testing.assert_frame_equal(score_universe(data, NOW, price_panel=panel), score_universe(data, NOW))
+    assert batch_scoring._stored_panel(panel, {c: as_price_frame(d["price"]) for c, d in data.items()}) is None
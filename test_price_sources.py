@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+import price_sources
+from price_cache import PriceCache
+from price_sources import FdrPriceSource
+from utils import last_session
+
+@pytest.fixture
+def exchange_prices(synthetic_prices):
+    """2020-01-01(신정 휴장)이 빠진 거래소 일봉"""
+    df = synthetic_prices(start="2020-01-01", end="2020-03-31")
+    return df.drop(pd.Timestamp("2020-01-01"))
+
+@pytest.fixture
+def fdr_calls(monkeypatch, exchange_prices):
+    """fdr.DataReader 대역: 요청 인자를 기록하고 900002는 2020-02-10 상장으로 응답"""
+    calls = []
+
+    def data_reader(code, start, end):
+        calls.append((code, start, end))
+        listed = exchange_prices.loc["2020-02-10":] if code == "900002" else exchange_prices
+        return listed.loc[start:end].copy()
+
+    monkeypatch.setattr(price_sources.fdr, "DataReader", data_reader)
+    return calls
+
+@pytest.mark.parametrize("code", ["900001", "900002"])
+def test_second_fetch_requests_only_tail(tmp_path, fdr_calls, exchange_prices, code):
+    source = FdrPriceSource(PriceCache(str(tmp_path)))
+    source.fetch(code, "2020-01-01", "2020-02-28")
+    # 첫 봉이 시작일(휴장일)·상장일 때문에 시작일보다 늦어도 저장된 요청 시작일로 이력을 인정
+    result = source.fetch(code, "2020-01-01", "2020-03-31")
+
+    assert fdr_calls == [(code, "2020-01-01", "2020-02-28"), (code, "2020-02-28", "2020-03-31")]
+    expected = exchange_prices.loc["2020-02-10":] if code == "900002" else exchange_prices
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+    assert PriceCache(str(tmp_path)).load(code).attrs["history_start"] == "2020-01-01"
+
+def test_earlier_start_refetches_full_history(tmp_path, fdr_calls):
+    source = FdrPriceSource(PriceCache(str(tmp_path)))
+    source.fetch("900001", "2020-02-01", "2020-02-28")
+    source.fetch("900001", "2020-01-01", "2020-02-28")
+    assert fdr_calls[-1] == ("900001", "2020-01-01", "2020-02-28")
+
+@pytest.fixture
+def cached_until(fetcher, exchange_prices):
+    """종목 900001의 2020-01-01 요청 이력을 last_day까지 캐시에 저장"""
+    def store(last_day: str):
+        fetcher.price_cache.append("900001", None, exchange_prices.loc[:last_day].copy(), history_start="2020-01-01")
+    return store
+
+def test_fresh_cache_is_served_without_fdr(fetcher, fdr_calls, cached_until, exchange_prices):
+    cached_until("2020-03-27")
+    # 2020-03-29(일)까지 요청하면 마지막 정규장은 03-27(금)이므로 최신 캐시
+    df = fetcher.get_stock_price("900001", "2020-01-01", "2020-03-29")
+    assert df.attrs["source"] == "cache"
+    assert fdr_calls == []
+    pd.testing.assert_frame_equal(df, exchange_prices.loc[:"2020-03-27"], check_freq=False)
+
+def test_stale_cache_when_fdr_is_down(fetcher, monkeypatch, cached_until, exchange_prices):
+    cached_until("2020-02-28")
+
+    def unavailable(code, start, end):
+        raise ConnectionError("FDR 응답 없음")
+
+    monkeypatch.setattr(price_sources.fdr, "DataReader", unavailable)
+    df = fetcher.get_stock_price("900001", "2020-01-01", "2020-03-31")
+    assert df.attrs["source"] == "stale_cache"
+    pd.testing.assert_frame_equal(df, exchange_prices.loc[:"2020-02-28"], check_freq=False)
+
+def test_full_miss_falls_back_to_synthetic(fetcher, monkeypatch):
+    def unavailable(code, start, end):
+        raise ConnectionError("FDR 응답 없음")
+
+    monkeypatch.setattr(price_sources.fdr, "DataReader", unavailable)
+    df = fetcher.get_stock_price("900001", "2020-01-01", "2020-03-31")
+    assert df.attrs["source"] == "synthetic"
+    assert not df.empty
+
+def test_last_session_skips_weekends_holidays_and_open_market():
+    assert last_session("2020-03-29") == pd.Timestamp("2020-03-27")
+    now = pd.Timestamp("2026-10-12 09:00")  # 월요일 장중, 10-09(금)는 한글날 휴장
+    assert last_session(now=now) == pd.Timestamp("2026-10-08")
+    assert last_session(now=pd.Timestamp("2026-10-12 16:00")) == pd.Timestamp("2026-10-12")
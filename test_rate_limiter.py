@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import threading
+import pytest
+from rate_limiter import TokenBucket, QuotaLedger, QuotaExceededError
+
+class FakeClock:
+    """sleep이 시계를 그만큼 앞당기는 가짜 시간"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=3, clock=clock, sleep=clock.sleep)
+    waits = [bucket.acquire() for _ in range(7)]
+    # 용량 3개는 즉시, 이후는 초당 10개 속도
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3:] == pytest.approx([0.1] * 4)
+    assert clock.now == pytest.approx(0.4)
+
+    clock.now += 10.0  # 오래 쉬어도 용량 이상 쌓이지 않음
+    assert [bucket.acquire() for _ in range(4)] == pytest.approx([0.0, 0.0, 0.0, 0.1])
+
+def test_quota_shared_between_instances(tmp_path):
+    path = str(tmp_path / "quota.json")
+    first, second = QuotaLedger(path, daily_limit=5), QuotaLedger(path, daily_limit=5)
+    for ledger in [first, second, first, second, first]:
+        ledger.consume()
+    assert first.used == second.used == 5
+    with pytest.raises(QuotaExceededError):
+        second.consume()
+    assert QuotaLedger(path, daily_limit=5).remaining == 0
+
+def test_quota_counts_concurrent_consumers(tmp_path):
+    path = str(tmp_path / "quota.json")
+    ledgers = [QuotaLedger(path, daily_limit=1000) for _ in range(4)]
+    threads = [threading.Thread(target=lambda l=l: [l.consume() for _ in range(50)]) for l in ledgers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert QuotaLedger(path, daily_limit=1000).used == 200
+
+def test_import_does_not_touch_ledger(tmp_path):
+    root = os.path.dirname(os.path.abspath(__file__))
+    env = {**os.environ, "PYTHONPATH": root}
+    subprocess.run([sys.executable, "-c", "import data_fetcher"], cwd=tmp_path, env=env, check=True)
+    assert not (tmp_path / "financial_data").exists()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+import config
+from batch_scoring import score_universe
+from panel_indicators import PanelIndicators
+from rs_rating import RSRatings, get_rs_ratings, clear_rs_rating_cache
+from scoring import ScoringEngine
+from utils import percentile_rank, sorted_percentile
+
+@pytest.fixture
+def frames(price_frames):
+    frames = price_frames([f"9000{i:02d}" for i in range(30)], "2022-01-01", "2024-12-31", seed=5)
+    frames["900001"] = frames["900001"].iloc[-100:]  # 신규 상장
+    return frames
+
+def test_sorted_percentile_matches_linear_scan():
+    values = pd.Series([3.0, 1.0, 2.0, 2.0, np.nan, 5.0, 2.0])
+    sorted_values = np.sort(values.dropna().to_numpy())
+    for value in [0.0, 1.0, 2.0, 2.5, 5.0, 9.0]:
+        clean = values.dropna()
+        expected = ((clean < value).sum() + 0.5 * (clean == value).sum()) / len(clean) * 100
+        assert sorted_percentile(sorted_values, value) == pytest.approx(expected)
+        assert percentile_rank(values, value) == pytest.approx(expected)
+    assert percentile_rank(pd.Series(dtype=float), 1.0) == 50.0
+
+def test_ratings_rank_weighted_returns(frames, mixed_calendar):
+    # 900007만 휴장일이 들어간 달력: 나머지 종목은 패널에 결측 행이 생겨도 자기 봉 기준 기간
+    frames = mixed_calendar(frames, ["900007"])
+    ratings = RSRatings.from_panel(PanelIndicators.from_frames(frames))
+    horizons = config.RS_RATING["horizons"]
+
+    table = ratings.table()
+    for code in ["900000", "900001", "900007"]:
+        close = frames[code]["Close"]
+        expected = sum(
+            ((close.iloc[-1] / (close.iloc[-1 - lag] if len(close) > lag else close.iloc[0])) - 1) * 100 * weight
+            for lag, weight in horizons.items()
+        )
+        assert table.loc[code, "weighted_return"] == pytest.approx(expected, rel=1e-12)
+
+    assert table["rating"].between(1, 99).all()
+    order = table.sort_values("weighted_return")["rating"].to_numpy()
+    assert (np.diff(order) >= 0).all()
+    best = table["weighted_return"].idxmax()
+    assert ratings.rating(best) == table["rating"].max() >= 95
+    assert ratings.rating_of(table["weighted_return"].max() + 1000) == 99
+    assert np.isnan(ratings.rating("999999"))
+
+def test_ratings_cached_per_trading_day(frames):
+    clear_rs_rating_cache()
+    first = get_rs_ratings(frames)
+    # 마지막 봉이 같으면 잘라낸 이력으로도 같은 등급표
+    assert get_rs_ratings({code: df.iloc[-300:] for code, df in frames.items()}) is first
+
+    frames["900002"] = frames["900002"].copy()
+    frames["900002"].iloc[-1, frames["900002"].columns.get_loc("Close")] *= 1.01
+    assert get_rs_ratings(frames) is not first
+
+def test_rating_mode_in_scoring(monkeypatch, synthetic_universe):
+    monkeypatch.setitem(config.RS_RATING, "mode", "rating")
+    clear_rs_rating_cache()
+    data = synthetic_universe(30, seed=5, days=800)
+    ratings = get_rs_ratings({code: stock["price"] for code, stock in data.items()})
+
+    result = score_universe(data).set_index("code")
+    for code in list(data)[:5]:
+        engine = ScoringEngine(data[code], rs_rating=ratings.rating(code))
+        assert engine.calculate_rs_score() == pytest.approx(ratings.rating(code) / 100)
+        assert result.loc[code, "rs_score"] == pytest.approx(engine.calculate_rs_score())
+        assert result.loc[code, "rs_filter_passed"] == engine.check_rs_filter()
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from scoring import ScoringEngine, ScoreResult, recommend
+
+@pytest.fixture
+def stock(synthetic_universe):
+    return next(iter(synthetic_universe(1, seed=3).values()))
+
+def test_evaluate_runs_once(monkeypatch, stock):
+    engine = ScoringEngine(stock)
+    calls = {"metrics": 0, "rs": 0}
+    get_all_metrics = engine.sepa_metrics.get_all_metrics
+    rs_returns = engine.latest_inputs.rs_returns
+
+    def counting_metrics():
+        calls["metrics"] += 1
+        return get_all_metrics()
+
+    def counting_rs():
+        calls["rs"] += 1
+        return rs_returns()
+
+    monkeypatch.setattr(engine.sepa_metrics, "get_all_metrics", counting_metrics)
+    monkeypatch.setattr(engine.latest_inputs, "rs_returns", counting_rs)
+
+    result = engine.evaluate()
+    assert engine.get_recommendation() == result.recommendation
+    assert engine.calculate_total_score() == result.scores
+    assert engine.check_trend_filter() is result.trend_filter
+    assert engine.check_fundamental_filter() is result.fundamental_filter
+    assert engine.check_rs_filter() is result.rs_filter
+    assert engine.get_sepa_status() == dict(result.sepa_status)
+    assert engine.evaluate() is result
+    assert calls == {"metrics": 1, "rs": 1}
+
+def test_result_is_consistent_and_immutable(stock):
+    result = ScoringEngine(stock).evaluate()
+    assert isinstance(result, ScoreResult)
+    assert result.trend == 0.25 * sum(result.trend_conditions.values())
+    assert result.trend_filter == all(result.trend_conditions.values())
+    assert result.recommendation == recommend(result.total, result.all_filters_passed)
+    assert set(result.metrics) == {"sales_growth", "operating_income_growth", "roe", "debt_ratio"}
+    with pytest.raises(AttributeError):
+        result.total = 1.0
+    with pytest.raises(TypeError):
+        result.metrics["roe"] = 100.0
+
+def test_empty_data_scores_zero():
+    empty_price = pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"], index=pd.DatetimeIndex([]))
+    engine = ScoringEngine({"price": empty_price, "financial": {"annual": pd.DataFrame()}})
+    result = engine.evaluate()
+    assert result.scores == {"total": 0.0, "trend": 0.0, "fundamental": 0.0, "rs": 0.0, "pattern": 0.0}
+    assert not result.all_filters_passed
+    assert result.pattern_events.empty
+    assert result.sepa_status == {"sales_growth": False, "operating_income_growth": False, "roe": False, "debt_ratio": False}
+    assert result.recommendation == "매도"
@@ -0,0 +1,94 @@
+import pytest
+import data_fetcher
+from compact_ohlcv import as_price_frame
+from indicators import get_indicators
+from scoring import ScoringEngine
+from streaming_indicators import StreamingIndicators, StreamingIndicatorStore
+
+def test_matches_full_recompute(synthetic_prices, assert_same_values):
+    df = synthetic_prices()
+    state = StreamingIndicators.from_history(df)
+    indicators = get_indicators(df)
+    assert_same_values(state.trend_inputs(), indicators.trend_inputs(), rel=1e-9)
+    middle, std, upper, lower = indicators.bollinger()
+    assert state.bollinger()["bb_upper"] == pytest.approx(upper.iloc[-1], rel=1e-9)
+    assert state.bollinger()["bb_lower"] == pytest.approx(lower.iloc[-1], rel=1e-9)
+    assert state.sma(20, 1) == pytest.approx(indicators.sma(20, 1).iloc[-1], rel=1e-9)
+
+def test_update_after_reload_matches_history(tmp_path, synthetic_prices, assert_same_values):
+    df = synthetic_prices()
+    state = StreamingIndicators.from_history(df.iloc[:-3], "900001")
+    state.save(str(tmp_path / "900001.json"))
+    state = StreamingIndicators.load(str(tmp_path / "900001.json"))
+    assert state.catch_up(df) == 4  # 마지막 저장 봉 교체 + 새 봉 3개
+    assert_same_values(state.snapshot(), StreamingIndicators.from_history(df).snapshot(), rel=1e-9)
+
+def test_same_day_bar_is_replaced(tmp_path, synthetic_prices, assert_same_values):
+    df = synthetic_prices()
+    intraday = df.copy()
+    intraday.iloc[-1, intraday.columns.get_loc("High")] *= 1.5
+    intraday.iloc[-1, intraday.columns.get_loc("Close")] *= 1.2
+    store = StreamingIndicatorStore(str(tmp_path))
+    store.advance("900001", intraday)
+    state = store.advance("900001", df)
+    assert state.bars == len(df)
+    assert_same_values(state.snapshot(), StreamingIndicators.from_history(df).snapshot(), rel=1e-9)
+
+@pytest.mark.parametrize("end", ["2024-12-31", "2023-03-01"])
+def test_rs_returns_match_indicator_frame(synthetic_prices, end):
+    df = synthetic_prices(end=end)
+    state = StreamingIndicators.from_history(df)
+    assert state.rs_returns() == pytest.approx(get_indicators(df).rs_returns(), rel=1e-12)
+
+def test_changed_history_is_rebuilt(tmp_path, synthetic_prices, monkeypatch):
+    df = synthetic_prices()
+    store = StreamingIndicatorStore(str(tmp_path))
+    store.advance("900001", df.iloc[:-1])
+    # 수정주가 반영으로 과거 종가가 모두 바뀐 이력
+    adjusted = df.copy()
+    adjusted[["Open", "High", "Low", "Close"]] *= 0.5
+    state = store.advance("900001", adjusted)
+    assert state.trend_inputs() == StreamingIndicators.from_history(adjusted).trend_inputs()
+
+@pytest.fixture
+def daily_fetch(fetcher, synthetic_universe, monkeypatch):
+    """end일까지의 시세를 돌려주는 수집 대역으로 get_all_stock_data를 실행합니다."""
+    universe = synthetic_universe(3, seed=21, start="2023-01-01", end="2024-12-31")
+    monkeypatch.setitem(data_fetcher.FINANCIAL_BULK, "enabled", False)
+    monkeypatch.setitem(data_fetcher.FETCH_CONFIG, "parallel", False)
+
+    def run(end: str):
+        def fetch_stock_data(code):
+            price = universe[code]["price"].loc[:end].copy()
+            price.attrs["source"] = "fdr"
+            return {**universe[code], "price": price}
+        monkeypatch.setattr(fetcher, "_fetch_stock_data", fetch_stock_data)
+        return fetcher.get_all_stock_data(list(universe))
+    return run
+
+def test_daily_fetch_advances_state_for_scoring(daily_fetch, monkeypatch, assert_same_values):
+    daily_fetch("2024-12-27")
+
+    # 다음 날 수집은 저장된 상태에 새 봉만 반영
+    def from_history(cls, price_data, code=None):
+        raise AssertionError(f"이력 전체로 다시 계산했습니다: {code}")
+
+    monkeypatch.setattr(StreamingIndicators, "from_history", classmethod(from_history))
+    stock_data = daily_fetch("2024-12-31")
+    for code, stock in stock_data.items():
+        state = stock["indicators"]
+        price = as_price_frame(stock["price"])
+        assert state.last_date == price.index[-1] and state.bars == len(price)
+
+        engine = ScoringEngine(stock)
+        assert engine.latest_inputs is state
+        reference = get_indicators(price)
+        assert_same_values(state.trend_inputs(), reference.trend_inputs(), rel=1e-9)
+        assert state.rs_returns() == pytest.approx(reference.rs_returns(), rel=1e-9)
+        assert engine.calculate_total_score() == pytest.approx(
+            ScoringEngine(stock, reference).calculate_total_score(), rel=1e-9)
+
+def test_stale_state_is_not_used_for_scoring(synthetic_universe):
+    stock = next(iter(synthetic_universe(1, seed=21, start="2023-01-01", end="2024-12-31").values()))
+    stock = {**stock, "indicators": StreamingIndicators.from_history(stock["price"].iloc[:-1])}
+    assert ScoringEngine(stock).latest_inputs is not stock["indicators"]
@@ -5,7 +5,7 @@ from urllib3.util.retry import Retry
 from typing import Any, Dict, Optional
 import pandas as pd
 import numpy as np
-from config import LOG_CONFIG, RETRY_CONFIG
+from config import LOG_CONFIG, RETRY_CONFIG, MARKET_CALENDAR
 
 # 로깅 설정
 logging.basicConfig(
@@ -15,6 +15,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def last_session(end_date=None, now: pd.Timestamp = None) -> pd.Timestamp:
+    """end_date(기본값 오늘)까지 마감된 마지막 정규장 거래일
+
+    주말·MARKET_CALENDAR 휴장일은 건너뛰고, end_date가 오늘이면 장 마감 전에는 전 거래일입니다.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    today = now.normalize()
+    end = today if end_date is None else min(pd.Timestamp(end_date).normalize(), today)
+    if end == today and now < today + pd.Timedelta(MARKET_CALENDAR["close_time"] + ":00"):
+        end -= pd.Timedelta(days=1)
+    session = pd.offsets.CustomBusinessDay(holidays=MARKET_CALENDAR["holidays"])
+    return session.rollback(end)
+
 def create_retry_session() -> requests.Session:
     """재시도 로직이 포함된 requests 세션을 생성합니다."""
     session = requests.Session()
@@ -38,6 +51,9 @@ def safe_get(data: Dict[str, Any], key: str, default: Any = None) -> Any:
 def parse_amount(amount_str: str) -> float:
     """금액 문자열을 숫자로 변환합니다."""
     try:
+        # 이미 숫자로 저장된 금액 (재무제표 저장소)
+        if isinstance(amount_str, (int, float, np.number)):
+            return 0.0 if np.isnan(amount_str) else float(amount_str)
         # 쉼표 제거
         amount_str = amount_str.replace(",", "")
         return float(amount_str)
@@ -66,6 +82,20 @@ def normalize_data(data: pd.Series) -> pd.Series:
     except Exception:
         return pd.Series([0.0] * len(data))
 
+def sorted_percentile(sorted_values: np.ndarray, values) -> np.ndarray:
+    """오름차순 정렬된 배열 기준 values의 백분위(0-100)를 이진 탐색으로 계산합니다.
+
+    percentile_rank와 같은 식 (작은 값 수 + 같은 값 수의 절반) / n * 100 이며,
+    값 하나당 O(log n)입니다. sorted_values에는 NaN이 없어야 합니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(sorted_values)
+    if n == 0:
+        return np.full(values.shape, 50.0)
+    n_smaller = np.searchsorted(sorted_values, values, side="left")
+    n_not_larger = np.searchsorted(sorted_values, values, side="right")
+    return (n_smaller + n_not_larger) / 2 / n * 100
+
 def percentile_rank(series: pd.Series, value: float) -> float:
     """
     주어진 값의 백분위 순위를 계산합니다.
@@ -86,7 +116,8 @@ def percentile_rank(series: pd.Series, value: float) -> float:
         if clean_series.empty:
             return 50.0
             
-        # 백분위 계산
+        # 백분위 계산 (값 하나는 O(n) 선형 계수, 같은 기준으로 여러 값을 조회할 때는
+        # 정렬 배열을 한 번 만들어 sorted_percentile 사용)
         n_smaller = (clean_series < value).sum()
         n_equal = (clean_series == value).sum()
         n = len(clean_series)